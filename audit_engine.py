@@ -66,11 +66,13 @@ class AccountingAuditor:
             username = cfg["username"]
             self.api_key = cfg.get("password") or cfg.get("api_key", "")
             
+            # ServerProxy takes no timeout= argument (passing one raises TypeError);
+            # the socket default bounds every XML-RPC call instead
             socket.setdefaulttimeout(10)
-            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common", timeout=10)
+            common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
             self.uid = common.authenticate(self.db, username, self.api_key, {})
             if self.uid:
-                self.models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object", timeout=10)
+                self.models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
                 self.connected = True
                 logger.info("Connected to Odoo for audit.")
             else:
@@ -0,0 +1,239 @@
+"""
+bench_odoo.py - Odoo watcher and report-path benchmarks against the simulator.
+
+Responsibility:
+- Starts benchmarks/odoo_simulator.py in a child process per dataset size
+  (default 10k and 100k sale orders + invoices; 1M via --sizes)
+- odoo_watcher: seeds a fully caught-up state file, then for each batch of
+  record changes measures check_for_updates() time, peak Python memory
+  (tracemalloc, in a separate poll so tracing does not skew the timing) and
+  event-detection precision/recall against what the simulator changed
+- Report paths: times and memory for OdooReporter.get_financial_summary,
+  AccountingAuditor.run_audit and ceo_briefing.get_financial_snapshot
+- Writes JSON results comparable across commits
+
+Boundary:
+- Never touches credentials/ or the real vault: every config/state path
+  is redirected into a temp directory
+
+Usage:
+    python benchmarks/bench_odoo.py
+    python benchmarks/bench_odoo.py --sizes 10000,1000000 --latency fixed:0.05 --output odoo.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import xmlrpc.client
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "watchers"))
+
+import audit_engine  # noqa: E402
+import ceo_briefing  # noqa: E402
+import odoo_watcher  # noqa: E402
+import reporting_engine  # noqa: E402
+from odoo_simulator import DB, PASSWORD, USERNAME, OdooSimulator, make_server  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 100_000)
+DEFAULT_CHANGES = (10, 50, 200)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Simulator process
+# ---------------------------------------------------------------------------
+
+def _serve(size: int, seed: int, latency: str, latency_per_record: float, port_queue):
+    # Forked after OdooWatcher installed its handlers; terminate() must still work
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    sim = OdooSimulator(orders=size, invoices=size, seed=seed,
+                        latency=latency, latency_per_record=latency_per_record)
+    server = make_server(sim)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_simulator(size: int, seed: int, latency: str, latency_per_record: float):
+    port_queue = multiprocessing.Queue()
+    proc = multiprocessing.Process(
+        target=_serve, args=(size, seed, latency, latency_per_record, port_queue), daemon=True,
+    )
+    proc.start()
+    port = port_queue.get(timeout=600)
+    return proc, f"http://127.0.0.1:{port}"
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+def _measure(fn):
+    """(result, seconds, peak traced bytes) — timing and memory from separate calls."""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_watcher(url: str, scratch: Path, size: int, changes: list[int]) -> list[dict]:
+    control = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/sim", allow_none=True)
+    control.dump_state(str(odoo_watcher.STATE_PATH))
+
+    start = time.perf_counter()
+    watcher = odoo_watcher.OdooWatcher()
+    startup = time.perf_counter() - start
+
+    results = [{"size": size, "benchmark": "odoo_watcher.startup", "seconds": startup}]
+    for i, count in enumerate(changes):
+        # Timed poll — also the one checked for correctness
+        watcher._last_poll = datetime.now() - timedelta(seconds=1)
+        expected = {tuple(e) for e in control.mutate(count, 2 * i + 1)}
+        start = time.perf_counter()
+        events = watcher.check_for_updates()
+        elapsed = time.perf_counter() - start
+        detected = {
+            (e["model"], e["record"]["id"], e["event_type"])
+            for task in events for e in task.get("events", [task])    # payment digests hold several
+        }
+        hits = len(expected & detected)
+
+        # Same-sized poll under tracemalloc for peak memory
+        watcher._last_poll = datetime.now() - timedelta(seconds=1)
+        control.mutate(count, 2 * i + 2)
+        tracemalloc.start()
+        watcher.check_for_updates()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.append({
+            "size": size,
+            "benchmark": "odoo_watcher.check_for_updates",
+            "changes": len(expected),
+            "seconds": elapsed,
+            "peak_bytes": peak,
+            "events": len(detected),
+            "precision": hits / len(detected) if detected else 1.0,
+            "recall": hits / len(expected) if expected else 1.0,
+        })
+    return results
+
+
+def bench_reports(config_path: Path, size: int) -> list[dict]:
+    results = []
+    reporter = reporting_engine.OdooReporter(config_path)
+    auditor = audit_engine.AccountingAuditor(config_path)
+    for name, fn in (
+        ("reporting_engine.get_financial_summary", reporter.get_financial_summary),
+        ("audit_engine.run_audit", auditor.run_audit),
+        ("ceo_briefing.get_financial_snapshot", ceo_briefing.get_financial_snapshot),
+    ):
+        result, elapsed, peak = _measure(fn)
+        results.append({
+            "size": size,
+            "benchmark": name,
+            "seconds": elapsed,
+            "peak_bytes": peak,
+            "ok": result is not None,
+        })
+    return results
+
+
+def run_size(root: Path, size: int, args) -> list[dict]:
+    print(f"[{size}] starting simulator...", flush=True)
+    proc, url = start_simulator(size, args.seed, args.latency, args.latency_per_record)
+    try:
+        scratch = root / f"size_{size}"
+        scratch.mkdir(parents=True)
+        config_path = scratch / "odoo_config.json"
+        config_path.write_text(json.dumps({
+            "url": url, "database": DB, "username": USERNAME, "password": PASSWORD,
+        }), encoding="utf-8")
+
+        odoo_watcher.VAULT_PATH = scratch / "vault"
+        odoo_watcher.CONFIG_PATH = config_path
+        odoo_watcher.STATE_PATH = scratch / ".odoo_state.json"
+        odoo_watcher.LAST_POLL_PATH = scratch / ".odoo_last_poll.json"
+        odoo_watcher.PENDING_PATH = scratch / ".odoo_pending_events.json"
+        odoo_watcher.DUE_INDEX_PATH = scratch / ".odoo_due_index.json"
+        odoo_watcher.COALESCE_SECONDS = 0      # detection is scored per poll, so release every event at once
+        ceo_briefing.ODOO_CONFIG_PATH = config_path
+
+        results = bench_watcher(url, scratch, size, args.changes) + bench_reports(config_path, size)
+    finally:
+        proc.terminate()
+        proc.join()
+
+    for r in results:
+        extra = ""
+        if "recall" in r:
+            extra = f"  changes {r['changes']:>4}  recall {r['recall']:.2f}  precision {r['precision']:.2f}"
+        peak = f"  peak {r['peak_bytes'] / 1e6:8.1f} MB" if "peak_bytes" in r else ""
+        print(f"[{size}] {r['benchmark']:<42} {r['seconds'] * 1000:10.1f} ms{peak}{extra}", flush=True)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Odoo watcher/report benchmarks against the simulator")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated sale order (and invoice) counts")
+    parser.add_argument("--changes", default=",".join(str(c) for c in DEFAULT_CHANGES),
+                        help="comma-separated record changes per measured poll")
+    parser.add_argument("--latency", default="fixed:0", help="simulator per-call latency spec")
+    parser.add_argument("--latency-per-record", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    parser.add_argument("--workdir", type=Path, default=None)
+    args = parser.parse_args(argv)
+    args.changes = [int(c) for c in args.changes.split(",") if c.strip()]
+
+    logging.disable(logging.INFO)
+    root = Path(tempfile.mkdtemp(prefix="ai_employee_odoo_bench_", dir=args.workdir))
+    try:
+        results = []
+        for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+            results.extend(run_size(root, size, args))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "latency": args.latency,
+        "latency_per_record": args.latency_per_record,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
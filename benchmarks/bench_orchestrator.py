@@ -0,0 +1,307 @@
+"""
+bench_orchestrator.py - Queue-processing benchmarks against synthetic vaults.
+
+Responsibility:
+- Builds a throwaway AI_Employee_Vault with N files in each of
+  Needs_Action/, Approved/ and Done/ (default N = 100, 10 000, 100 000)
+- Points orchestrator, reporting_engine and audit_engine at that vault and
+  replaces the Claude Code CLI with benchmarks/fake_claude.py
+- Times _scan_needs_action, _scan_approved, _parse_frontmatter,
+  get_activity_stats and run_system_audit
+- Writes JSON results that can be compared across commits (--compare)
+
+Boundary:
+- Never touches the real vault or credentials, and writes no log lines to
+  the real logs/: every path the benchmarked functions read or write, and
+  every log file handler, is redirected into the temp dir. Importing the
+  benchmarked modules still creates logs/ and their (empty) log files, as
+  any import of them does
+- Approved/ is filled with observe-only odoo_action files plus a small
+  fraction of email_action files (sent through the fake CLI), so no
+  browser is ever launched
+
+Usage:
+    python benchmarks/bench_orchestrator.py
+    python benchmarks/bench_orchestrator.py --sizes 100,10000 --output after.json
+    python benchmarks/bench_orchestrator.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+FAKE_CLAUDE = BENCH_DIR / "fake_claude.py"
+
+# Must be set before orchestrator is imported (CLAUDE_CMD is read at import)
+os.environ["CLAUDE_CMD"] = f'"{sys.executable}" "{FAKE_CLAUDE}"'
+sys.path.insert(0, str(BASE_DIR))
+
+import audit_engine  # noqa: E402
+import orchestrator  # noqa: E402
+import reasoning_cache  # noqa: E402
+import reporting_engine  # noqa: E402
+import tracing  # noqa: E402
+import triage  # noqa: E402
+import usage_ledger  # noqa: E402
+
+DEFAULT_SIZES = (100, 10_000, 100_000)
+FRONTMATTER_SAMPLE = 1000   # _parse_frontmatter is timed over at most this many files
+
+# Needs_Action filename prefix → task frontmatter type
+TASK_KINDS = [
+    ("EMAIL_", "email"),
+    ("TWEET_", "tweet"),
+    ("LINKEDIN_POST_", "linkedin_post"),
+    ("INSTAGRAM_DM_", "instagram_dm"),
+    ("FACEBOOK_DM_", "facebook_dm"),
+    ("ODOO_", "odoo_event"),
+]
+
+DONE_PREFIXES = ["completed", "processed", "failed"]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic vault
+# ---------------------------------------------------------------------------
+
+def _task_text(task_type: str, i: int) -> str:
+    return (
+        f"---\ntype: {task_type}\nfrom: \"sender{i}@example.com\"\n"
+        f"subject: \"Synthetic task {i}\"\nreceived_at: \"{datetime.now().isoformat()}\"\n"
+        f"priority: normal\nstatus: pending\n---\n\n"
+        f"# Synthetic task {i}\n\n" + ("Lorem ipsum dolor sit amet. " * 20) + "\n"
+    )
+
+
+def build_vault(root: Path, size: int, email_fraction: float, seed: int = 0) -> Path:
+    """Create a vault under root with `size` files in Needs_Action/, Approved/ and Done/."""
+    rng = random.Random(seed)
+    vault = root / f"vault_{size}"
+    dirs = {name: vault / name for name in ("Needs_Action", "Plans", "Pending_Approval", "Approved", "Done")}
+    for d in dirs.values():
+        d.mkdir(parents=True, exist_ok=True)
+
+    for i in range(size):
+        prefix, task_type = TASK_KINDS[i % len(TASK_KINDS)]
+        (dirs["Needs_Action"] / f"{prefix}{i:06d}.md").write_text(_task_text(task_type, i), encoding="utf-8")
+
+    for i in range(size):
+        source = f"ODOO_approved_{i:06d}.md"
+        if rng.random() < email_fraction:
+            name = f"REPLY_EMAIL_approved_{i:06d}.md"
+            front = (
+                "---\ntype: email_action\naction: send_reply\nto: \"someone@example.com\"\n"
+                f"subject: \"Re: Synthetic {i}\"\nsource_task: \"EMAIL_approved_{i:06d}.md\"\n---\n"
+            )
+        else:
+            name = f"ACTION_{source}"
+            front = f"---\ntype: odoo_action\naction: review\nsource_task: \"{source}\"\n---\n"
+        (dirs["Approved"] / name).write_text(front + "\n# Proposed Reply\n\nSynthetic.\n", encoding="utf-8")
+
+    now = time.time()
+    for i in range(size):
+        prefix, _ = TASK_KINDS[i % len(TASK_KINDS)]
+        status = DONE_PREFIXES[i % len(DONE_PREFIXES)]
+        path = dirs["Done"] / f"{status}_20260101_000000_{prefix}{i:06d}.md"
+        path.write_text(f"---\ntype: done\n---\n\nDone {i}\n", encoding="utf-8")
+        # Spread mtimes over 14 days so the 7-day lookback filters half of them
+        age = rng.uniform(0, 14 * 86400)
+        os.utime(path, (now - age, now - age))
+    return vault
+
+
+def point_modules_at(vault: Path, scratch: Path):
+    """Redirect every module-level path the benchmarked functions use."""
+    orchestrator.VAULT_PATH = vault
+    orchestrator.NEEDS_ACTION_DIR = vault / "Needs_Action"
+    orchestrator.PLANS_DIR = vault / "Plans"
+    orchestrator.PENDING_APPROVAL_DIR = vault / "Pending_Approval"
+    orchestrator.APPROVED_DIR = vault / "Approved"
+    orchestrator.DONE_DIR = vault / "Done"
+    orchestrator.LOG_DIR = scratch / "logs"
+    orchestrator.ORCHESTRATOR_WORKSPACE_DIR = scratch / "workspace"
+    for d in (orchestrator.LOG_DIR, orchestrator.ORCHESTRATOR_WORKSPACE_DIR):
+        d.mkdir(parents=True, exist_ok=True)
+    tracing.TRACE_LOG = scratch / "logs" / "traces.jsonl"
+    triage.DONE_DIR = vault / "Done"
+    triage.REJECTED_DIR = vault / "Rejected"
+    triage.MODEL_PATH = scratch / "triage_model.json"
+    triage._model, triage._model_mtime = None, 0.0
+    usage_ledger.LEDGER_PATH = scratch / "claude_usage.db"
+    usage_ledger._today_cache.update({"at": 0.0, "day": ""})
+    reasoning_cache.CACHE_PATH = scratch / "reasoning_cache.db"
+    reporting_engine.DONE_DIR = vault / "Done"
+    audit_engine.DONE_DIR = vault / "Done"
+    _redirect_log_files(scratch / "logs")
+
+
+def _redirect_log_files(log_dir: Path):
+    """Swap the modules' logs/*.log file handlers for copies under log_dir."""
+    real_logs = BASE_DIR / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    loggers = [logging.getLogger()] + [
+        lg for lg in logging.Logger.manager.loggerDict.values() if isinstance(lg, logging.Logger)
+    ]
+    for lg in loggers:
+        for handler in list(lg.handlers):
+            if not isinstance(handler, logging.FileHandler):
+                continue
+            path = Path(handler.baseFilename)
+            if path.parent != real_logs:
+                continue
+            replacement = logging.FileHandler(log_dir / path.name, encoding="utf-8")
+            replacement.setLevel(handler.level)
+            replacement.setFormatter(handler.formatter)
+            lg.removeHandler(handler)
+            handler.close()
+            lg.addHandler(replacement)
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+def _time(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _result(size: int, name: str, samples: list[float], items: int | None = None) -> dict:
+    result = {
+        "size": size,
+        "benchmark": name,
+        "runs": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+    if items:
+        result["per_item"] = result["median"] / items
+        result["items"] = items
+    return result
+
+
+def run_size(root: Path, size: int, repeat: int, email_fraction: float) -> list[dict]:
+    print(f"[{size}] building vault...", flush=True)
+    started = time.perf_counter()
+    vault = build_vault(root, size, email_fraction)
+    point_modules_at(vault, root / f"scratch_{size}")
+    print(f"[{size}] built in {time.perf_counter() - started:.1f}s", flush=True)
+
+    results = []
+
+    sample = sorted((vault / "Needs_Action").iterdir())[:FRONTMATTER_SAMPLE]
+    samples = _time(lambda: [orchestrator._parse_frontmatter(p) for p in sample], repeat)
+    results.append(_result(size, "_parse_frontmatter", samples, items=len(sample)))
+
+    samples = _time(reporting_engine.get_activity_stats, repeat)
+    results.append(_result(size, "get_activity_stats", samples, items=size))
+
+    samples = _time(audit_engine.run_system_audit, repeat)
+    results.append(_result(size, "run_system_audit", samples, items=size))
+
+    # Each call reasons about up to MAX_REASONING_PER_CYCLE new tasks
+    samples = _time(orchestrator._scan_needs_action, repeat)
+    results.append(_result(size, "_scan_needs_action", samples))
+
+    # Drains Approved/ completely, so it can only run once per vault
+    approved = sum(1 for _ in (vault / "Approved").iterdir())
+    samples = _time(orchestrator._scan_approved, 1)
+    results.append(_result(size, "_scan_approved", samples, items=approved))
+
+    for r in results:
+        print(f"[{size}] {r['benchmark']:<20} median {r['median'] * 1000:10.2f} ms", flush=True)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict):
+    """Print median ratios current/baseline for every shared (size, benchmark)."""
+    base = {(r["size"], r["benchmark"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline.get('commit') or 'baseline'}:")
+    for r in current["results"]:
+        old = base.get((r["size"], r["benchmark"]))
+        if old and old["median"] > 0:
+            ratio = r["median"] / old["median"]
+            print(f"  [{r['size']}] {r['benchmark']:<20} {ratio:6.2f}x")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Orchestrator queue-processing benchmarks")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated file counts per folder")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark")
+    parser.add_argument("--claude-delay", type=float, default=0.0,
+                        help="seconds the fake Claude CLI sleeps per call")
+    parser.add_argument("--email-fraction", type=float, default=0.01,
+                        help="share of Approved/ files that send through the fake CLI")
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline JSON to compare against")
+    parser.add_argument("--workdir", type=Path, default=None, help="where to build vaults (default: temp)")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic vaults")
+    parser.add_argument("--verbose", action="store_true", help="keep orchestrator INFO logging on")
+    args = parser.parse_args(argv)
+
+    os.environ["FAKE_CLAUDE_DELAY"] = str(args.claude_delay)
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    root = Path(tempfile.mkdtemp(prefix="ai_employee_bench_", dir=args.workdir))
+    try:
+        results = []
+        for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+            results.extend(run_size(root, size, args.repeat, args.email_fraction))
+    finally:
+        if args.keep:
+            print(f"Vaults kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "claude_delay": args.claude_delay,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
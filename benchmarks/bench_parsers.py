@@ -0,0 +1,159 @@
+"""
+bench_parsers.py - Offline replay benchmark for the browser DOM parsers.
+
+Responsibility:
+- Serves fixture pages (benchmarks/parser_fixtures.py) through a
+  context.route handler in headless Chromium; nothing leaves the machine
+- For each parser and page size (default 10, 100, 1000 items) times the
+  parser call over several runs and scores its output against the
+  expected results: precision/recall on the parser's key fields and the
+  share of matched items whose every field is correct
+- Replays captured snapshots from benchmarks/fixtures/<parser>/ as well,
+  scored against the expected output stored with them
+- human_delay and time.sleep are patched out while a parser runs, so the
+  numbers are extraction cost only
+
+Boundary:
+- Needs the playwright package and its Chromium build; no session or
+  credentials are used
+
+Usage:
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --parsers x_tweets,facebook_inbox --sizes 10,1000 --output parsers.json
+"""
+
+import argparse
+import importlib
+import json
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from parser_fixtures import BASE_DIR, PARSERS, call_parser, generate, load_captured, serve
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _no_delays(parser: str) -> ExitStack:
+    """Patch the parser module's human_delay and time.sleep out for the block."""
+    module = importlib.import_module(PARSERS[parser]["module"])
+    stack = ExitStack()
+    stack.enter_context(mock.patch.object(module, "human_delay", lambda *a, **k: None))
+    stack.enter_context(mock.patch.object(time, "sleep", lambda *a, **k: None))
+    return stack
+
+
+def score(parser: str, got: list[dict], expected: list[dict]) -> dict:
+    """Precision/recall on key fields, plus exact-field accuracy of the matches."""
+    key_fields = PARSERS[parser]["key"]
+    key = lambda item: tuple(item.get(f) for f in key_fields)  # noqa: E731
+    want = {key(item): item for item in expected}
+    have = {key(item): item for item in got}
+    matched = want.keys() & have.keys()
+    exact = sum(1 for k in matched if have[k] == want[k])
+    return {
+        "items": len(got),
+        "expected": len(expected),
+        "precision": len(matched) / len(have) if have else 1.0,
+        "recall": len(matched) / len(want) if want else 1.0,
+        "field_accuracy": exact / len(matched) if matched else 0.0,
+    }
+
+
+def run_fixture(context, parser: str, url: str, page_html: str, expected: list[dict],
+                repeat: int) -> dict:
+    serve(context, {url: page_html})
+    page = context.new_page()
+    try:
+        page.goto(url, wait_until="domcontentloaded", timeout=30_000)
+        samples, got = [], []
+        with _no_delays(parser):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                got = call_parser(parser, page, size=max(len(expected), 1))
+                samples.append(time.perf_counter() - start)
+    finally:
+        page.close()
+        context.unroute("**/*")
+
+    result = {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "runs": len(samples),
+    }
+    result.update(score(parser, got or [], expected))
+    result["per_item"] = result["median"] / max(len(expected), 1)
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Browser parser fixture replay benchmark")
+    parser.add_argument("--parsers", default=",".join(PARSERS),
+                        help=f"comma-separated subset of: {', '.join(PARSERS)}")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated items per synthetic page")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per fixture")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-captured", action="store_true", help="skip benchmarks/fixtures snapshots")
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    from playwright.sync_api import sync_playwright
+
+    names = [p for p in args.parsers.split(",") if p.strip()]
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = []
+    with sync_playwright() as pw:
+        browser = pw.chromium.launch(headless=True)
+        context = browser.new_context(viewport={"width": 1280, "height": 900})
+        try:
+            for name in names:
+                url = PARSERS[name]["url"]
+                fixtures = [(f"synthetic:{n}", url, *generate(name, n, args.seed)) for n in sizes]
+                if not args.no_captured:
+                    fixtures += [(f"captured:{c['name']}", c["url"], c["html"], c["expected"])
+                                 for c in load_captured(name)]
+                for label, fixture_url, page_html, expected in fixtures:
+                    result = run_fixture(context, name, fixture_url, page_html, expected, args.repeat)
+                    result.update({"parser": name, "fixture": label})
+                    results.append(result)
+                    print(
+                        f"{name:<19} {label:<22} {result['median'] * 1000:9.1f} ms  "
+                        f"{result['per_item'] * 1e6:8.1f} us/item  "
+                        f"P {result['precision']:.2f}  R {result['recall']:.2f}  "
+                        f"fields {result['field_accuracy']:.2f}",
+                        flush=True,
+                    )
+        finally:
+            context.close()
+            browser.close()
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+fake_claude.py - Deterministic stand-in for the Claude Code CLI.
+
+Responsibility:
+- Reads the prompt from stdin exactly like `claude -p`
+- Reasoning prompts: reads the task file named in the prompt and writes the
+  plan and approval files at the "at this exact path:" locations, with
+  approval frontmatter the executors can dispatch on
+- Structured prompts (REASONING_OUTPUT_MODE=json): answers with a JSON
+  result valid for the prompt's task type
+- Gmail MCP prompts (_execute_send_email, _send_session_alert_email):
+  reports a successful send
+- Simulates latency and failure distributions; every random draw is seeded
+  from FAKE_CLAUDE_SEED and the task name, so a run is reproducible
+- With --input-format stream-json (claude_session.py) stays alive and
+  answers each JSON user turn on stdin with assistant and result events
+- With --output-format json / stream-json prints the result event (and,
+  for stream-json, an assistant event with the tool_use blocks); result
+  events carry rough usage and cost, and --model is recorded in the log
+
+Configuration (environment variables, or the same keys in lower case in
+the JSON file named by FAKE_CLAUDE_CONFIG):
+    FAKE_CLAUDE_LATENCY         fixed:S | uniform:A,B | lognormal:MU,SIGMA
+                                (seconds; default fixed:$FAKE_CLAUDE_DELAY or 0)
+    FAKE_CLAUDE_FAIL_RATE       share of calls that exit 1 with an error
+    FAKE_CLAUDE_TIMEOUT_RATE    share of calls that hang for FAKE_CLAUDE_HANG
+                                seconds (default 600, past the orchestrator's
+                                120s timeout)
+    FAKE_CLAUDE_NO_ACTION_RATE  share of reasoning calls that write only a
+                                plan (no approval file)
+    FAKE_CLAUDE_STARTUP         seconds of process cold start before the first
+                                prompt is read (default 0)
+    FAKE_CLAUDE_SEED            seed for all draws (default 0)
+    FAKE_CLAUDE_LOG             append one JSON line per call to this file
+
+Boundary:
+- Produces structurally valid files only; content is placeholder text
+- Never touches the network
+
+Usage:
+    CLAUDE_CMD="python benchmarks/fake_claude.py" python orchestrator.py
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+_PATH_RE = re.compile(r"at this exact path:\s*\n\s*(\S.*?)\s*$", re.MULTILINE)
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---", re.DOTALL)
+_STRUCTURED_RE = re.compile(r"^Task type: (\S+)\nTask file: (.+)$", re.MULTILINE)
+
+# task type → actions a structured "act" answer proposes
+STRUCTURED_ACTIONS = {
+    "email": ["reply"],
+    "tweet": ["like", "reply"],
+    "watchlist": ["like", "reply"],
+    "linkedin_post": ["like", "comment"],
+    "instagram_dm": ["reply"],
+    "facebook_dm": ["reply"],
+}
+
+# Approval filename prefix → (type, action) the executor dispatches on
+APPROVAL_TYPES = {
+    "REPLY_": ("email_action", "send_reply"),
+    "ACTION_TWEET_": ("tweet_action", "engage"),
+    "ACTION_LINKEDIN_": ("linkedin_action", "engage"),
+    "ACTION_INSTAGRAM_": ("instagram_action", "reply"),
+    "ACTION_FACEBOOK_": ("facebook_action", "reply"),
+    "ACTION_ODOO_": ("odoo_action", "review"),
+}
+
+DEFAULTS = {
+    "latency": None,
+    "delay": "0",
+    "fail_rate": "0",
+    "timeout_rate": "0",
+    "no_action_rate": "0",
+    "hang": "600",
+    "startup": "0",
+    "seed": "0",
+    "log": "",
+}
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+def load_config() -> dict:
+    config = dict(DEFAULTS)
+    path = os.environ.get("FAKE_CLAUDE_CONFIG")
+    if path:
+        config.update({k: str(v) for k, v in json.loads(Path(path).read_text(encoding="utf-8")).items()})
+    for key in DEFAULTS:
+        value = os.environ.get(f"FAKE_CLAUDE_{key.upper()}")
+        if value is not None:
+            config[key] = value
+    if not config["latency"]:
+        config["latency"] = f"fixed:{config['delay']}"
+    return config
+
+
+def draw_latency(spec: str, rng: random.Random) -> float:
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()]
+    if kind == "fixed":
+        return values[0] if values else 0.0
+    if kind == "uniform":
+        return rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        return rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+# ---------------------------------------------------------------------------
+# Prompt handling
+# ---------------------------------------------------------------------------
+
+def _task_fields(task_path: Path | None) -> dict:
+    """Flat key: value pairs from the task file's frontmatter (no YAML dependency)."""
+    if task_path is None or not task_path.exists():
+        return {}
+    match = _FRONTMATTER_RE.match(task_path.read_text(encoding="utf-8"))
+    fields = {}
+    for line in (match.group(1).splitlines() if match else []):
+        key, sep, value = line.partition(":")
+        if sep and not line.startswith(" "):
+            fields[key.strip()] = value.strip().strip('"')
+    return fields
+
+
+def _approval_text(approval: Path, task: dict) -> str:
+    lines = ["---"]
+    for prefix, (action_type, action) in APPROVAL_TYPES.items():
+        if approval.name.startswith(prefix):
+            lines += [f"type: {action_type}", f"action: {action}"]
+            lines.append(f'source_task: "{approval.name[len(prefix):]}"')
+            break
+    if task.get("from"):
+        lines.append(f'to: "{task["from"]}"')
+    if task.get("subject"):
+        lines.append(f'subject: "Re: {task["subject"]}"')
+    if task.get("trace_id"):
+        lines.append(f'trace_id: "{task["trace_id"]}"')
+    lines += ["status: pending_approval", "---", "", "# Proposed Reply", "", "Synthetic reply.", ""]
+    return "\n".join(lines)
+
+
+def handle_reasoning(paths: list[Path], no_action: bool) -> str:
+    task = next((p for p in paths if p.parent.name == "Needs_Action"), None)
+    fields = _task_fields(task)
+    wrote_approval = False
+    for path in paths:
+        if path.parent.name == "Plans":
+            path.write_text(f"# Plan\n\nSynthetic plan for {path.name}\n", encoding="utf-8")
+        elif path.parent.name == "Pending_Approval" and not no_action:
+            path.write_text(_approval_text(path, fields), encoding="utf-8")
+            wrote_approval = True
+    return "approval" if wrote_approval else "no_action"
+
+
+def handle_structured(task_type: str, no_action: bool) -> tuple[str, str]:
+    if no_action:
+        return "no_action", json.dumps({"decision": "ignore", "summary": "Synthetic task.",
+                                        "reasoning": "Nothing to do."})
+    result = {"decision": "act", "summary": "Synthetic task.", "reasoning": "Synthetic reasoning."}
+    if task_type == "odoo_event":
+        result.update({"urgency": "medium", "urgency_reason": "Synthetic.",
+                       "recommended_actions": ["Review the record in Odoo."], "context": ""})
+    else:
+        result["actions"] = STRUCTURED_ACTIONS.get(task_type, ["reply"])
+        result["comment_text" if task_type == "linkedin_post" else "reply_text"] = "Synthetic reply."
+    return "approval", json.dumps(result)
+
+
+def _log(path: str, record: dict):
+    if not path:
+        return
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record) + "\n")
+
+
+def handle_prompt(prompt: str, config: dict) -> tuple[str, str, list[str]]:
+    """Simulate one CLI turn; returns (outcome, text, tools used). Sleeps for the drawn latency."""
+    started = time.time()
+    paths = [Path(p) for p in _PATH_RE.findall(prompt)]
+    structured = _STRUCTURED_RE.search(prompt)
+    if structured:
+        kind, key = "structured", structured.group(2).strip()
+    elif paths:
+        kind, key = "reasoning", paths[0].name
+    else:
+        kind, key = "send_email", hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    rng = random.Random(f"{config['seed']}:{key}")
+
+    latency = draw_latency(config["latency"], rng)
+    roll = rng.random()
+    fail_rate = float(config["fail_rate"])
+    timeout_rate = float(config["timeout_rate"])
+    no_action = rng.random() < float(config["no_action_rate"])
+
+    if roll < timeout_rate:
+        outcome = "timeout"
+        _log(config["log"], {"kind": kind, "key": key, "outcome": outcome, "start": started})
+        time.sleep(float(config["hang"]))
+        return outcome, "", []
+
+    time.sleep(latency)
+    tools = []
+    if roll < timeout_rate + fail_rate:
+        outcome, text = "error", "Error: simulated failure"
+    elif kind == "structured":
+        outcome, text = handle_structured(structured.group(1), no_action)
+    elif kind == "reasoning":
+        outcome, text = handle_reasoning(paths, no_action), "done"
+        tools = ["Read", "Write", "Write"] if outcome == "approval" else ["Read", "Write"]
+    else:
+        outcome, text = "sent", "Email sent successfully."
+        tools = ["mcp__gmail__send_email"]
+
+    _log(config["log"], {
+        "kind": kind, "key": key, "outcome": outcome, "model": _model(),
+        "start": started, "latency": round(time.time() - started, 4),
+    })
+    return outcome, text, tools
+
+
+def _arg(flag: str) -> str | None:
+    return sys.argv[sys.argv.index(flag) + 1] if flag in sys.argv[:-1] else None
+
+
+def _model() -> str:
+    return _arg("--model") or "default"
+
+
+def _turn_events(prompt: str, outcome: str, text: str, tools: list[str],
+                 started: float, session_id: str) -> list[dict]:
+    """assistant + result events for one turn, with rough usage (4 chars/token)
+    and cost (at $3 / $15 per million input / output tokens)."""
+    usage = {"input_tokens": len(prompt) // 4 + 1, "output_tokens": len(text) // 4 + 1}
+    content = [{"type": "tool_use", "id": f"toolu_{i}", "name": name, "input": {}}
+               for i, name in enumerate(tools)]
+    content.append({"type": "text", "text": text})
+    return [
+        {"type": "assistant", "session_id": session_id,
+         "message": {"role": "assistant", "content": content}},
+        {
+            "type": "result",
+            "subtype": "error_during_execution" if outcome == "error" else "success",
+            "is_error": outcome == "error",
+            "result": text,
+            "duration_ms": int((time.time() - started) * 1000),
+            "num_turns": len(tools) + 1,
+            "session_id": session_id,
+            "usage": usage,
+            "total_cost_usd": round(usage["input_tokens"] * 3e-6 + usage["output_tokens"] * 15e-6, 6),
+        },
+    ]
+
+
+def _emit(event: dict):
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+def stream_main(config: dict) -> int:
+    """stream-json mode: one result event per user turn until stdin closes."""
+    session_id = hashlib.sha256(f"{os.getpid()}:{time.time()}".encode()).hexdigest()[:32]
+    _emit({"type": "system", "subtype": "init", "session_id": session_id})
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        message = json.loads(line).get("message", {})
+        content = message.get("content", "")
+        prompt = content if isinstance(content, str) else "".join(
+            part.get("text", "") for part in content if part.get("type") == "text"
+        )
+        started = time.time()
+        outcome, text, tools = handle_prompt(prompt, config)
+        for event in _turn_events(prompt, outcome, text, tools, started, session_id):
+            _emit(event)
+    return 0
+
+
+def main() -> int:
+    config = load_config()
+    time.sleep(float(config["startup"]))
+    if _arg("--input-format") == "stream-json":
+        return stream_main(config)
+
+    prompt = sys.stdin.read()
+    started = time.time()
+    outcome, text, tools = handle_prompt(prompt, config)
+    output_format = _arg("--output-format") or "text"
+    if outcome == "error":
+        print(text, file=sys.stderr)
+    elif output_format in ("json", "stream-json"):
+        events = _turn_events(prompt, outcome, text, tools, started, "oneshot")
+        if output_format == "json":
+            events = events[-1:]
+        for event in events:
+            _emit(event)
+    elif text:
+        print(text)
+    return 1 if outcome in ("error", "timeout") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
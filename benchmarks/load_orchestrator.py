@@ -0,0 +1,190 @@
+"""
+load_orchestrator.py - Offline load test of the reasoning pipeline.
+
+Responsibility:
+- Fills a throwaway vault's Needs_Action/ with synthetic tasks of every type
+- Runs the orchestrator's real reasoning triggers against
+  benchmarks/fake_claude.py at several concurrency levels
+- Reports throughput and p50/p95/p99 latency per level, together with the
+  fake CLI's outcome counts (approval / no_action / error / timeout)
+- --backend session runs the same load through claude_session.py's
+  persistent workers (one per concurrency slot); --startup models the CLI
+  cold start that backend avoids
+- --output-mode json loads the structured path (orchestrator._reason_structured)
+  instead, where the orchestrator renders the plan/approval files itself
+
+Boundary:
+- The orchestrator reasons about one task at a time in production; higher
+  concurrency levels model running several reasoning workers and show how
+  much headroom the subprocess/file path has before the CLI dominates
+- No tokens, network or browser; all paths are redirected into the temp
+  vault (see bench_orchestrator.point_modules_at)
+
+Usage:
+    python benchmarks/load_orchestrator.py --tasks 200 --concurrency 1,4,16 \
+        --latency lognormal:0.5,0.6 --fail-rate 0.02 --output load.json
+    python benchmarks/load_orchestrator.py --backend session --startup 2.0
+    python benchmarks/load_orchestrator.py --output-mode json
+"""
+
+import argparse
+import concurrent.futures
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+# Imported first: puts the repo root on sys.path and points CLAUDE_CMD at fake_claude.py
+from bench_orchestrator import TASK_KINDS, _git_commit, _task_text, point_modules_at
+
+import claude_session
+import orchestrator
+import tracing
+
+TRIGGERS = {
+    "email": orchestrator._trigger_claude_reasoning,
+    "tweet": orchestrator._trigger_claude_tweet_reasoning,
+    "linkedin_post": orchestrator._trigger_claude_linkedin_reasoning,
+    "instagram_dm": orchestrator._trigger_claude_instagram_reasoning,
+    "facebook_dm": orchestrator._trigger_claude_facebook_reasoning,
+    "odoo_event": orchestrator._trigger_claude_odoo_reasoning,
+}
+
+
+def build_tasks(vault: Path, count: int) -> list[tuple[str, Path]]:
+    for name in ("Needs_Action", "Plans", "Pending_Approval", "Approved", "Done"):
+        (vault / name).mkdir(parents=True, exist_ok=True)
+    tasks = []
+    for i in range(count):
+        prefix, task_type = TASK_KINDS[i % len(TASK_KINDS)]
+        path = vault / "Needs_Action" / f"{prefix}{i:06d}.md"
+        path.write_text(_task_text(task_type, i), encoding="utf-8")
+        tracing.stamp(path)
+        tasks.append((task_type, path))
+    return tasks
+
+
+def run_level(root: Path, tasks_count: int, concurrency: int) -> dict:
+    vault = root / f"vault_c{concurrency}"
+    scratch = root / f"scratch_c{concurrency}"
+    tasks = build_tasks(vault, tasks_count)
+    point_modules_at(vault, scratch)
+    fake_log = scratch / "fake_claude.jsonl"
+    os.environ["FAKE_CLAUDE_LOG"] = str(fake_log)
+    orchestrator.CLAUDE_WORKERS = concurrency
+
+    def _one(task):
+        task_type, path = task
+        start = time.perf_counter()
+        if orchestrator.REASONING_OUTPUT_MODE == "json":
+            try:
+                meta = orchestrator._parse_frontmatter(path)
+                orchestrator._reason_structured(path, meta, task_type)
+            except Exception:
+                pass    # counted from the fake CLI's outcome log
+        else:
+            TRIGGERS[task_type](path)
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = sorted(pool.map(_one, tasks))
+    finally:
+        claude_session.shutdown()   # next level gets a pool sized to its concurrency
+    wall = time.perf_counter() - started
+
+    outcomes = Counter()
+    if fake_log.exists():
+        for line in fake_log.read_text(encoding="utf-8").splitlines():
+            outcomes[json.loads(line)["outcome"]] += 1
+
+    result = {
+        "backend": orchestrator.REASONING_BACKEND,
+        "output_mode": orchestrator.REASONING_OUTPUT_MODE,
+        "concurrency": concurrency,
+        "tasks": tasks_count,
+        "wall_seconds": wall,
+        "throughput_per_s": tasks_count / wall if wall else 0.0,
+        "p50": tracing.percentile(latencies, 50),
+        "p95": tracing.percentile(latencies, 95),
+        "p99": tracing.percentile(latencies, 99),
+        "max": latencies[-1] if latencies else 0.0,
+        "approval_files": sum(1 for _ in (vault / "Pending_Approval").iterdir()),
+        "outcomes": dict(outcomes),
+    }
+    print(
+        f"[{result['backend']}/{result['output_mode']} c={concurrency:>3}] {result['throughput_per_s']:7.2f} tasks/s  "
+        f"p50 {result['p50']:.3f}s  p95 {result['p95']:.3f}s  p99 {result['p99']:.3f}s  "
+        f"{dict(outcomes)}",
+        flush=True,
+    )
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Orchestrator reasoning load test")
+    parser.add_argument("--tasks", type=int, default=120, help="tasks per concurrency level")
+    parser.add_argument("--concurrency", default="1,4,8", help="comma-separated worker counts")
+    parser.add_argument("--latency", default="lognormal:-0.7,0.5",
+                        help="fake CLI latency (fixed:S | uniform:A,B | lognormal:MU,SIGMA)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0,
+                        help="share of calls that hang past the orchestrator's 120s timeout")
+    parser.add_argument("--no-action-rate", type=float, default=0.2)
+    parser.add_argument("--backend", choices=("subprocess", "session"), default="subprocess",
+                        help="orchestrator REASONING_BACKEND to load")
+    parser.add_argument("--output-mode", choices=("files", "json"), default="files",
+                        help="orchestrator REASONING_OUTPUT_MODE to load")
+    parser.add_argument("--startup", type=float, default=0.0,
+                        help="fake CLI cold-start seconds per process")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results here")
+    parser.add_argument("--workdir", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    os.environ.update({
+        "FAKE_CLAUDE_LATENCY": args.latency,
+        "FAKE_CLAUDE_FAIL_RATE": str(args.fail_rate),
+        "FAKE_CLAUDE_TIMEOUT_RATE": str(args.timeout_rate),
+        "FAKE_CLAUDE_NO_ACTION_RATE": str(args.no_action_rate),
+        "FAKE_CLAUDE_SEED": str(args.seed),
+        "FAKE_CLAUDE_STARTUP": str(args.startup),
+    })
+    orchestrator.REASONING_BACKEND = args.backend
+    orchestrator.REASONING_OUTPUT_MODE = args.output_mode
+    logging.disable(logging.INFO)
+
+    root = Path(tempfile.mkdtemp(prefix="ai_employee_load_", dir=args.workdir))
+    try:
+        levels = [run_level(root, args.tasks, int(c)) for c in args.concurrency.split(",") if c.strip()]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "backend": args.backend,
+        "output_mode": args.output_mode,
+        "startup": args.startup,
+        "latency": args.latency,
+        "fail_rate": args.fail_rate,
+        "timeout_rate": args.timeout_rate,
+        "no_action_rate": args.no_action_rate,
+        "seed": args.seed,
+        "levels": levels,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,432 @@
+"""
+odoo_simulator.py - Local Odoo XML-RPC stand-in with synthetic datasets.
+
+Responsibility:
+- Serves /xmlrpc/2/common (version, authenticate) and /xmlrpc/2/object
+  (execute_kw: search_read, search, search_count, read, read_group) over
+  generated sale.order, account.move and ir.model tables
+- Evaluates Odoo domains (implicit AND, prefix '&' '|' '!', the usual
+  comparison operators, many2one ids)
+- Injects latency per call and per returned record
+- /xmlrpc/2/sim exposes mutate() for benchmarks: changes records the way
+  users do in Odoo (bumping write_date) and returns the events odoo_watcher
+  is expected to raise for them
+
+Boundary:
+- Benchmarks and manual testing only — no access rights, no onchange
+  logic, no writes through execute_kw
+- write_date uses the local clock, matching how odoo_watcher formats its
+  `since` cursor
+
+Usage:
+    python benchmarks/odoo_simulator.py --orders 100000 --invoices 100000 --port 8069
+    (then point credentials/odoo_config.json at http://127.0.0.1:8069, db "sim",
+     username "admin", password "admin")
+"""
+
+import argparse
+import bisect
+import json
+import random
+import socketserver
+import threading
+import time
+from datetime import date, datetime, timedelta
+from xmlrpc.server import MultiPathXMLRPCServer, SimpleXMLRPCDispatcher, SimpleXMLRPCRequestHandler
+
+DB = "sim"
+USERNAME = "admin"
+PASSWORD = "admin"
+UID = 2
+
+ODOO_DT = "%Y-%m-%d %H:%M:%S"
+
+SALE_STATES = ["draft", "sent", "sale", "done", "cancel"]
+SALE_WEIGHTS = [0.2, 0.15, 0.45, 0.1, 0.1]
+MOVE_TYPES = ["out_invoice", "out_refund", "in_invoice", "in_refund"]
+MOVE_WEIGHTS = [0.7, 0.05, 0.22, 0.03]
+
+# Mutations applied by mutate(): (model, from, to, expected odoo_watcher event)
+SALE_TRANSITIONS = [
+    ("draft", "sent", "quotation_sent"),
+    ("draft", "sale", "order_confirmed"),
+    ("sent", "sale", "order_confirmed"),
+    ("sale", "done", "order_locked"),
+    ("sent", "cancel", "quotation_cancelled"),
+]
+INVOICE_TRANSITIONS = [
+    # (state, payment_state) before → after
+    (("draft", "not_paid"), ("posted", "not_paid"), "invoice_posted"),
+    (("posted", "not_paid"), ("posted", "paid"), "invoice_fully_paid"),
+    (("posted", "not_paid"), ("posted", "partial"), "invoice_partially_paid"),
+    (("posted", "not_paid"), ("posted", "in_payment"), "invoice_payment_registered"),
+]
+
+
+# ---------------------------------------------------------------------------
+# Latency
+# ---------------------------------------------------------------------------
+
+def parse_latency(spec: str):
+    """'fixed:S' | 'uniform:A,B' | 'lognormal:MU,SIGMA' → callable returning seconds."""
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()]
+    rng = random.Random(0)
+    if kind == "fixed":
+        return lambda: values[0] if values else 0.0
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+# ---------------------------------------------------------------------------
+# Domain evaluation
+# ---------------------------------------------------------------------------
+
+def _field_value(record: dict, field: str):
+    value = record.get(field, False)
+    if isinstance(value, list) and len(value) == 2 and isinstance(value[0], int):
+        return value[0]  # many2one compares on id
+    return value
+
+
+def _leaf(record: dict, leaf) -> bool:
+    field, op, target = leaf
+    value = _field_value(record, field)
+    if op == "=":
+        return value == target
+    if op == "!=":
+        return value != target
+    if op == "in":
+        return value in target
+    if op == "not in":
+        return value not in target
+    if op in ("like", "ilike"):
+        return str(target).lower() in str(value or "").lower()
+    if value is False or value is None:
+        return False
+    if op == ">":
+        return value > target
+    if op == ">=":
+        return value >= target
+    if op == "<":
+        return value < target
+    if op == "<=":
+        return value <= target
+    raise ValueError(f"Unsupported domain operator: {op}")
+
+
+def compile_domain(domain: list):
+    """Return a predicate for an Odoo prefix-notation domain."""
+    tokens = list(domain)
+    pos = 0
+
+    def parse():
+        nonlocal pos
+        token = tokens[pos]
+        pos += 1
+        if token == "!":
+            inner = parse()
+            return lambda r: not inner(r)
+        if token in ("&", "|"):
+            left, right = parse(), parse()
+            if token == "&":
+                return lambda r: left(r) and right(r)
+            return lambda r: left(r) or right(r)
+        return lambda r, leaf=tuple(token): _leaf(r, leaf)
+
+    terms = []
+    while pos < len(tokens):
+        terms.append(parse())
+    return lambda r: all(term(r) for term in terms)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+class OdooSimulator:
+    def __init__(self, orders: int = 10_000, invoices: int = 10_000, partners: int = 500,
+                 seed: int = 0, latency: str = "fixed:0", latency_per_record: float = 0.0):
+        self.rng = random.Random(seed)
+        self.latency = parse_latency(latency)
+        self.latency_per_record = latency_per_record
+        self._lock = threading.Lock()
+        self.calls = 0
+
+        self.partners = [[i, f"Partner {i}"] for i in range(1, partners + 1)]
+        now = datetime.now()
+        self.tables: dict[str, list[dict]] = {
+            "ir.model": [
+                {"id": 1, "model": "sale.order", "name": "Sales Order"},
+                {"id": 2, "model": "account.move", "name": "Journal Entry"},
+            ],
+            "sale.order": [self._make_order(i, now) for i in range(1, orders + 1)],
+            "account.move": [self._make_invoice(i, now) for i in range(1, invoices + 1)],
+        }
+        self._by_id = {model: {r["id"]: r for r in rows} for model, rows in self.tables.items()}
+        # Tables are kept sorted by write_date so "write_date >=" polls bisect
+        for model in ("sale.order", "account.move"):
+            self.tables[model].sort(key=lambda r: r["write_date"])
+
+    def _past(self, now: datetime, max_days: int = 365) -> datetime:
+        # Everything pre-generated is at least a day old so the watcher's
+        # startup lookback sees only mutate() changes
+        return now - timedelta(days=1 + self.rng.random() * max_days)
+
+    def _make_order(self, i: int, now: datetime) -> dict:
+        state = self.rng.choices(SALE_STATES, SALE_WEIGHTS)[0]
+        ordered = self._past(now)
+        return {
+            "id": i,
+            "name": f"S{i:07d}",
+            "state": state,
+            "partner_id": self.rng.choice(self.partners),
+            "amount_total": round(self.rng.lognormvariate(6.5, 1.0), 2),
+            "date_order": ordered.strftime(ODOO_DT),
+            "write_date": ordered.strftime(ODOO_DT),
+            "user_id": [UID, "Administrator"],
+            "origin": False,
+            "note": False,
+            "invoice_status": "to invoice" if state == "sale" and self.rng.random() < 0.3 else "invoiced",
+        }
+
+    def _make_invoice(self, i: int, now: datetime) -> dict:
+        move_type = self.rng.choices(MOVE_TYPES, MOVE_WEIGHTS)[0]
+        state = self.rng.choices(["draft", "posted", "cancel"], [0.1, 0.85, 0.05])[0]
+        payment = "not_paid"
+        if state == "posted":
+            payment = self.rng.choices(["not_paid", "partial", "paid", "in_payment"], [0.35, 0.1, 0.5, 0.05])[0]
+        invoiced = self._past(now)
+        total = round(self.rng.lognormvariate(6.0, 1.0), 2)
+        residual = {"paid": 0.0, "partial": round(total / 2, 2)}.get(payment, total)
+        return {
+            "id": i,
+            "name": f"INV/{invoiced.year}/{i:07d}" if state != "draft" else "/",
+            "move_type": move_type,
+            "state": state,
+            "payment_state": payment,
+            "partner_id": self.rng.choice(self.partners),
+            "amount_total": total,
+            "amount_residual": residual,
+            "invoice_date": invoiced.strftime("%Y-%m-%d"),
+            "invoice_date_due": (invoiced + timedelta(days=30)).strftime("%Y-%m-%d"),
+            "write_date": invoiced.strftime(ODOO_DT),
+            "invoice_user_id": [UID, "Administrator"],
+            "invoice_origin": False,
+            "narration": False,
+        }
+
+    # -- querying ------------------------------------------------------------
+
+    def _candidates(self, model: str, domain: list) -> list[dict]:
+        """Rows that may match: bisects on a top-level "write_date >=" leaf."""
+        rows = self.tables[model]
+        if any(isinstance(token, str) for token in domain):
+            return rows  # domain uses '&'/'|'/'!' — scan everything
+        for leaf in domain:
+            if leaf[0] == "write_date" and leaf[1] == ">=":
+                return rows[bisect.bisect_left(rows, leaf[2], key=lambda r: r["write_date"]):]
+        return rows
+
+    def search_records(self, model: str, domain: list, offset: int = 0, limit=None, order=None) -> list[dict]:
+        if model not in self.tables:
+            raise ValueError(f"Object {model} doesn't exist")
+        predicate = compile_domain(domain)
+        rows = [r for r in self._candidates(model, domain) if predicate(r)]
+        if order:
+            for part in reversed([p.strip() for p in order.split(",")]):
+                field, _, direction = part.partition(" ")
+                rows.sort(key=lambda r: (r.get(field) is False, r.get(field)), reverse=direction.lower() == "desc")
+        rows = rows[offset:]
+        if limit:
+            rows = rows[:limit]
+        return rows
+
+    @staticmethod
+    def _project(rows: list[dict], fields) -> list[dict]:
+        if not fields:
+            return [dict(r) for r in rows]
+        return [{"id": r["id"], **{f: r.get(f, False) for f in fields}} for r in rows]
+
+    def _sleep(self, records: int):
+        delay = self.latency() + self.latency_per_record * records
+        if delay > 0:
+            time.sleep(delay)
+
+    def execute_kw(self, db, uid, password, model, method, args, kwargs=None):
+        if db != DB or uid != UID or password != PASSWORD:
+            raise PermissionError("Access Denied")
+        kwargs = kwargs or {}
+        with self._lock:
+            self.calls += 1
+            result = self._dispatch(model, method, args, kwargs)
+        self._sleep(len(result) if isinstance(result, list) else 1)
+        return result
+
+    def _dispatch(self, model, method, args, kwargs):
+        domain = args[0] if args else kwargs.get("domain", [])
+        if method == "search_read":
+            rows = self.search_records(model, domain, kwargs.get("offset", 0), kwargs.get("limit"), kwargs.get("order"))
+            return self._project(rows, kwargs.get("fields"))
+        if method == "search":
+            rows = self.search_records(model, domain, kwargs.get("offset", 0), kwargs.get("limit"), kwargs.get("order"))
+            return [r["id"] for r in rows]
+        if method == "search_count":
+            return len(self.search_records(model, domain))
+        if method == "read":
+            ids = args[0] if args else kwargs.get("ids", [])
+            table = self._by_id[model]
+            return self._project([table[i] for i in ids if i in table], kwargs.get("fields") or (args[1] if len(args) > 1 else None))
+        if method == "read_group":
+            fields = kwargs.get("fields") or (args[1] if len(args) > 1 else [])
+            groupby = kwargs.get("groupby") or (args[2] if len(args) > 2 else [])
+            return self._read_group(model, domain, fields, groupby)
+        raise ValueError(f"Method {method} not supported by the simulator")
+
+    def _read_group(self, model, domain, fields, groupby) -> list[dict]:
+        if isinstance(groupby, str):
+            groupby = [groupby]
+        key_field = groupby[0] if groupby else None
+        field_name, _, granularity = (key_field or "").partition(":")
+        sums = [f.partition(":")[0] for f in fields if f.partition(":")[0] not in (field_name, "id")]
+        groups: dict = {}
+        for row in self.search_records(model, domain):
+            value = row.get(field_name, False) if key_field else None
+            if granularity == "month" and value:
+                value = value[:7]
+            elif isinstance(value, list):
+                value = tuple(value)
+            group = groups.setdefault(value, {f"{field_name}_count" if key_field else "__count": 0, **{s: 0.0 for s in sums}})
+            group[f"{field_name}_count" if key_field else "__count"] += 1
+            for s in sums:
+                group[s] += row.get(s) or 0.0
+        result = []
+        for value, agg in groups.items():
+            entry = dict(agg)
+            if key_field:
+                entry[key_field] = list(value) if isinstance(value, tuple) else value
+                entry["__domain"] = list(domain) + [[field_name, "=", value[0] if isinstance(value, tuple) else value]]
+            result.append(entry)
+        return result
+
+    # -- benchmark control ---------------------------------------------------
+
+    def mutate(self, count: int, seed: int = 1) -> list[list]:
+        """Apply `count` state transitions; return [model, id, expected_event] triples."""
+        rng = random.Random(seed)
+        now = datetime.now().strftime(ODOO_DT)
+        expected = []
+        with self._lock:
+            by_state: dict = {}
+            for model in ("sale.order", "account.move"):
+                for r in self.tables[model]:
+                    by_state.setdefault((model, r["state"], r.get("payment_state")), []).append(r)
+            touched = set()
+            for _ in range(count):
+                if rng.random() < 0.5:
+                    frm, to, event = rng.choice(SALE_TRANSITIONS)
+                    pool = by_state.get(("sale.order", frm, None), [])
+                    model = "sale.order"
+                else:
+                    (frm_s, frm_p), (to_s, to_p), event = rng.choice(INVOICE_TRANSITIONS)
+                    pool = by_state.get(("account.move", frm_s, frm_p), [])
+                    model = "account.move"
+                pool = [r for r in pool if (model, r["id"]) not in touched]
+                if not pool:
+                    continue
+                record = rng.choice(pool)
+                touched.add((model, record["id"]))
+                if model == "sale.order":
+                    record["state"] = to
+                else:
+                    record["state"], record["payment_state"] = to_s, to_p
+                    if to_s == "posted" and record["name"] == "/":
+                        record["name"] = f"INV/{date.today().year}/{record['id']:07d}"
+                    if to_p == "paid":
+                        record["amount_residual"] = 0.0
+                    # Keep the expected event unambiguous: not overdue
+                    record["invoice_date_due"] = (date.today() + timedelta(days=30)).isoformat()
+                record["write_date"] = now
+                expected.append([model, record["id"], event])
+            for model in ("sale.order", "account.move"):
+                self.tables[model].sort(key=lambda r: r["write_date"])
+        return expected
+
+    def dump_state(self, path: str) -> int:
+        """Write an odoo_watcher state file for every record (a fully caught-up watcher)."""
+        with self._lock:
+            state = {}
+            for model in ("sale.order", "account.move"):
+                for r in self.tables[model]:
+                    entry = {"state": r["state"], "write_date": r["write_date"]}
+                    if model == "account.move":
+                        entry["payment_state"] = r["payment_state"]
+                    state[f"{model}:{r['id']}"] = entry
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+        return len(state)
+
+
+# ---------------------------------------------------------------------------
+# XML-RPC server
+# ---------------------------------------------------------------------------
+
+class _ThreadingServer(socketserver.ThreadingMixIn, MultiPathXMLRPCServer):
+    daemon_threads = True
+
+
+class _RequestHandler(SimpleXMLRPCRequestHandler):
+    rpc_paths = ("/xmlrpc/2/common", "/xmlrpc/2/object", "/xmlrpc/2/sim")
+
+
+def make_server(sim: OdooSimulator, host: str = "127.0.0.1", port: int = 0) -> _ThreadingServer:
+    server = _ThreadingServer(
+        (host, port), requestHandler=_RequestHandler, logRequests=False, allow_none=True,
+    )
+
+    common = SimpleXMLRPCDispatcher(allow_none=True, encoding=None)
+    common.register_function(lambda: {"server_version": "17.0", "server_serie": "17.0"}, "version")
+    common.register_function(
+        lambda db, login, password, ctx=None: UID if (db, login, password) == (DB, USERNAME, PASSWORD) else False,
+        "authenticate",
+    )
+    server.add_dispatcher("/xmlrpc/2/common", common)
+
+    obj = SimpleXMLRPCDispatcher(allow_none=True, encoding=None)
+    obj.register_function(sim.execute_kw, "execute_kw")
+    server.add_dispatcher("/xmlrpc/2/object", obj)
+
+    control = SimpleXMLRPCDispatcher(allow_none=True, encoding=None)
+    control.register_function(sim.mutate, "mutate")
+    control.register_function(sim.dump_state, "dump_state")
+    control.register_function(lambda: sim.calls, "calls")
+    server.add_dispatcher("/xmlrpc/2/sim", control)
+    return server
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Local Odoo XML-RPC simulator")
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--invoices", type=int, default=10_000)
+    parser.add_argument("--partners", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", default="fixed:0", help="per call: fixed:S | uniform:A,B | lognormal:MU,SIGMA")
+    parser.add_argument("--latency-per-record", type=float, default=0.0, help="extra seconds per returned record")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8069)
+    args = parser.parse_args(argv)
+
+    sim = OdooSimulator(args.orders, args.invoices, args.partners, args.seed, args.latency, args.latency_per_record)
+    server = make_server(sim, args.host, args.port)
+    print(f"Odoo simulator on http://{args.host}:{server.server_address[1]} (db={DB}, {USERNAME}/{PASSWORD})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+parser_fixtures.py - HTML fixtures for the browser DOM parsers.
+
+Responsibility:
+- PARSERS: one entry per parser (x tweets/following, LinkedIn posts,
+  Instagram and Facebook inbox/messages) naming the module, function,
+  the URL the fixture is served at and the key fields used for scoring
+- Synthetic pages: generate(parser, n, seed) builds a page with n items in
+  the DOM shape the parser's selectors expect, plus the exact list of
+  dicts the parser should return for it
+- Snapshots: `capture` opens the real site with the saved session, stores
+  page.content() under benchmarks/fixtures/<parser>/<name>.html and the
+  live parse result next to it as the expected output (<name>.json),
+  which can be hand-corrected afterwards
+- serve(context, pages): context.route handler that answers the fixture
+  URLs from memory and aborts every other request, so replay never
+  touches the network
+
+Boundary:
+- Synthetic pages cover the selectors only, not the sites' styling or
+  scripts; captured snapshots are the rendered DOM, replayed without JS
+- Captured fixtures may contain private messages and are not meant to be
+  committed
+
+Usage:
+    python benchmarks/parser_fixtures.py capture x_tweets --name mentions
+    python benchmarks/parser_fixtures.py capture instagram_messages \
+        --url https://www.instagram.com/direct/t/1234/ --name thread --headed
+"""
+
+import argparse
+import html
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+CREDENTIALS_DIR = BASE_DIR / "credentials"
+sys.path.insert(0, str(BASE_DIR))
+
+# parser name → where it lives, what it is called with and how results are keyed
+PARSERS = {
+    "x_tweets": {
+        "module": "browser.x_browser",
+        "function": "parse_tweets_from_page",
+        "url": "https://x.com/notifications/mentions",
+        "key": ("id",),
+        "session": "x_session.json",
+    },
+    "x_following": {
+        "module": "browser.x_browser",
+        "function": "parse_following_from_page",
+        "url": "https://x.com/fixture/following",
+        "key": ("username",),
+        "session": "x_session.json",
+    },
+    "linkedin_posts": {
+        "module": "browser.linkedin_browser",
+        "function": "parse_posts_from_page",
+        "url": "https://www.linkedin.com/feed/",
+        "key": ("id",),
+        "size_kwarg": "max_posts",
+        "session": "linkedin_session.json",
+    },
+    "instagram_inbox": {
+        "module": "browser.instagram_browser",
+        "function": "parse_inbox_from_page",
+        "url": "https://www.instagram.com/direct/inbox/",
+        "key": ("thread_id",),
+        "size_kwarg": "max_conversations",
+        "session": "instagram_session.json",
+    },
+    "instagram_messages": {
+        "module": "browser.instagram_browser",
+        "function": "parse_messages_from_page",
+        "url": "https://www.instagram.com/direct/t/fixture/",
+        "key": ("text",),
+        "session": "instagram_session.json",
+    },
+    "facebook_inbox": {
+        "module": "browser.facebook_browser",
+        "function": "parse_inbox_from_page",
+        "url": "https://www.facebook.com/messages/",
+        "key": ("thread_id",),
+        "size_kwarg": "max_conversations",
+        "session": "facebook_session.json",
+    },
+    "facebook_messages": {
+        "module": "browser.facebook_browser",
+        "function": "parse_messages_from_page",
+        "url": "https://www.facebook.com/messages/t/fixture/",
+        "key": ("text",),
+        "session": "facebook_session.json",
+    },
+}
+
+_WORDS = (
+    "invoice meeting launch update thanks quick question about the proposal "
+    "schedule call tomorrow project pricing feedback draft review shipping"
+).split()
+
+
+def _sentence(rng: random.Random, i: int) -> str:
+    # The index keeps texts unique, so message parsers can be keyed on text
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(4, 14))).capitalize() + f" #{i}"
+
+
+def _page(body: list[str]) -> str:
+    return "<!DOCTYPE html><html><head><meta charset='utf-8'></head><body>\n" + "\n".join(body) + "\n</body></html>"
+
+
+# ---------------------------------------------------------------------------
+# Synthetic page generators — each returns (html, expected results)
+# ---------------------------------------------------------------------------
+
+def _x_tweets(n: int, rng: random.Random) -> tuple[str, list[dict]]:
+    body, expected = [], []
+    start = datetime(2026, 1, 1)
+    for i in range(n):
+        tweet_id = str(1_800_000_000_000_000_000 + i)
+        user, name = f"user{i % 97}", f"User {i % 97}"
+        text = _sentence(rng, i)
+        stamp = (start + timedelta(minutes=i)).isoformat() + ".000Z"
+        url = f"/{user}/status/{tweet_id}"
+        body.append(
+            f'<article data-testid="tweet"><div data-testid="User-Name">'
+            f'<a role="link" href="/{user}"><span>{name}</span></a>'
+            f'<a role="link" href="/{user}"><span>@{user}</span></a><span>·</span>'
+            f'<a role="link" href="{url}"><time datetime="{stamp}">1h</time></a></div>'
+            f'<div data-testid="tweetText">{html.escape(text)}</div></article>'
+        )
+        expected.append({
+            "id": tweet_id, "text": text, "author_username": user,
+            "author_name": name, "timestamp": stamp, "tweet_url": url,
+        })
+    return _page(body), expected
+
+
+def _x_following(n: int, rng: random.Random) -> tuple[str, list[dict]]:
+    body, expected = [], []
+    for i in range(n):
+        user, name = f"Account_{i}", f"Account {i}"
+        body.append(
+            f'<div data-testid="UserCell"><a href="/{user}"><span>{name}</span>'
+            f'<span>@{user}</span></a><a href="/{user}/photo"><img alt=""></a>'
+            f'<div>{html.escape(_sentence(rng, i))}</div></div>'
+        )
+        # The parser keys accounts case-insensitively and returns them lower-cased
+        expected.append({"username": user.lower(), "display_name": name})
+    return _page(body), expected
+
+
+def _linkedin_posts(n: int, rng: random.Random) -> tuple[str, list[dict]]:
+    body, expected = [], []
+    start = datetime(2026, 1, 1)
+    for i in range(n):
+        post_id = str(7_100_000_000_000_000_000 + i)
+        urn = f"urn:li:activity:{post_id}"
+        slug, name = f"member-{i % 53}", f"Member {i % 53}"
+        text = _sentence(rng, i)
+        stamp = (start + timedelta(hours=i)).isoformat()
+        body.append(
+            f'<div data-id="{urn}"><div class="update-components-actor">'
+            f'<a class="update-components-actor__meta-link" href="https://www.linkedin.com/in/{slug}/?miniProfile=1">'
+            f'<span class="update-components-actor__name"><span aria-hidden="true">{name}</span>'
+            f'<span class="visually-hidden">{name}</span></span></a>'
+            f'<time datetime="{stamp}">2h</time></div>'
+            f'<div class="update-components-text">{html.escape(text)}</div></div>'
+        )
+        expected.append({
+            "id": post_id, "urn": urn, "text": text, "author_name": name,
+            "author_username": slug, "timestamp": stamp,
+        })
+    return _page(body), expected
+
+
+def _inbox(n: int, rng: random.Random, href: str, thread_url: str) -> tuple[str, list[dict]]:
+    body, expected = [], []
+    for i in range(n):
+        thread_id = str(340_282_366_841_710_300 + i)
+        sender, snippet, age = f"Contact {i}", _sentence(rng, i), f"{rng.randint(1, 59)}m"
+        body.append(
+            f'<a href="{href.format(thread_id)}"><div><div dir="auto">{sender}</div>'
+            f'<div><span dir="auto"><span>{html.escape(snippet)}</span></span>'
+            f'<span> · {age}</span></div></div></a>'
+        )
+        expected.append({
+            "thread_id": thread_id, "thread_url": thread_url.format(thread_id),
+            "sender_text": sender, "preview_text": f"{snippet} · {age}",
+            "preview_snippet": snippet,
+        })
+    return _page(body), expected
+
+
+def _instagram_inbox(n: int, rng: random.Random) -> tuple[str, list[dict]]:
+    return _inbox(n, rng, "/direct/t/{}/", "https://www.instagram.com/direct/t/{}/")
+
+
+def _facebook_inbox(n: int, rng: random.Random) -> tuple[str, list[dict]]:
+    return _inbox(n, rng, "/messages/t/{}/", "https://www.facebook.com/messages/t/{}/")
+
+
+def _messages(n: int, rng: random.Random, outgoing_style: str) -> tuple[str, list[dict]]:
+    body, expected = [], []
+    for i in range(n):
+        text = _sentence(rng, i)
+        incoming = rng.random() < 0.6
+        align = "" if incoming else outgoing_style
+        body.append(f'<div role="row"><div {align}><div dir="auto">{html.escape(text)}</div></div></div>')
+        expected.append({"text": text, "is_incoming": incoming})
+    return _page(body), expected
+
+
+def _instagram_messages(n: int, rng: random.Random) -> tuple[str, list[dict]]:
+    return _messages(n, rng, 'style="display: flex; justify-content: flex-end;"')
+
+
+def _facebook_messages(n: int, rng: random.Random) -> tuple[str, list[dict]]:
+    return _messages(n, rng, 'class="self-end"')
+
+
+GENERATORS = {
+    "x_tweets": _x_tweets,
+    "x_following": _x_following,
+    "linkedin_posts": _linkedin_posts,
+    "instagram_inbox": _instagram_inbox,
+    "instagram_messages": _instagram_messages,
+    "facebook_inbox": _facebook_inbox,
+    "facebook_messages": _facebook_messages,
+}
+
+
+def generate(parser: str, n: int, seed: int = 0) -> tuple[str, list[dict]]:
+    """Synthetic page with n items for `parser`, and what the parser should return."""
+    return GENERATORS[parser](n, random.Random(f"{seed}:{parser}:{n}"))
+
+
+# ---------------------------------------------------------------------------
+# Captured fixtures
+# ---------------------------------------------------------------------------
+
+def load_captured(parser: str) -> list[dict]:
+    """Every snapshot captured for `parser`: [{name, url, html, expected}]."""
+    fixtures = []
+    for html_path in sorted((FIXTURES_DIR / parser).glob("*.html")):
+        meta = json.loads(html_path.with_suffix(".json").read_text(encoding="utf-8"))
+        fixtures.append({
+            "name": html_path.stem,
+            "url": meta["url"],
+            "html": html_path.read_text(encoding="utf-8"),
+            "expected": meta["expected"],
+        })
+    return fixtures
+
+
+def serve(context, pages: dict[str, str]):
+    """Answer fixture URLs from `pages` ({url: html}); abort everything else."""
+    def _handle(route):
+        request = route.request
+        body = pages.get(request.url) or pages.get(request.url.rstrip("/") + "/")
+        if body is not None and request.resource_type == "document":
+            route.fulfill(status=200, content_type="text/html; charset=utf-8", body=body)
+        else:
+            route.abort()
+
+    context.route("**/*", _handle)
+
+
+def call_parser(parser: str, page, size: int | None = None):
+    """Run the parser the way its watcher does, lifting any item cap to `size`."""
+    import importlib
+
+    spec = PARSERS[parser]
+    fn = getattr(importlib.import_module(spec["module"]), spec["function"])
+    kwargs = {spec["size_kwarg"]: size} if size and spec.get("size_kwarg") else {}
+    return fn(page, **kwargs)
+
+
+def capture(parser: str, name: str, url: str | None, headed: bool, scrolls: int) -> Path:
+    """Snapshot a live page and its current parse result as a replayable fixture."""
+    import importlib
+
+    spec = PARSERS[parser]
+    browser_mod = importlib.import_module(spec["module"])
+    url = url or spec["url"]
+
+    pw = browser_mod.create_playwright_instance()
+    browser, context = browser_mod.launch_browser(
+        pw, headless=not headed, session_path=CREDENTIALS_DIR / spec["session"],
+    )
+    try:
+        page = context.new_page()
+        page.goto(url, wait_until="domcontentloaded", timeout=60_000)
+        page.wait_for_timeout(5_000)
+        for _ in range(scrolls):
+            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            page.wait_for_timeout(2_000)
+        snapshot = page.content()
+        expected = call_parser(parser, page, size=10_000)
+    finally:
+        context.close()
+        browser.close()
+        pw.stop()
+
+    out_dir = FIXTURES_DIR / parser
+    out_dir.mkdir(parents=True, exist_ok=True)
+    html_path = out_dir / f"{name}.html"
+    html_path.write_text(snapshot, encoding="utf-8")
+    html_path.with_suffix(".json").write_text(json.dumps({
+        "url": url,
+        "captured_at": datetime.now().isoformat(),
+        "expected": expected,
+    }, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Captured {len(expected)} items → {html_path}")
+    return html_path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Browser parser fixtures")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cap = sub.add_parser("capture", help="snapshot a live page as a fixture")
+    cap.add_argument("parser", choices=sorted(PARSERS))
+    cap.add_argument("--name", required=True, help="fixture file name (no extension)")
+    cap.add_argument("--url", default=None, help="page to snapshot (default: the parser's usual page)")
+    cap.add_argument("--scrolls", type=int, default=0, help="scroll to the bottom this many times first")
+    cap.add_argument("--headed", action="store_true", help="show the browser window")
+
+    gen = sub.add_parser("generate", help="write a synthetic fixture to disk for inspection")
+    gen.add_argument("parser", choices=sorted(PARSERS))
+    gen.add_argument("--items", type=int, default=10)
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("--output", type=Path, required=True)
+
+    args = parser.parse_args(argv)
+    if args.command == "capture":
+        capture(args.parser, args.name, args.url, args.headed, args.scrolls)
+    else:
+        page_html, expected = generate(args.parser, args.items, args.seed)
+        args.output.write_text(page_html, encoding="utf-8")
+        args.output.with_suffix(".json").write_text(
+            json.dumps({"url": PARSERS[args.parser]["url"], "expected": expected}, indent=2),
+            encoding="utf-8",
+        )
+        print(f"Wrote {args.items} items → {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
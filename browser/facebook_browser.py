@@ -3,9 +3,10 @@ facebook_browser.py - Shared Playwright browser utilities for Facebook automatio
 
 Provides:
 - Browser launch with anti-detection measures
-- Session (cookies/localStorage) persistence via storage_state
+- Session (cookies/localStorage) persistence via SessionStore
 - DM/Messenger inbox parsing
 - Thread message parsing
+- Inbox delta helpers (side-panel thread opening)
 - Post parsing from the Facebook feed/page
 - Login state verification
 - Cookie consent / overlay dismissal
@@ -22,6 +23,9 @@ from pathlib import Path
 
 from playwright.sync_api import sync_playwright, Playwright, Browser, BrowserContext, Page
 
+from browser.inbox_preview import PREVIEW_ELEMENT_JS
+from browser.session_store import get_session_store
+
 logger = logging.getLogger("facebook_browser")
 
 # ---------------------------------------------------------------------------
@@ -34,6 +38,9 @@ SELECTORS = {
 
     # Messenger inbox — any <a> linking to a thread (JS-discovered, not CSS-matched)
     "conversation_item": 'a[href*="/messages/t/"]',
+    # The dedicated last-message snippet inside a conversation link. Must match
+    # exactly one element; anything else makes the watcher open the thread.
+    "conversation_preview": 'span[dir="auto"] > span',
 
     # Individual message text within an open thread
     "message_bubble": 'div[dir="auto"]',
@@ -92,29 +99,24 @@ def create_playwright_instance() -> Playwright:
     return sync_playwright().start()
 
 
-def launch_browser(
-    pw: Playwright,
-    headless: bool = True,
+def new_context(
+    browser: Browser,
     session_path: str | Path | None = None,
-) -> tuple[Browser, BrowserContext]:
-    """Launch Chromium with anti-detection args and optional session restore.
+) -> BrowserContext:
+    """Open a fresh context on an already-running browser, restoring the session if present.
 
-    Returns (Browser, BrowserContext).
+    Lets long-lived watchers recycle a context without relaunching Chromium.
     """
     session_path = Path(session_path) if session_path else None
 
-    browser = pw.chromium.launch(
-        headless=headless,
-        args=CHROMIUM_ARGS,
-    )
-
     context_kwargs: dict = {
         "viewport": {"width": 1366, "height": 768},
         "user_agent": USER_AGENT,
     }
 
-    if session_path and session_path.exists():
-        context_kwargs["storage_state"] = str(session_path)
+    state = get_session_store(session_path).load() if session_path else None
+    if state:
+        context_kwargs["storage_state"] = state
         logger.info("Restoring session from %s", session_path)
 
     context = browser.new_context(**context_kwargs)
@@ -124,15 +126,36 @@ def launch_browser(
         "Object.defineProperty(navigator, 'webdriver', { get: () => undefined });"
     )
 
+    return context
+
+
+def launch_browser(
+    pw: Playwright,
+    headless: bool = True,
+    session_path: str | Path | None = None,
+) -> tuple[Browser, BrowserContext]:
+    """Launch Chromium with anti-detection args and optional session restore.
+
+    Returns (Browser, BrowserContext).
+    """
+    browser = pw.chromium.launch(
+        headless=headless,
+        args=CHROMIUM_ARGS,
+    )
+
+    context = new_context(browser, session_path)
+
     return browser, context
 
 
-def save_session(context: BrowserContext, session_path: str | Path):
-    """Persist cookies and localStorage to a JSON file."""
-    session_path = Path(session_path)
-    session_path.parent.mkdir(parents=True, exist_ok=True)
-    context.storage_state(path=str(session_path))
-    logger.debug("Session saved to %s", session_path)
+def save_session(context: BrowserContext, session_path: str | Path) -> bool:
+    """Persist cookies and localStorage to a JSON file if they changed.
+
+    Delegates to SessionStore: atomic replace under a cross-process lock,
+    skipped when the state hash matches what is already on disk.
+    Returns True if the file was written.
+    """
+    return get_session_store(session_path).save_context(context)
 
 
 # ---------------------------------------------------------------------------
@@ -260,7 +283,8 @@ def parse_inbox_from_page(page: Page, max_conversations: int = 20) -> list[dict]
         "thread_id":    str,   # numeric or alphanumeric thread ID from URL
         "thread_url":  str,   # full Messenger thread URL
         "sender_text": str,   # display name(s) shown for the conversation
-        "preview_text": str,  # latest message preview text
+        "preview_text": str,  # every text line after the sender (change detection)
+        "preview_snippet": str | None,  # dedicated preview element, None if unsafe
     }
     """
     # Wait for at least one conversation link to appear
@@ -270,7 +294,8 @@ def parse_inbox_from_page(page: Page, max_conversations: int = 20) -> list[dict]
         logger.debug("No conversation links found on Messenger inbox page.")
         return []
 
-    raw = page.evaluate("""(maxConvs) => {
+    raw = page.evaluate("""({maxConvs, previewSelector}) => {
+        const readPreview = """ + PREVIEW_ELEMENT_JS + """;
         const seen = new Set();
         const results = [];
 
@@ -300,10 +325,11 @@ def parse_inbox_from_page(page: Page, max_conversations: int = 20) -> list[dict]
                 thread_url: 'https://www.facebook.com/messages/t/' + threadId + '/',
                 sender_text: senderText,
                 preview_text: previewText,
+                preview_snippet: readPreview(link, previewSelector),
             });
         }
         return results;
-    }""", max_conversations)
+    }""", {"maxConvs": max_conversations, "previewSelector": SELECTORS["conversation_preview"]})
 
     conversations = raw or []
     logger.debug("parse_inbox_from_page: found %d conversation(s)", len(conversations))
@@ -373,6 +399,31 @@ def parse_messages_from_page(page: Page) -> list[dict]:
     return messages
 
 
+# ---------------------------------------------------------------------------
+# Inbox delta helpers
+# ---------------------------------------------------------------------------
+
+def open_thread_in_panel(page: Page, thread_id: str, timeout: int = 10_000) -> bool:
+    """Open a conversation by clicking its inbox entry instead of a full page load.
+
+    Messenger keeps the conversation list mounted beside the open thread, so
+    several threads can be opened back-to-back without re-navigating. Returns
+    False if the entry is not on the page or the thread did not render —
+    callers fall back to page.goto(build_thread_url(...)).
+    """
+    try:
+        link = page.locator(f'a[href*="/messages/t/{thread_id}"]').first
+        if not link.is_visible(timeout=2_000):
+            return False
+        link.click(timeout=5_000)
+        page.wait_for_url(f"**/messages/t/{thread_id}/**", timeout=timeout)
+        page.wait_for_selector('div[role="row"]', timeout=timeout)
+        return True
+    except Exception:
+        logger.debug("Side-panel open failed for thread %s", thread_id, exc_info=True)
+        return False
+
+
 # ---------------------------------------------------------------------------
 # URL helpers
 # ---------------------------------------------------------------------------
@@ -0,0 +1,79 @@
+"""
+inbox_preview.py - Shared inbox-preview helpers for the DM browsers
+
+Provides:
+- PREVIEW_ELEMENT_JS: reads the dedicated preview element of one inbox entry
+- classify_preview(): decides whether that preview holds the whole message
+
+Only the dedicated preview element is trusted. The rest of an inbox entry's
+text (timestamps, "Active …" lines, unread badges) is never treated as the
+message. When the element is missing, matches more than once, or is clipped
+by CSS, the parsers report no snippet and the watcher opens the thread.
+"""
+
+import re
+
+# JS run against one inbox link: returns the preview element's text, or null
+# when the element is not unique or any clipping ancestor hides overflow
+# (CSS ellipsis / line-clamp leaves no "…" in innerText).
+PREVIEW_ELEMENT_JS = """(link, selector) => {
+    const els = link.querySelectorAll(selector);
+    if (els.length !== 1) return null;
+    const el = els[0];
+    for (let node = el; node; node = node.parentElement) {
+        const style = getComputedStyle(node);
+        const clips = style.overflowX !== 'visible' || style.overflowY !== 'visible'
+            || style.textOverflow === 'ellipsis';
+        if (clips && (node.scrollWidth > node.clientWidth + 1
+                      || node.scrollHeight > node.clientHeight + 1)) return null;
+        if (node === link) break;
+    }
+    return (el.innerText || '').trim() || null;
+}"""
+
+# Trailing relative timestamp an inbox appends to a preview, e.g. "· 5m"
+_PREVIEW_TIME_RE = re.compile(
+    r"\s*·\s*(now|\d+\s*[smhdw]|\d+\s*(min|mins|hr|hrs|wk|wks))\s*$", re.IGNORECASE,
+)
+
+# Whole-snippet text that is inbox chrome rather than a message
+_NON_MESSAGE_RE = re.compile(
+    r"^(active\b.*|seen|seen by\b.*|sent|delivered|typing\W*|\d+\+?"
+    r"|\d+\+?\s*new\s+messages?|now|yesterday"
+    r"|\d+\s*(s|m|h|d|w|min|mins|hr|hrs|wk|wks)"
+    r"|mon|tue|wed|thu|fri|sat|sun|\d{1,2}:\d{2}\s*(am|pm)?)$",
+    re.IGNORECASE,
+)
+
+# Previews that describe a message rather than containing its text
+_PREVIEW_PLACEHOLDERS = (
+    "sent an attachment", "sent a photo", "sent a video", "sent a voice message",
+    "sent a reel", "sent a sticker", "sent a gif", "sent a link",
+    "shared a post", "shared a reel", "liked a message", "reacted",
+    "new messages", "missed call", "missed your call",
+)
+
+
+def classify_preview(preview: str | None) -> tuple[str, str]:
+    """
+    Decide whether an inbox preview snippet already carries the full latest message.
+
+    `preview` must be the dedicated preview element's text (preview_snippet
+    from parse_inbox_from_page); None means it could not be read safely.
+
+    Returns (kind, text):
+      ("outgoing", "")   — last message was sent by us; nothing to answer
+      ("complete", text) — preview is the whole incoming message
+      ("partial", "")    — missing, truncated or non-text; open the thread
+    """
+    text = _PREVIEW_TIME_RE.sub("", preview or "").strip()
+    if not text:
+        return "partial", ""
+    if text.startswith("You:") or text.startswith("You sent"):
+        return "outgoing", ""
+    if text.endswith(("…", "...")) or _NON_MESSAGE_RE.match(text):
+        return "partial", ""
+    lowered = text.lower()
+    if any(marker in lowered for marker in _PREVIEW_PLACEHOLDERS):
+        return "partial", ""
+    return "complete", text
@@ -6,6 +6,7 @@ Provides:
 - Login state verification
 - Inbox parsing (conversation list)
 - Thread message parsing
+- Inbox delta helpers (side-panel thread opening)
 - Session save/restore
 - Human-like delay helper
 
@@ -20,6 +21,9 @@ from pathlib import Path
 
 from playwright.sync_api import Playwright, Browser, BrowserContext, Page, sync_playwright
 
+from browser.inbox_preview import PREVIEW_ELEMENT_JS
+from browser.session_store import get_session_store
+
 logger = logging.getLogger("instagram_browser")
 
 # ---------------------------------------------------------------------------
@@ -35,6 +39,9 @@ SELECTORS = {
 
     # Within a conversation link: sender name and message preview text
     "conversation_text": 'div[dir="auto"]',
+    # The dedicated last-message snippet inside a conversation link. Must match
+    # exactly one element; anything else makes the watcher open the thread.
+    "conversation_preview": 'span[dir="auto"] > span',
 
     # Within a thread: incoming message bubbles (text content)
     "message_row":  'div[role="row"]',
@@ -89,19 +96,21 @@ def create_playwright_instance() -> Playwright:
     return sync_playwright().start()
 
 
-def launch_browser(
-    pw: Playwright,
-    headless: bool = True,
+def new_context(
+    browser: Browser,
     session_path: str | Path | None = None,
-) -> tuple[Browser, BrowserContext]:
-    browser = pw.chromium.launch(headless=headless, args=CHROMIUM_ARGS)
+) -> BrowserContext:
+    """Open a fresh context on an already-running browser, restoring the session if present.
 
+    Lets long-lived watchers recycle a context without relaunching Chromium.
+    """
     context_kwargs = {
         "viewport": {"width": 1280, "height": 900},
         "user_agent": USER_AGENT,
     }
-    if session_path and Path(session_path).exists():
-        context_kwargs["storage_state"] = str(session_path)
+    state = get_session_store(session_path).load() if session_path else None
+    if state:
+        context_kwargs["storage_state"] = state
 
     context = browser.new_context(**context_kwargs)
 
@@ -110,13 +119,24 @@ def launch_browser(
         "Object.defineProperty(navigator, 'webdriver', { get: () => undefined });"
     )
 
+    return context
+
+
+def launch_browser(
+    pw: Playwright,
+    headless: bool = True,
+    session_path: str | Path | None = None,
+) -> tuple[Browser, BrowserContext]:
+    browser = pw.chromium.launch(headless=headless, args=CHROMIUM_ARGS)
+
+    context = new_context(browser, session_path)
+
     return browser, context
 
 
-def save_session(context: BrowserContext, session_path: str | Path):
-    """Persist cookies and localStorage to disk."""
-    Path(session_path).parent.mkdir(parents=True, exist_ok=True)
-    context.storage_state(path=str(session_path))
+def save_session(context: BrowserContext, session_path: str | Path) -> bool:
+    """Persist cookies and localStorage to disk if they changed. Returns True if written."""
+    return get_session_store(session_path).save_context(context)
 
 
 def build_inbox_url() -> str:
@@ -182,8 +202,9 @@ def parse_inbox_from_page(page: Page, max_conversations: int = 20) -> list[dict]
     {
         "thread_id": str,          # numeric thread ID from URL
         "thread_url": str,         # full URL
-        "preview_text": str,       # message preview shown in inbox
+        "preview_text": str,       # every text line after the sender (change detection)
         "sender_text": str,        # display name(s) shown in inbox item
+        "preview_snippet": str | None,  # dedicated preview element, None if unsafe
     }
     """
     conversations = []
@@ -211,12 +232,19 @@ def parse_inbox_from_page(page: Page, max_conversations: int = 20) -> list[dict]
                 lines = [l.strip() for l in all_text.splitlines() if l.strip()]
                 sender_text = lines[0] if lines else "Unknown"
                 preview_text = " ".join(lines[1:]) if len(lines) > 1 else ""
+                try:
+                    preview_snippet = link.evaluate(
+                        PREVIEW_ELEMENT_JS, SELECTORS["conversation_preview"],
+                    )
+                except Exception:
+                    preview_snippet = None  # unreadable preview: open the thread
 
                 conversations.append({
                     "thread_id": thread_id,
                     "thread_url": build_thread_url(thread_id),
                     "sender_text": sender_text,
                     "preview_text": preview_text,
+                    "preview_snippet": preview_snippet,
                 })
             except Exception:
                 logger.debug("Error parsing one conversation link", exc_info=True)
@@ -276,3 +304,28 @@ def parse_messages_from_page(page: Page, own_username: str = "") -> list[dict]:
         logger.exception("Error parsing thread messages")
 
     return messages
+
+
+# ---------------------------------------------------------------------------
+# Inbox delta helpers
+# ---------------------------------------------------------------------------
+
+def open_thread_in_panel(page: Page, thread_id: str, timeout: int = 10_000) -> bool:
+    """
+    Open a conversation by clicking its inbox entry instead of a full page load.
+
+    The inbox list stays mounted beside the thread, so several threads can be
+    opened back-to-back without re-navigating. Returns False if the entry is not
+    on the page or the thread did not render — callers fall back to page.goto().
+    """
+    try:
+        link = page.locator(f'a[href*="/direct/t/{thread_id}"]').first
+        if not link.is_visible(timeout=2_000):
+            return False
+        link.click(timeout=5_000)
+        page.wait_for_url(f"**/direct/t/{thread_id}/**", timeout=timeout)
+        page.wait_for_selector(SELECTORS["message_row"], timeout=timeout)
+        return True
+    except Exception:
+        logger.debug("Side-panel open failed for thread %s", thread_id, exc_info=True)
+        return False
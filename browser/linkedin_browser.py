@@ -3,8 +3,9 @@ linkedin_browser.py - Shared Playwright browser utilities for LinkedIn automatio
 
 Provides:
 - Browser launch with anti-detection measures
-- Session (cookies/localStorage) persistence via storage_state
+- Session (cookies/localStorage) persistence via SessionStore
 - Post parsing from LinkedIn feed DOM
+- Incremental feed harvesting (MutationObserver) with early stop on seen posts
 - Login state verification
 - Cookie consent dismissal
 - Human-like delay helpers
@@ -16,9 +17,12 @@ import logging
 import random
 import time
 from pathlib import Path
+from typing import Callable
 
 from playwright.sync_api import sync_playwright, Playwright, Browser, BrowserContext, Page
 
+from browser.session_store import get_session_store
+
 logger = logging.getLogger("linkedin_browser")
 
 # ---------------------------------------------------------------------------
@@ -83,22 +87,16 @@ def create_playwright_instance() -> Playwright:
     return sync_playwright().start()
 
 
-def launch_browser(
-    pw: Playwright,
-    headless: bool = True,
+def new_context(
+    browser: Browser,
     session_path: str | Path | None = None,
-) -> tuple[Browser, BrowserContext]:
-    """Launch Chromium with anti-detection args and optional session restore.
+) -> BrowserContext:
+    """Open a fresh context on an already-running browser, restoring the session if present.
 
-    Returns (Browser, BrowserContext).
+    Lets long-lived watchers recycle a context without relaunching Chromium.
     """
     session_path = Path(session_path) if session_path else None
 
-    browser = pw.chromium.launch(
-        headless=headless,
-        args=CHROMIUM_ARGS,
-    )
-
     context_kwargs: dict = {
         "viewport": {"width": 1280, "height": 900},
         "user_agent": (
@@ -108,8 +106,9 @@ def launch_browser(
         ),
     }
 
-    if session_path and session_path.exists():
-        context_kwargs["storage_state"] = str(session_path)
+    state = get_session_store(session_path).load() if session_path else None
+    if state:
+        context_kwargs["storage_state"] = state
         logger.info("Restoring session from %s", session_path)
 
     context = browser.new_context(**context_kwargs)
@@ -119,15 +118,36 @@ def launch_browser(
         Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
     """)
 
+    return context
+
+
+def launch_browser(
+    pw: Playwright,
+    headless: bool = True,
+    session_path: str | Path | None = None,
+) -> tuple[Browser, BrowserContext]:
+    """Launch Chromium with anti-detection args and optional session restore.
+
+    Returns (Browser, BrowserContext).
+    """
+    browser = pw.chromium.launch(
+        headless=headless,
+        args=CHROMIUM_ARGS,
+    )
+
+    context = new_context(browser, session_path)
+
     return browser, context
 
 
-def save_session(context: BrowserContext, session_path: str | Path):
-    """Persist cookies and localStorage to a JSON file."""
-    session_path = Path(session_path)
-    session_path.parent.mkdir(parents=True, exist_ok=True)
-    context.storage_state(path=str(session_path))
-    logger.debug("Session saved to %s", session_path)
+def save_session(context: BrowserContext, session_path: str | Path) -> bool:
+    """Persist cookies and localStorage to a JSON file if they changed.
+
+    Delegates to SessionStore: atomic replace under a cross-process lock,
+    skipped when the state hash matches what is already on disk.
+    Returns True if the file was written.
+    """
+    return get_session_store(session_path).save_context(context)
 
 
 # ---------------------------------------------------------------------------
@@ -164,6 +184,117 @@ def dismiss_cookie_consent(page: Page) -> None:
 # Post parsing
 # ---------------------------------------------------------------------------
 
+# JS function expression that turns one activity container into a post dict
+# (or null for malformed containers). Shared by the one-shot parser and the
+# incremental feed harvester so both extract identical fields.
+_EXTRACT_POST_JS = """(container) => {
+    try {
+        const urn = container.getAttribute('data-id') || '';
+        // Extract activity ID from urn:li:activity:1234567890
+        const urnMatch = urn.match(/urn:li:activity:(\\d+)/);
+        const postId = urnMatch ? urnMatch[1] : '';
+
+        if (!postId) return null;
+
+        // Extract post text — look for the main update text container
+        let text = '';
+        const textEl = container.querySelector(
+            '.feed-shared-update-v2__description .break-words, ' +
+            '.update-components-text, ' +
+            '.feed-shared-text'
+        );
+        if (textEl) text = textEl.innerText.trim();
+
+        // Extract author name and link-based username
+        let authorName = '';
+        let authorUsername = '';
+        const actorEl = container.querySelector(
+            '.update-components-actor__name span[aria-hidden="true"], ' +
+            '.feed-shared-actor__name'
+        );
+        if (actorEl) authorName = actorEl.innerText.trim();
+
+        // LinkedIn doesn't expose /in/username on all feed cards,
+        // but we can extract it from the profile link if present.
+        const profileLink = container.querySelector(
+            'a.update-components-actor__meta-link, ' +
+            'a.feed-shared-actor__container-link'
+        );
+        if (profileLink) {
+            const href = profileLink.getAttribute('href') || '';
+            const slugMatch = href.match(/\\/in\\/([^/?]+)/);
+            if (slugMatch) authorUsername = slugMatch[1];
+        }
+
+        // Timestamp — look for time element or aria-label
+        let timestamp = '';
+        const timeEl = container.querySelector('time, .feed-shared-actor__sub-description');
+        if (timeEl) {
+            timestamp = timeEl.getAttribute('datetime') ||
+                        timeEl.innerText.trim() || '';
+        }
+
+        return {
+            id: postId,
+            urn: urn,
+            text: text,
+            author_name: authorName,
+            author_username: authorUsername,
+            timestamp: timestamp,
+        };
+    } catch (e) {
+        // Skip malformed post containers
+        return null;
+    }
+}"""
+
+# Installs a MutationObserver that queues every activity container as it is
+# attached (or gets its data-id assigned). Containers already in the DOM are
+# queued immediately. Idempotent per page load.
+_INSTALL_FEED_OBSERVER_JS = """() => {
+    if (window.__feedHarvest) return false;
+    const sel = "div[data-id*='urn:li:activity']";
+    const state = { queue: [], seen: new Set() };
+    const enqueue = (el) => {
+        const urn = el.getAttribute('data-id') || '';
+        if (urn && !state.seen.has(urn)) {
+            state.seen.add(urn);
+            state.queue.push(el);
+        }
+    };
+    document.querySelectorAll(sel).forEach(enqueue);
+    const observer = new MutationObserver((mutations) => {
+        for (const m of mutations) {
+            if (m.type === 'attributes') {
+                if (m.target.matches && m.target.matches(sel)) enqueue(m.target);
+                continue;
+            }
+            for (const node of m.addedNodes) {
+                if (node.nodeType !== 1) continue;
+                if (node.matches(sel)) enqueue(node);
+                node.querySelectorAll(sel).forEach(enqueue);
+            }
+        }
+    });
+    observer.observe(document.body, {
+        childList: true, subtree: true,
+        attributes: true, attributeFilter: ['data-id'],
+    });
+    window.__feedHarvest = state;
+    return true;
+}"""
+
+# Drains the observer queue and extracts only the newly attached containers.
+_DRAIN_FEED_QUEUE_JS = (
+    "() => {"
+    "  const state = window.__feedHarvest;"
+    "  if (!state) return [];"
+    "  const extract = " + _EXTRACT_POST_JS + ";"
+    "  return state.queue.splice(0).map(extract).filter(Boolean);"
+    "}"
+)
+
+
 def parse_posts_from_page(page: Page, max_posts: int = 15) -> list[dict]:
     """Scroll the LinkedIn feed and extract posts from activity URN containers.
 
@@ -182,75 +313,93 @@ def parse_posts_from_page(page: Page, max_posts: int = 15) -> list[dict]:
         page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
         human_delay(1.5, 2.5)
 
-    posts = page.evaluate("""(maxPosts) => {
-        const containers = document.querySelectorAll("div[data-id*='urn:li:activity']");
-        const results = [];
-
-        for (const container of Array.from(containers).slice(0, maxPosts)) {
-            try {
-                const urn = container.getAttribute('data-id') || '';
-                // Extract activity ID from urn:li:activity:1234567890
-                const urnMatch = urn.match(/urn:li:activity:(\\d+)/);
-                const postId = urnMatch ? urnMatch[1] : '';
-
-                if (!postId) continue;
-
-                // Extract post text — look for the main update text container
-                let text = '';
-                const textEl = container.querySelector(
-                    '.feed-shared-update-v2__description .break-words, ' +
-                    '.update-components-text, ' +
-                    '.feed-shared-text'
-                );
-                if (textEl) text = textEl.innerText.trim();
-
-                // Extract author name and link-based username
-                let authorName = '';
-                let authorUsername = '';
-                const actorEl = container.querySelector(
-                    '.update-components-actor__name span[aria-hidden="true"], ' +
-                    '.feed-shared-actor__name'
-                );
-                if (actorEl) authorName = actorEl.innerText.trim();
-
-                // LinkedIn doesn't expose /in/username on all feed cards,
-                // but we can extract it from the profile link if present.
-                const profileLink = container.querySelector(
-                    'a.update-components-actor__meta-link, ' +
-                    'a.feed-shared-actor__container-link'
-                );
-                if (profileLink) {
-                    const href = profileLink.getAttribute('href') || '';
-                    const slugMatch = href.match(/\\/in\\/([^/?]+)/);
-                    if (slugMatch) authorUsername = slugMatch[1];
-                }
-
-                // Timestamp — look for time element or aria-label
-                let timestamp = '';
-                const timeEl = container.querySelector('time, .feed-shared-actor__sub-description');
-                if (timeEl) {
-                    timestamp = timeEl.getAttribute('datetime') ||
-                                timeEl.innerText.trim() || '';
-                }
-
-                results.push({
-                    id: postId,
-                    urn: urn,
-                    text: text,
-                    author_name: authorName,
-                    author_username: authorUsername,
-                    timestamp: timestamp,
-                });
-            } catch (e) {
-                // Skip malformed post containers
-            }
-        }
-        return results;
-    }""", max_posts)
+    posts = page.evaluate(
+        "(maxPosts) => {"
+        "  const extract = " + _EXTRACT_POST_JS + ";"
+        "  const containers = document.querySelectorAll(\"div[data-id*='urn:li:activity']\");"
+        "  return Array.from(containers).slice(0, maxPosts).map(extract).filter(Boolean);"
+        "}",
+        max_posts,
+    )
 
     return posts or []
 
 
+def harvest_feed_posts(
+    page: Page,
+    is_processed: Callable[[str], bool],
+    max_scrolls: int = 6,
+    stop_after_seen: int = 5,
+    max_new: int = 20,
+    skip: Callable[[dict], bool] | None = None,
+) -> tuple[list[dict], str]:
+    """Scroll the feed incrementally and return only posts not yet processed.
+
+    A MutationObserver queues activity containers as LinkedIn attaches them, so
+    each scroll step only extracts the containers that arrived since the last
+    step instead of re-reading the whole feed. Harvesting stops as soon as:
+    - `stop_after_seen` already-processed posts are seen in a row (we have
+      caught up with the previous poll),
+    - `max_new` unprocessed posts have been collected, or
+    - `max_scrolls` scroll steps have been made (depth limit).
+
+    Posts for which `skip(post)` is true (e.g. our own) are dropped before
+    counting: they neither count toward `max_new` nor break a seen-run.
+
+    Returns (posts, stop_reason): post dicts with the same keys as
+    parse_posts_from_page(), in feed order, and why harvesting stopped —
+    "caught_up", "end_of_feed", "max_new" or "max_scrolls". Only the first
+    two mean everything since the previous harvest was seen.
+    """
+    try:
+        page.wait_for_selector(SELECTORS["post_container"], timeout=20_000)
+    except Exception:
+        logger.debug("No post containers found on page %s", page.url)
+        return [], "no_posts"
+
+    page.evaluate(_INSTALL_FEED_OBSERVER_JS)
+
+    new_posts: list[dict] = []
+    seen_run = 0
+    empty_steps = 0
+    scrolls = 0
+    stop_reason = "max_scrolls"
+
+    while True:
+        batch = page.evaluate(_DRAIN_FEED_QUEUE_JS) or []
+        for post in batch:
+            if skip is not None and skip(post):
+                continue
+            if is_processed(post.get("id", "")):
+                seen_run += 1
+            else:
+                seen_run = 0
+                new_posts.append(post)
+            if seen_run >= stop_after_seen:
+                stop_reason = "caught_up"
+                break
+            if len(new_posts) >= max_new:
+                stop_reason = "max_new"
+                break
+        else:
+            # Three consecutive scrolls with nothing attached = end of feed
+            empty_steps = 0 if batch else empty_steps + 1
+            if empty_steps >= 3:
+                stop_reason = "end_of_feed"
+            elif scrolls < max_scrolls:
+                page.evaluate("window.scrollBy(0, Math.floor(window.innerHeight * 0.9))")
+                scrolls += 1
+                human_delay(0.8, 1.6)
+                continue
+        break
+
+    logger.debug(
+        "Feed harvest: %d new post(s) after %d scroll(s) — stopped (%s).",
+        len(new_posts), scrolls, stop_reason,
+    )
+    return new_posts, stop_reason
+
+
 # ---------------------------------------------------------------------------
 # URL helpers
 # ---------------------------------------------------------------------------
@@ -0,0 +1,152 @@
+"""
+session_store.py - Change-detecting, process-safe storage for browser sessions.
+
+Provides:
+- SessionStore: one credentials/*_session.json file (Playwright storage_state)
+  - save() writes only when the canonical JSON hash differs from what is on disk
+  - writes go to a temp file in the same directory and are swapped in with
+    os.replace(), under a cross-process lock file (<session>.lock)
+  - load() returns the freshest state as a dict without starting a browser
+- get_session_store(): per-process cache of stores, keyed by resolved path
+
+Used by every *_browser.py save_session()/new_context(), so the long-lived
+watchers, the short-lived action executors and the setup scripts all share
+the same write discipline.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger("session_store")
+
+LOCK_TIMEOUT = 10.0     # seconds to wait for another process's write to finish
+
+
+# ---------------------------------------------------------------------------
+# Cross-process lock
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def _file_lock(lock_path: Path, timeout: float = LOCK_TIMEOUT):
+    """Hold an exclusive lock on lock_path for the duration of the block."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as fh:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for session lock {lock_path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# ---------------------------------------------------------------------------
+# SessionStore
+# ---------------------------------------------------------------------------
+
+def fingerprint(state: dict) -> str:
+    """Stable hash of a storage_state dict (key order and whitespace ignored)."""
+    canonical = json.dumps(state, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SessionStore:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._last_fingerprint: str | None = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> dict | None:
+        """Return the stored state, or None if missing or unreadable.
+
+        Writers swap the file in atomically, so no lock is needed to read it.
+        """
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Session file %s is unreadable; ignoring it.", self.path)
+            return None
+        self._last_fingerprint = fingerprint(state)
+        return state
+
+    def save(self, state: dict) -> bool:
+        """Persist state if it differs from the file on disk. Returns True if written."""
+        new_fp = fingerprint(state)
+        if new_fp == self._last_fingerprint:
+            return False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.lock_path):
+            # Another process may already have written the same state
+            try:
+                on_disk = json.loads(self.path.read_text(encoding="utf-8"))
+                if fingerprint(on_disk) == new_fp:
+                    self._last_fingerprint = new_fp
+                    return False
+            except (FileNotFoundError, ValueError):
+                pass
+
+            fd, tmp = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=self.path.parent)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(state, fh)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                os.replace(tmp, self.path)
+            except Exception:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+
+        self._last_fingerprint = new_fp
+        logger.debug("Session saved to %s", self.path)
+        return True
+
+    def save_context(self, context) -> bool:
+        """Snapshot a Playwright BrowserContext and save it if it changed."""
+        return self.save(context.storage_state())
+
+
+_stores: dict[Path, SessionStore] = {}
+
+
+def get_session_store(path: str | Path) -> SessionStore:
+    """Return the process-wide SessionStore for path."""
+    key = Path(path).resolve()
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = SessionStore(key)
+    return store
@@ -3,7 +3,7 @@ x_browser.py - Shared Playwright browser utilities for X/Twitter automation.
 
 Provides:
 - Browser launch with anti-detection measures
-- Session (cookies/localStorage) persistence via storage_state
+- Session (cookies/localStorage) persistence via SessionStore
 - Tweet parsing from page DOM
 - Login state verification
 - Search URL building
@@ -21,6 +21,8 @@ from pathlib import Path
 
 from playwright.sync_api import sync_playwright, Playwright, Browser, BrowserContext, Page
 
+from browser.session_store import get_session_store
+
 logger = logging.getLogger("x_browser")
 
 # ---------------------------------------------------------------------------
@@ -68,22 +70,16 @@ def create_playwright_instance() -> Playwright:
     return sync_playwright().start()
 
 
-def launch_browser(
-    pw: Playwright,
-    headless: bool = True,
+def new_context(
+    browser: Browser,
     session_path: str | Path | None = None,
-) -> tuple[Browser, BrowserContext]:
-    """Launch Chromium with anti-detection args and optional session restore.
+) -> BrowserContext:
+    """Open a fresh context on an already-running browser, restoring the session if present.
 
-    Returns (Browser, BrowserContext).
+    Lets long-lived watchers recycle a context without relaunching Chromium.
     """
     session_path = Path(session_path) if session_path else None
 
-    browser = pw.chromium.launch(
-        headless=headless,
-        args=CHROMIUM_ARGS,
-    )
-
     context_kwargs: dict = {
         "viewport": {"width": 1280, "height": 900},
         "user_agent": (
@@ -93,8 +89,9 @@ def launch_browser(
         ),
     }
 
-    if session_path and session_path.exists():
-        context_kwargs["storage_state"] = str(session_path)
+    state = get_session_store(session_path).load() if session_path else None
+    if state:
+        context_kwargs["storage_state"] = state
         logger.info("Restoring session from %s", session_path)
 
     context = browser.new_context(**context_kwargs)
@@ -104,15 +101,36 @@ def launch_browser(
         Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
     """)
 
+    return context
+
+
+def launch_browser(
+    pw: Playwright,
+    headless: bool = True,
+    session_path: str | Path | None = None,
+) -> tuple[Browser, BrowserContext]:
+    """Launch Chromium with anti-detection args and optional session restore.
+
+    Returns (Browser, BrowserContext).
+    """
+    browser = pw.chromium.launch(
+        headless=headless,
+        args=CHROMIUM_ARGS,
+    )
+
+    context = new_context(browser, session_path)
+
     return browser, context
 
 
-def save_session(context: BrowserContext, session_path: str | Path):
-    """Persist cookies and localStorage to a JSON file."""
-    session_path = Path(session_path)
-    session_path.parent.mkdir(parents=True, exist_ok=True)
-    context.storage_state(path=str(session_path))
-    logger.debug("Session saved to %s", session_path)
+def save_session(context: BrowserContext, session_path: str | Path) -> bool:
+    """Persist cookies and localStorage to a JSON file if they changed.
+
+    Delegates to SessionStore: atomic replace under a cross-process lock,
+    skipped when the state hash matches what is already on disk.
+    Returns True if the file was written.
+    """
+    return get_session_store(session_path).save_context(context)
 
 
 # ---------------------------------------------------------------------------
@@ -17,6 +17,8 @@ import xmlrpc.client
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from heartbeat import beat
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -62,12 +64,14 @@ def get_financial_snapshot():
         username = cfg["username"]
         api_key = cfg.get("password") or cfg.get("api_key", "")
 
+        # ServerProxy takes no timeout= argument (passing one raises TypeError);
+        # the socket default bounds every XML-RPC call instead
         socket.setdefaulttimeout(10)
-        common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common", timeout=10)
+        common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
         uid = common.authenticate(db, username, api_key, {})
         if not uid:
             return None
-        models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object", timeout=10)
+        models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
 
         # Revenue
         sales = models.execute_kw(
@@ -277,6 +281,16 @@ def update_dashboard(report_name):
 # Main
 # ---------------------------------------------------------------------------
 
+def run_cycle():
+    """Build one briefing from Odoo, Done/ and pending items and link it on the Dashboard."""
+    logger.info("Generating CEO briefing...")
+    fin = get_financial_snapshot() or get_fallback_financials()
+    activity = get_activity_24h()
+    pending = get_pending_items()
+    report_name = generate_briefing(fin, activity, pending)
+    update_dashboard(report_name)
+
+
 def main():
     logger.info("=" * 60)
     logger.info("ceo_briefing.py starting — CEO Daily Briefing Service")
@@ -284,18 +298,17 @@ def main():
     logger.info("=" * 60)
 
     while True:
+        beat()
         try:
-            logger.info("Generating CEO briefing...")
-            fin = get_financial_snapshot() or get_fallback_financials()
-            activity = get_activity_24h()
-            pending = get_pending_items()
-            report_name = generate_briefing(fin, activity, pending)
-            update_dashboard(report_name)
+            run_cycle()
             logger.info(f"Briefing cycle complete. Sleeping {BRIEFING_INTERVAL}s...")
         except Exception as e:
             logger.error(f"Briefing error: {e}")
 
-        time.sleep(BRIEFING_INTERVAL)
+        # Sleep in short increments so the supervisor keeps seeing heartbeats
+        for _ in range(BRIEFING_INTERVAL):
+            beat()
+            time.sleep(1)
 
 
 if __name__ == "__main__":
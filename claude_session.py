@@ -0,0 +1,274 @@
+"""
+claude_session.py - Persistent Claude Code workers speaking stream-json.
+
+Responsibility:
+- ClaudeWorker: one long-lived `claude -p --input-format stream-json
+  --output-format stream-json` process; each task is written to its stdin
+  as a user turn and the turn ends at the matching "result" event
+- SessionPool: a fixed number of workers shared by concurrent callers;
+  a worker is restarted with a fresh context after TURNS_PER_SESSION
+  turns so conversation history (and token cost) cannot grow unbounded
+- A timeout, crash or malformed stream kills and replaces only the worker
+  it happened on; the other workers and their warm sessions are untouched
+- parse_stream(): the result event (usage, cost, turns) and tool-call count
+  of a one-shot `claude -p --output-format stream-json` run
+
+Boundary:
+- Transport only: prompts, tool permissions and what to do with the files
+  Claude writes stay in orchestrator.py
+- Workers are started lazily, so an idle pool costs nothing
+
+Assumptions:
+- The CLI emits one JSON object per stdout line and exactly one
+  {"type": "result"} event per user turn (Claude Code >= 1.0)
+"""
+
+import json
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+logger = logging.getLogger("claude_session")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+TURNS_PER_SESSION = 10      # turns before a worker is restarted with an empty context
+STDERR_TAIL = 50            # stderr lines kept per worker for error reports
+
+STREAM_ARGS = ("-p", "--input-format", "stream-json", "--output-format", "stream-json", "--verbose")
+# One-shot `claude -p` with the same event stream on stdout (parse_stream)
+STREAM_OUTPUT_ARGS = ("--output-format", "stream-json", "--verbose")
+
+_EOF = object()
+
+
+class SessionError(RuntimeError):
+    """A worker died or produced an unusable stream; it has been recycled."""
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+class ClaudeWorker:
+    def __init__(self, command: list[str], cwd: Path, name: str = "worker"):
+        self.command = list(command) + list(STREAM_ARGS)
+        self.cwd = cwd
+        self.name = name
+        self.proc: subprocess.Popen | None = None
+        self.turns = 0
+        self._events: queue.Queue = queue.Queue()
+        self._stderr: deque = deque(maxlen=STDERR_TAIL)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self):
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True   # own process group, so the whole tree can be killed
+        self.proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            cwd=str(self.cwd),
+            **kwargs,
+        )
+        self.turns = 0
+        self._events = queue.Queue()
+        self._stderr.clear()
+        threading.Thread(target=self._read_stdout, args=(self.proc, self._events),
+                         name=f"{self.name}-stdout", daemon=True).start()
+        threading.Thread(target=self._read_stderr, args=(self.proc,),
+                         name=f"{self.name}-stderr", daemon=True).start()
+        logger.info("[%s] Started Claude session (PID %d)", self.name, self.proc.pid)
+
+    def _read_stdout(self, proc: subprocess.Popen, events: queue.Queue):
+        for line in proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.put(json.loads(line))
+            except ValueError:
+                logger.debug("[%s] Non-JSON output: %s", self.name, line[:200])
+        events.put(_EOF)
+
+    def _read_stderr(self, proc: subprocess.Popen):
+        for line in proc.stderr:
+            self._stderr.append(line.rstrip())
+
+    def run_turn(self, prompt: str, timeout: float) -> dict:
+        """Send one user turn and return its result event, with the turn's
+        tool_use count added as "tool_calls".
+
+        Raises TimeoutError or SessionError; the caller must then stop() the worker.
+        """
+        if not self.alive:
+            if self.proc is not None:
+                logger.warning("[%s] Session exited between turns (code %s); restarting",
+                               self.name, self.proc.poll())
+                self.stop(grace=0)
+            self.start()
+        message = {"type": "user", "message": {"role": "user", "content": [{"type": "text", "text": prompt}]}}
+        try:
+            self.proc.stdin.write(json.dumps(message) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as exc:
+            raise SessionError(f"{self.name}: stdin closed ({exc}); stderr: {self.stderr_tail()}") from exc
+
+        deadline = time.monotonic() + timeout
+        tool_calls = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{self.name}: no result within {timeout:.0f}s")
+            try:
+                event = self._events.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if event is _EOF:
+                raise SessionError(
+                    f"{self.name}: process exited (code {self.proc.poll()}); stderr: {self.stderr_tail()}"
+                )
+            if event.get("type") == "assistant":
+                tool_calls += count_tool_uses(event)
+            elif event.get("type") == "result":
+                self.turns += 1
+                event.setdefault("tool_calls", tool_calls)
+                return event
+
+    def stderr_tail(self, lines: int = 5) -> str:
+        return " | ".join(list(self._stderr)[-lines:])
+
+    def stop(self, grace: float = 5.0):
+        """Close stdin so the CLI exits cleanly; kill the process tree if it does not."""
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            _kill_tree(proc)
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        logger.info("[%s] Stopped Claude session (PID %d)", self.name, proc.pid)
+
+
+def count_tool_uses(event: dict) -> int:
+    """tool_use blocks in one assistant event."""
+    content = (event.get("message") or {}).get("content") or []
+    if not isinstance(content, list):
+        return 0
+    return sum(1 for block in content if isinstance(block, dict) and block.get("type") == "tool_use")
+
+
+def parse_stream(stdout: str) -> dict | None:
+    """Result event of a finished `claude -p --output-format stream-json` run,
+    with "tool_calls" added; None if the output holds no result event."""
+    result, tool_calls = None, 0
+    for line in stdout.splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if event.get("type") == "assistant":
+            tool_calls += count_tool_uses(event)
+        elif event.get("type") == "result":
+            result = event
+    if result is not None:
+        result.setdefault("tool_calls", tool_calls)
+    return result
+
+
+def _kill_tree(proc: subprocess.Popen):
+    try:
+        if sys.platform == "win32":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)], capture_output=True, timeout=10)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except Exception:
+        logger.warning("Failed to kill process tree for PID %d", proc.pid, exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+class SessionPool:
+    def __init__(self, command: list[str], cwd: Path, size: int = 1,
+                 turns_per_session: int = TURNS_PER_SESSION):
+        self.turns_per_session = turns_per_session
+        self._idle: queue.Queue = queue.Queue()
+        self._workers = [ClaudeWorker(command, cwd, name=f"claude-{i}") for i in range(max(1, size))]
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def run(self, prompt: str, timeout: float) -> dict:
+        """Run one turn on the next free worker and return its result event.
+
+        Blocks while every worker is busy. On timeout or crash the worker is
+        killed and restarted on its next use; the exception propagates.
+        """
+        worker = self._idle.get()
+        try:
+            result = worker.run_turn(prompt, timeout)
+        except Exception:
+            worker.stop(grace=0)
+            raise
+        else:
+            if worker.turns >= self.turns_per_session:
+                logger.info("[%s] %d turns — resetting context", worker.name, worker.turns)
+                worker.stop()
+            return result
+        finally:
+            self._idle.put(worker)
+
+    def close(self):
+        for worker in self._workers:
+            worker.stop()
+
+
+_pools: dict[tuple, SessionPool] = {}
+_pool_lock = threading.Lock()
+
+
+def get_pool(command: list[str], cwd: Path, size: int = 1) -> SessionPool:
+    """Process-wide pool per distinct command line, created on first use."""
+    key = tuple(command)
+    with _pool_lock:
+        if key not in _pools:
+            _pools[key] = SessionPool(command, cwd, size)
+        return _pools[key]
+
+
+def shutdown():
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -0,0 +1,80 @@
+"""
+heartbeat.py - Liveness channel between supervised components and main_watcher.
+
+Responsibility:
+- beat(): called by each component once per loop iteration (and while it
+  sleeps); touches the heartbeat file named in AI_EMPLOYEE_HEARTBEAT_FILE
+- heartbeat_path() / heartbeat_age(): used by main_watcher to decide whether
+  a child that is still running has stopped making progress
+
+Boundary:
+- Does NOT kill or restart anything — that is main_watcher's policy
+- A component started without the environment variable (run by hand, or
+  hosted in-process by main_watcher) makes beat() a no-op
+
+Assumptions:
+- The heartbeat is the file's mtime; writes are throttled to one per
+  MIN_BEAT_INTERVAL seconds so calling beat() in a 1s sleep loop is cheap
+"""
+
+import os
+import time
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).resolve().parent
+HEARTBEAT_DIR = BASE_DIR / "logs" / "heartbeats"
+HEARTBEAT_ENV = "AI_EMPLOYEE_HEARTBEAT_FILE"
+
+MIN_BEAT_INTERVAL = 5.0     # seconds between actual file touches
+
+_last_beat = 0.0
+
+
+# ---------------------------------------------------------------------------
+# Component side
+# ---------------------------------------------------------------------------
+
+def beat(force: bool = False) -> None:
+    """Record that this process is making progress."""
+    global _last_beat
+    path = os.environ.get(HEARTBEAT_ENV)
+    if not path:
+        return
+    now = time.monotonic()
+    if not force and now - _last_beat < MIN_BEAT_INTERVAL:
+        return
+    try:
+        with open(path, "a"):
+            os.utime(path, None)
+        _last_beat = now
+    except OSError:
+        pass  # never let liveness reporting take a component down
+
+
+# ---------------------------------------------------------------------------
+# Supervisor side
+# ---------------------------------------------------------------------------
+
+def heartbeat_path(name: str) -> Path:
+    """Heartbeat file for a managed component."""
+    HEARTBEAT_DIR.mkdir(parents=True, exist_ok=True)
+    return HEARTBEAT_DIR / f"{name}.hb"
+
+
+def reset(path: Path) -> None:
+    """Start a fresh heartbeat window (called when the component is launched)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a"):
+        os.utime(path, None)
+
+
+def heartbeat_age(path: Path) -> float | None:
+    """Seconds since the last beat, or None if the file does not exist."""
+    try:
+        return time.time() - path.stat().st_mtime
+    except OSError:
+        return None
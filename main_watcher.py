@@ -4,7 +4,10 @@ main_watcher.py - System Supervisor / Watchdog
 Responsibility:
 - Launches and monitors gmail_watcher.py, x_watcher.py, linkedin_watcher.py, instagram_watcher.py, facebook_watcher.py, odoo_watcher.py, and orchestrator.py as child processes
 - Automatically restarts any process that crashes, exits, or becomes unresponsive
-- Logs all crashes, restarts, and failures for audit/debugging
+  (no heartbeat within its heartbeat_timeout — see heartbeat.py)
+- Logs all crashes, restarts, and failures for audit/debugging; each child's
+  stdout/stderr is captured in a ring buffer and its tail logged on a crash
+- Serves aggregated Prometheus metrics for the whole pipeline (see metrics.py)
 - Runs continuously while the PC is on
 
 Usage:
@@ -13,6 +16,15 @@ Usage:
     Stop with Ctrl+C (SIGINT) or send SIGTERM — all child processes are
     gracefully terminated before exit.
 
+    python main_watcher.py --host      (or MAIN_WATCHER_HOST_MODE=1)
+
+    Host mode runs the lightweight components (gmail_watcher, odoo_watcher,
+    reporting_engine, ceo_briefing) inside this process on one shared
+    asyncio loop instead of as child interpreters. Each is still supervised
+    individually: a crash ends only that component, which is restarted with
+    the same delay/back-off rules. Browser watchers and the orchestrator
+    always stay in their own processes.
+
     (PM2 support is available via ecosystem.config.js but is not required.
      Run directly with the command above until PM2 is re-enabled.)
 
@@ -25,18 +37,31 @@ Boundary:
 Assumptions:
 - Python 3.10+ available on PATH (or activate the venv first)
 - All child scripts are in known relative paths
-- Heartbeat check uses a simple "is process alive" poll
+- Liveness = process still running AND its heartbeat file was touched within
+  heartbeat_timeout seconds (timeouts cover the longest legitimate poll cycle)
 """
 
+import asyncio
+import importlib
+import random
+import select
+import socket
 import subprocess
 import sys
+import threading
 import time
 import signal
 import logging
+import logging.handlers
 import os
+import queue
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 
+from heartbeat import HEARTBEAT_ENV, heartbeat_age, heartbeat_path, reset as reset_heartbeat
+import metrics
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -51,6 +76,8 @@ MANAGED_PROCESSES = [
         "restart_delay": 5,
         "max_rapid_restarts": 5,
         "rapid_window": 60,
+        "heartbeat_timeout": 300,
+        "hosted": {"module": "gmail_watcher", "factory": "GmailWatcher"},
     },
     # Priority 2 — LinkedIn
     {
@@ -59,6 +86,7 @@ MANAGED_PROCESSES = [
         "restart_delay": 15,
         "max_rapid_restarts": 3,
         "rapid_window": 120,
+        "heartbeat_timeout": 900,
     },
     # Priority 3 — X/Twitter
     {
@@ -67,6 +95,7 @@ MANAGED_PROCESSES = [
         "restart_delay": 10,
         "max_rapid_restarts": 3,
         "rapid_window": 120,
+        "heartbeat_timeout": 1200,
     },
     # Priority 4 — Instagram
     {
@@ -75,6 +104,7 @@ MANAGED_PROCESSES = [
         "restart_delay": 15,
         "max_rapid_restarts": 3,
         "rapid_window": 120,
+        "heartbeat_timeout": 900,
     },
     # Priority 5 — Facebook
     {
@@ -83,6 +113,7 @@ MANAGED_PROCESSES = [
         "restart_delay": 15,
         "max_rapid_restarts": 3,
         "rapid_window": 120,
+        "heartbeat_timeout": 900,
     },
     # Priority 6 — Odoo (lowest priority, polls every 10 min)
     {
@@ -91,6 +122,8 @@ MANAGED_PROCESSES = [
         "restart_delay": 30,       # slow restart — lowest priority
         "max_rapid_restarts": 3,   # conservative
         "rapid_window": 180,
+        "heartbeat_timeout": 600,
+        "hosted": {"module": "odoo_watcher", "factory": "OdooWatcher"},
     },
     # Orchestrator — always last so all watchers are up first
     {
@@ -99,6 +132,10 @@ MANAGED_PROCESSES = [
         "restart_delay": 5,
         "max_rapid_restarts": 5,
         "rapid_window": 60,
+        # beat() runs per task, so the gap is one task: a browser action
+        # (BROWSER_ACTION_TIMEOUT=150s) or a Claude call (120s) plus its
+        # fallback call — well under this
+        "heartbeat_timeout": 600,
     },
     # Reporting & Analytics — periodic updates
     {
@@ -107,6 +144,8 @@ MANAGED_PROCESSES = [
         "restart_delay": 60,
         "max_rapid_restarts": 3,
         "rapid_window": 300,
+        "heartbeat_timeout": 600,
+        "hosted": {"module": "reporting_engine", "cycle": "run_cycle", "interval": "REPORT_INTERVAL"},
     },
     # CEO Daily Briefing
     {
@@ -115,10 +154,34 @@ MANAGED_PROCESSES = [
         "restart_delay": 60,
         "max_rapid_restarts": 3,
         "rapid_window": 300,
+        "heartbeat_timeout": 600,
+        "hosted": {"module": "ceo_briefing", "cycle": "run_cycle", "interval": "BRIEFING_INTERVAL"},
     },
 ]
 
-HEALTH_CHECK_INTERVAL = 10  # seconds between liveness checks
+HEALTH_CHECK_INTERVAL = 10  # seconds between heartbeat checks (exits are seen immediately)
+CHILD_POLL_INTERVAL = 1     # exit-detection poll where SIGCHLD is unavailable (Windows)
+STOP_GRACE = 10             # seconds between SIGTERM and SIGKILL
+BACKOFF_BASE = 30           # first back-off after hitting the rapid-restart threshold
+BACKOFF_MAX = 600           # back-off ceiling; doubles per consecutive threshold hit
+BACKOFF_JITTER = 0.2        # ±20% randomisation on restart and back-off delays
+HOST_STOP_TIMEOUT = 30      # seconds to wait for a hosted component to finish its current poll
+
+# Child output capture: merged stdout/stderr of every child is drained into a
+# ring buffer; the tail is logged here when a child exits abnormally
+OUTPUT_BUFFER_LINES = 500
+CRASH_DUMP_LINES = 50
+CHILD_LOG_TO_DISK = False           # also append child output to logs/children/<name>.log
+CHILD_LOG_MAX_BYTES = 5 * 1024 * 1024
+CHILD_LOG_BACKUPS = 3
+
+# Metrics: every child writes logs/metrics/<name>.prom (see metrics.py); this
+# process merges them with its own and serves the result at
+# http://127.0.0.1:<METRICS_PORT>/metrics. Set the port to 0 to disable.
+METRICS_PORT = int(os.environ.get("MAIN_WATCHER_METRICS_PORT", "9464"))
+
+# Host mode: run entries with a "hosted" spec in-process (see module docstring)
+HOST_MODE = "--host" in sys.argv[1:] or os.environ.get("MAIN_WATCHER_HOST_MODE") == "1"
 LOG_DIR = BASE_DIR / "logs"
 
 # ---------------------------------------------------------------------------
@@ -139,13 +202,127 @@ logging.basicConfig(
 )
 logger = logging.getLogger("main_watcher")
 
+# Restart state machine states (see ManagedProcess)
+RUNNING = "running"
+STOPPING = "stopping"
+WAITING = "waiting"
+BACKOFF = "backoff"
+
+COMPONENT_UP = metrics.gauge(
+    "component_up", "1 while a managed component is running, else 0.", ("component",),
+)
+COMPONENT_RESTARTS = metrics.counter(
+    "component_restarts_total", "Restarts of a managed component.", ("component",),
+)
+
+# ---------------------------------------------------------------------------
+# Child output capture
+# ---------------------------------------------------------------------------
+
+
+class OutputCapture:
+    """Drains one child's merged stdout/stderr on a reader thread.
+
+    The pipe is always read as fast as the child writes, so the child never
+    blocks on a full pipe; only the newest `max_lines` lines are kept.
+    """
+
+    def __init__(self, name: str, stream, max_lines: int, disk: "ChildLogWriter | None" = None):
+        self.lines: deque[str] = deque(maxlen=max_lines)
+        self._disk = disk
+        self._thread = threading.Thread(
+            target=self._drain, args=(stream,), name=f"capture-{name}", daemon=True,
+        )
+        self._thread.start()
+
+    def _drain(self, stream):
+        with stream:
+            for raw in iter(stream.readline, b""):
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                self.lines.append(line)
+                if self._disk is not None:
+                    self._disk.put(line)
+
+    def finish(self, timeout: float = 0.5):
+        """Give the reader a moment to collect the last lines after the child exits."""
+        self._thread.join(timeout)
+
+    def tail(self, n: int) -> list[str]:
+        return list(self.lines)[-n:]
+
+
+class ChildLogWriter:
+    """Appends a child's output to logs/children/<name>.log with size rotation.
+
+    Lines are handed over through an unbounded queue and written on this
+    writer's own thread in batches, so a slow disk never slows the reader
+    thread (and therefore never the child).
+    """
+
+    def __init__(self, name: str):
+        child_dir = LOG_DIR / "children"
+        child_dir.mkdir(parents=True, exist_ok=True)
+        self._handler = logging.handlers.RotatingFileHandler(
+            child_dir / f"{name}.log",
+            maxBytes=CHILD_LOG_MAX_BYTES,
+            backupCount=CHILD_LOG_BACKUPS,
+            encoding="utf-8",
+        )
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write, name=f"childlog-{name}", daemon=True)
+        self._thread.start()
+
+    def put(self, line: str):
+        self._queue.put(line)
+
+    def _write(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                batch = batch[:batch.index(None)]
+                self._append(batch)
+                return
+            self._append(batch)
+
+    def _append(self, lines: list[str]):
+        if not lines:
+            return
+        text = "\n".join(lines)
+        record = logging.makeLogRecord({"msg": text})
+        if self._handler.shouldRollover(record):
+            self._handler.doRollover()
+        self._handler.stream.write(text + "\n")
+        self._handler.stream.flush()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._handler.close()
+
+
 # ---------------------------------------------------------------------------
 # Process wrapper
 # ---------------------------------------------------------------------------
 
 
 class ManagedProcess:
-    """Wraps a subprocess with restart tracking and back-off logic."""
+    """Wraps a subprocess with a restart state machine and jittered back-off.
+
+    States:
+      running  — child is up; checked for exit and stale heartbeat
+      stopping — hung child was sent SIGTERM; force-killed at kill_at
+      waiting  — child exited; restart scheduled at restart_at
+      backoff  — rapid-restart threshold hit; restart at restart_at after an
+                 exponentially growing, jittered delay
+
+    tick() never blocks: it advances the state and returns the monotonic
+    time at which this process next needs attention.
+    """
 
     def __init__(self, config: dict):
         self.name: str = config["name"]
@@ -154,20 +331,43 @@ class ManagedProcess:
         self.max_rapid_restarts: int = config.get("max_rapid_restarts", 5)
         self.rapid_window: int = config.get("rapid_window", 60)
 
+        # Seconds without a heartbeat before a running child counts as hung
+        self.heartbeat_timeout: int | None = config.get("heartbeat_timeout")
+        self.heartbeat_path: Path | None = (
+            heartbeat_path(self.name) if self.heartbeat_timeout else None
+        )
+
         self.process: subprocess.Popen | None = None
+        self.output: OutputCapture | None = None
+        self.disk_log = ChildLogWriter(self.name) if CHILD_LOG_TO_DISK else None
         self.restart_times: list[float] = []
         self.total_restarts: int = 0
-        self.backoff_until: float = 0
+
+        self.state: str = WAITING
+        self.restart_at: float = 0.0
+        self.kill_at: float = 0.0
+        self.started_at: float = 0.0
+        self.backoff_level: int = 0
 
     # -- lifecycle -----------------------------------------------------------
 
-    def start(self):
-        """Start the subprocess. Returns True on success."""
+    def _launch(self) -> bool:
+        env = os.environ.copy()
+        if self.heartbeat_path:
+            reset_heartbeat(self.heartbeat_path)
+            env[HEARTBEAT_ENV] = str(self.heartbeat_path)
+        env[metrics.COMPONENT_ENV] = self.name
+        env.pop(metrics.PORT_ENV, None)  # children publish via textfile only
         try:
             self.process = subprocess.Popen(
                 self.cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                env=env,
+            )
+            self.output = OutputCapture(
+                self.name, self.process.stdout, OUTPUT_BUFFER_LINES, self.disk_log,
             )
             logger.info(
                 "[%s] Started (PID %d)", self.name, self.process.pid
@@ -177,31 +377,60 @@ class ManagedProcess:
             logger.exception("[%s] Failed to start", self.name)
             return False
 
+    def start(self):
+        """Start the child. Returns True on success; a failure is handled like an exit."""
+        now = time.monotonic()
+        if self._launch():
+            self.state = RUNNING
+            self.started_at = now
+            return True
+        self._on_exit(now)
+        return False
+
     def stop(self):
-        """Gracefully stop the subprocess."""
+        """Gracefully stop the subprocess (blocking; used at supervisor shutdown)."""
         if self.process and self.process.poll() is None:
             logger.info("[%s] Sending SIGTERM (PID %d)", self.name, self.process.pid)
             self.process.terminate()
             try:
-                self.process.wait(timeout=10)
+                self.process.wait(timeout=STOP_GRACE)
             except subprocess.TimeoutExpired:
                 logger.warning("[%s] Force-killing (PID %d)", self.name, self.process.pid)
                 self.process.kill()
                 self.process.wait()
             logger.info("[%s] Stopped", self.name)
 
+    def _begin_stop(self, now: float):
+        """Non-blocking stop of a hung child: SIGTERM now, SIGKILL at kill_at."""
+        self.process.terminate()
+        self.state = STOPPING
+        self.kill_at = now + STOP_GRACE
+
     def is_alive(self) -> bool:
         return self.process is not None and self.process.poll() is None
 
-    # -- restart logic -------------------------------------------------------
+    def exit_status(self):
+        return self.process.returncode if self.process else "N/A"
+
+    def is_hung(self) -> bool:
+        """True if the child is running but its heartbeat is older than heartbeat_timeout."""
+        if not self.heartbeat_path or not self.is_alive():
+            return False
+        age = heartbeat_age(self.heartbeat_path)
+        if age is None or age <= self.heartbeat_timeout:
+            return False
+        logger.error(
+            "[%s] No heartbeat for %.0fs (limit %ds) — killing hung process (PID %d)",
+            self.name, age, self.heartbeat_timeout, self.process.pid,
+        )
+        return True
 
-    def _in_backoff(self) -> bool:
-        return time.time() < self.backoff_until
+    # -- restart state machine -----------------------------------------------
 
-    def _record_restart(self):
-        now = time.time()
+    def _record_restart(self, now: float):
         self.restart_times.append(now)
         self.total_restarts += 1
+        COMPONENT_RESTARTS.inc(component=self.name)
         # Trim old timestamps outside the rapid window
         cutoff = now - self.rapid_window
         self.restart_times = [t for t in self.restart_times if t >= cutoff]
@@ -209,46 +438,278 @@ class ManagedProcess:
     def _should_backoff(self) -> bool:
         return len(self.restart_times) >= self.max_rapid_restarts
 
-    def ensure_running(self):
-        """Check if the process is alive; restart if needed with back-off."""
-        if self.is_alive():
-            return
+    def _backoff_delay(self) -> float:
+        base = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** self.backoff_level))
+        return base * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
 
-        if self._in_backoff():
-            return  # still in back-off period, skip
+    def _dump_output(self):
+        """Log the tail of the child's output after an abnormal exit."""
+        if self.output is None:
+            return
+        self.output.finish()
+        tail = self.output.tail(CRASH_DUMP_LINES)
+        if tail:
+            logger.error(
+                "[%s] Last %d line(s) of output:\n%s",
+                self.name, len(tail), "\n".join(f"    | {line}" for line in tail),
+            )
 
-        exit_code = self.process.returncode if self.process else "N/A"
+    def _on_exit(self, now: float):
+        """Child is gone — schedule the restart (or a back-off)."""
         logger.warning(
-            "[%s] Process exited (code=%s). Restarting (#%d)...",
-            self.name,
-            exit_code,
-            self.total_restarts + 1,
+            "[%s] Process exited (code=%s).", self.name, self.exit_status(),
         )
-
-        self._record_restart()
+        if self.exit_status() != 0:
+            self._dump_output()
+        self._record_restart(now)
 
         if self._should_backoff():
-            backoff_seconds = 60
-            self.backoff_until = time.time() + backoff_seconds
+            delay = self._backoff_delay()
+            self.backoff_level += 1
+            self.restart_times = []
+            self.state = BACKOFF
             logger.error(
                 "[%s] Rapid restart threshold hit (%d restarts in %ds). "
-                "Backing off for %ds.",
+                "Backing off for %.0fs (level %d).",
                 self.name,
                 self.max_rapid_restarts,
                 self.rapid_window,
-                backoff_seconds,
+                delay,
+                self.backoff_level,
+            )
+        else:
+            delay = self.restart_delay * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+            self.state = WAITING
+            logger.warning(
+                "[%s] Restarting (#%d) in %.1fs...",
+                self.name, self.total_restarts, delay,
+            )
+        self.restart_at = now + delay
+
+    def tick(self, now: float) -> float:
+        """Advance the state machine; return when this process next needs attention."""
+        if self.state == RUNNING:
+            if not self.is_alive():
+                self._on_exit(now)
+            elif self.is_hung():
+                self._begin_stop(now)
+            elif self.backoff_level and now - self.started_at >= self.rapid_window:
+                # Stayed up a full window — forget earlier back-offs
+                self.backoff_level = 0
+
+        if self.state == STOPPING:
+            if not self.is_alive():
+                self._on_exit(now)
+            elif now >= self.kill_at:
+                logger.warning("[%s] Force-killing (PID %d)", self.name, self.process.pid)
+                self.process.kill()
+                self.kill_at = now + 1
+
+        if self.state in (WAITING, BACKOFF) and now >= self.restart_at:
+            self.start()
+
+        COMPONENT_UP.set(1 if self.state == RUNNING else 0, component=self.name)
+
+        if self.state in (WAITING, BACKOFF):
+            return self.restart_at
+        if self.state == STOPPING:
+            return self.kill_at
+        return now + HEALTH_CHECK_INTERVAL
+
+
+# ---------------------------------------------------------------------------
+# In-process component host (host mode)
+# ---------------------------------------------------------------------------
+
+
+class _PeriodicRunner:
+    """Call a module's run_cycle() every `interval` seconds until stopped."""
+
+    def __init__(self, name: str, cycle, interval: int):
+        self.name = name
+        self.cycle = cycle
+        self.interval = interval
+        self._running = True
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+
+    def stop(self):
+        self._running = False
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        while self._running:
+            try:
+                await asyncio.to_thread(self.cycle)
+                logger.info("[%s] Cycle complete. Next in %ds.", self.name, self.interval)
+            except Exception:
+                logger.exception("[%s] Cycle failed", self.name)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+class ComponentHost:
+    """Owns the shared asyncio loop (on a background thread) for hosted components."""
+
+    def __init__(self):
+        for path in (BASE_DIR, BASE_DIR / "watchers"):
+            if str(path) not in sys.path:
+                sys.path.insert(0, str(path))
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="component-host", daemon=True,
+        )
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+class HostedComponent(ManagedProcess):
+    """A MANAGED_PROCESSES entry run as a task on the ComponentHost loop.
+
+    Reuses the ManagedProcess restart state machine unchanged; only
+    launch/stop/liveness differ. The task ending for any reason — including
+    an exception raised while constructing or running the component — is
+    treated like a child process exit.
+    """
+
+    def __init__(self, config: dict, host: ComponentHost):
+        super().__init__(config)
+        # A hung thread cannot be killed, so hosted components are not heartbeat-checked
+        self.heartbeat_timeout = None
+        self.heartbeat_path = None
+        self.spec: dict = config["hosted"]
+        self.host = host
+        self.future = None
+        self.runner = None
+
+        # Module basicConfig() is a no-op in this process; keep per-component log files
+        handler = logging.FileHandler(LOG_DIR / f"{self.name}.log", encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s"))
+        for logger_name in filter(None, (self.spec["module"], self.spec.get("factory"))):
+            logging.getLogger(logger_name).addHandler(handler)
+
+    async def _run(self):
+        from async_base_watcher import as_async
+
+        module = await asyncio.to_thread(importlib.import_module, self.spec["module"])
+        if "factory" in self.spec:
+            watcher = await asyncio.to_thread(getattr(module, self.spec["factory"]))
+            self.runner = as_async(watcher)
+        else:
+            self.runner = _PeriodicRunner(
+                self.name,
+                getattr(module, self.spec["cycle"]),
+                getattr(module, self.spec["interval"]),
             )
+        await self.runner.run()
+
+    def _on_done(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(
+                "[%s] Hosted component crashed",
+                self.name, exc_info=future.exception(),
+            )
+        if _waker is not None:
+            _waker.wake()
+
+    def _launch(self) -> bool:
+        self.runner = None
+        self.future = self.host.submit(self._run())
+        self.future.add_done_callback(self._on_done)
+        logger.info("[%s] Started (hosted)", self.name)
+        return True
+
+    def stop(self):
+        if not self.is_alive():
             return
+        logger.info("[%s] Stopping hosted component", self.name)
+        if self.runner is not None:
+            self.runner.stop()
+        try:
+            self.future.result(timeout=HOST_STOP_TIMEOUT)
+        except Exception:
+            # Timed out mid-poll or construction — abandon the task
+            self.future.cancel()
+        logger.info("[%s] Stopped", self.name)
+
+    def is_alive(self) -> bool:
+        return self.future is not None and not self.future.done()
 
-        time.sleep(self.restart_delay)
-        self.start()
+    def exit_status(self):
+        if self.future is None or not self.future.done():
+            return "N/A"
+        if self.future.cancelled():
+            return "cancelled"
+        exc = self.future.exception()
+        return f"exception: {exc!r}" if exc else "returned"
 
 
 # ---------------------------------------------------------------------------
 # Main supervisor loop
 # ---------------------------------------------------------------------------
 
+class _Waker:
+    """Wakes the supervisor loop early: on signals (SIGCHLD/SIGINT/SIGTERM via
+    signal.set_wakeup_fd) and when a hosted component finishes."""
+
+    def __init__(self):
+        self._r, self._w = socket.socketpair()
+        self._r.setblocking(False)
+        self._w.setblocking(False)
+        signal.set_wakeup_fd(self._w.fileno(), warn_on_full_buffer=False)
+
+    def wake(self):
+        try:
+            self._w.send(b"\0")
+        except OSError:
+            pass  # buffer full — a wake-up is already pending
+
+    def wait(self, timeout: float):
+        select.select([self._r], [], [], max(0.0, timeout))
+        try:
+            while self._r.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def close(self):
+        signal.set_wakeup_fd(-1)
+        self._r.close()
+        self._w.close()
+
+
 _running = True
+_waker: _Waker | None = None
+
+
+def _on_sigchld(signum, frame):
+    pass  # only here so the wakeup fd fires; reaping happens in tick()
+
+
+def _render_metrics() -> str:
+    """This process's metrics (incl. hosted components) merged with every child's textfile.
+
+    Hosted watchers start the textfile exporter inside this process, so its
+    own textfile holds the same series as the live registry — skip it.
+    """
+    own = metrics.REGISTRY.render({"process": "main_watcher"})
+    own_file = f"{metrics.component_name()}.prom"
+    return metrics.merge_expositions([own] + metrics.collect_textfiles(exclude=(own_file,)))
 
 
 def _shutdown(signum, frame):
@@ -258,7 +719,7 @@ def _shutdown(signum, frame):
 
 
 def main():
-    global _running
+    global _running, _waker
 
     # ---- singleton guard: prevent two main_watcher instances -----------------
     lock_path = BASE_DIR / "main_watcher.lock"
@@ -285,31 +746,59 @@ def main():
 
     signal.signal(signal.SIGINT, _shutdown)
     signal.signal(signal.SIGTERM, _shutdown)
+    has_sigchld = hasattr(signal, "SIGCHLD")
+    if has_sigchld:
+        signal.signal(signal.SIGCHLD, _on_sigchld)
+    _waker = _Waker()
 
     logger.info("=" * 60)
     logger.info("main_watcher.py starting — System Supervisor")
     logger.info("Managed processes: %s", [p["name"] for p in MANAGED_PROCESSES])
+    if HOST_MODE:
+        logger.info(
+            "Host mode: in-process components: %s",
+            [p["name"] for p in MANAGED_PROCESSES if "hosted" in p],
+        )
     logger.info("=" * 60)
 
+    host = ComponentHost() if HOST_MODE else None
     managed: list[ManagedProcess] = []
     for cfg in MANAGED_PROCESSES:
-        mp = ManagedProcess(cfg)
+        if host is not None and "hosted" in cfg:
+            mp = HostedComponent(cfg, host)
+        else:
+            mp = ManagedProcess(cfg)
         mp.start()
         managed.append(mp)
 
+    metrics_server = None
+    if METRICS_PORT:
+        try:
+            metrics_server = metrics.serve_http(METRICS_PORT, _render_metrics)
+            logger.info("Metrics available at http://127.0.0.1:%d/metrics", METRICS_PORT)
+        except OSError:
+            logger.warning("Could not bind metrics port %d — endpoint disabled", METRICS_PORT, exc_info=True)
+
+    # Event/timer-driven: wake at the earliest restart/kill deadline, on any
+    # child exit (SIGCHLD) or shutdown signal, or for the next heartbeat check
+    max_wait = HEALTH_CHECK_INTERVAL if has_sigchld else CHILD_POLL_INTERVAL
     while _running:
-        for mp in managed:
-            mp.ensure_running()
-        # Sleep in short increments for responsive shutdown
-        for _ in range(HEALTH_CHECK_INTERVAL):
-            if not _running:
-                break
-            time.sleep(1)
+        now = time.monotonic()
+        next_due = min(mp.tick(now) for mp in managed)
+        _waker.wait(min(next_due - now, max_wait))
 
     # Graceful shutdown of all children
     logger.info("Shutting down all managed processes...")
     for mp in managed:
         mp.stop()
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    if host is not None:
+        host.close()
+    for mp in managed:
+        if mp.disk_log is not None:
+            mp.disk_log.close()
+    _waker.close()
 
     if lock_file and lock_file.exists():
         try:
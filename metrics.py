@@ -0,0 +1,329 @@
+"""
+metrics.py - Minimal Prometheus-style metrics for every pipeline process.
+
+Responsibility:
+- Counter, Gauge and Histogram types with optional labels, registered in a
+  process-wide REGISTRY and rendered in the Prometheus text format
+- start_exporter(): publishes this process's metrics as a textfile
+  (logs/metrics/<component>.prom, rewritten atomically every
+  EXPORT_INTERVAL seconds) and, if AI_EMPLOYEE_METRICS_PORT is set, on a
+  local HTTP /metrics endpoint
+- merge_expositions() / serve_http(): used by main_watcher to aggregate
+  every process's textfile into one /metrics endpoint
+
+Boundary:
+- No external dependencies and no push gateway — scraping is pull-only
+- Metric updates never raise into the caller's code path
+
+Assumptions:
+- Every sample is exported with a process="<component>" label; the
+  component name comes from AI_EMPLOYEE_COMPONENT (set by main_watcher)
+  or the script name
+"""
+
+import atexit
+import http.server
+import math
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).resolve().parent
+METRICS_DIR = BASE_DIR / "logs" / "metrics"
+COMPONENT_ENV = "AI_EMPLOYEE_COMPONENT"
+PORT_ENV = "AI_EMPLOYEE_METRICS_PORT"
+
+EXPORT_INTERVAL = 15        # seconds between textfile rewrites
+STALE_AFTER = 120           # aggregator ignores textfiles older than this
+PREFIX = "ai_employee_"
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+# ---------------------------------------------------------------------------
+# Metric types
+# ---------------------------------------------------------------------------
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: dict | None = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs = list(extra.items()) + pairs
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self, extra: dict | None = None) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_child(key, value, extra))
+        return lines
+
+    def _render_child(self, key, value, extra) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def time(self, **labels):
+        """Context manager that observes the elapsed wall time of its block."""
+        return _Timer(self, labels)
+
+    def _render_child(self, key, state, extra) -> list[str]:
+        lines = []
+        for bound, count in zip(self.buckets, state["counts"]):
+            bucket_labels = _format_labels(
+                self.labelnames + ("le",), key + (_format_value(bound),), extra,
+            )
+            lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+        labels = _format_labels(self.labelnames, key, extra)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.monotonic() - self.start, **self.labels)
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(PREFIX + name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self, extra_labels: dict | None = None) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render(extra_labels))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+
+# ---------------------------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------------------------
+
+def component_name() -> str:
+    return os.environ.get(COMPONENT_ENV) or Path(sys.argv[0]).stem or "python"
+
+
+def write_textfile(path: Path | None = None) -> Path:
+    """Atomically write this process's metrics to its textfile."""
+    path = path or METRICS_DIR / f"{component_name()}.prom"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(REGISTRY.render({"process": component_name()}), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    render = staticmethod(lambda: "")
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep scrapes out of component logs
+
+
+def serve_http(port: int, render, host: str = "127.0.0.1") -> http.server.ThreadingHTTPServer:
+    """Serve render() at http://host:port/metrics on a daemon thread."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"render": staticmethod(render)})
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_exporter() -> None:
+    """Publish this process's metrics (idempotent; safe to call from every loop)."""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+
+    def _loop():
+        while True:
+            try:
+                write_textfile()
+            except OSError:
+                pass
+            time.sleep(EXPORT_INTERVAL)
+
+    threading.Thread(target=_loop, name="metrics-textfile", daemon=True).start()
+    atexit.register(lambda: write_textfile())
+
+    port = os.environ.get(PORT_ENV)
+    if port:
+        try:
+            serve_http(int(port), lambda: REGISTRY.render({"process": component_name()}))
+        except (OSError, ValueError):
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Aggregation (main_watcher)
+# ---------------------------------------------------------------------------
+
+def merge_expositions(texts: list[str]) -> str:
+    """Merge several text expositions, emitting HELP/TYPE once per family."""
+    families: dict[str, dict] = {}
+    for text in texts:
+        current = None
+        for line in text.splitlines():
+            if line.startswith("# HELP ") or line.startswith("# TYPE "):
+                name, _, rest = line[7:].partition(" ")
+                family = families.setdefault(name, {"help": "", "type": "untyped", "samples": []})
+                family["help" if line.startswith("# HELP ") else "type"] = rest
+                current = name
+            elif line and not line.startswith("#") and current is not None:
+                families[current]["samples"].append(line)
+    out = []
+    for name, family in families.items():
+        out.append(f"# HELP {name} {family['help']}")
+        out.append(f"# TYPE {name} {family['type']}")
+        out.extend(family["samples"])
+    return "\n".join(out) + "\n"
+
+
+def collect_textfiles(
+    directory: Path = METRICS_DIR,
+    stale_after: float = STALE_AFTER,
+    exclude: tuple[str, ...] = (),
+) -> list[str]:
+    """Return the contents of every fresh *.prom file in directory, minus names in exclude."""
+    texts = []
+    now = time.time()
+    for path in sorted(directory.glob("*.prom")):
+        if path.name in exclude:
+            continue
+        try:
+            if now - path.stat().st_mtime > stale_after:
+                continue
+            texts.append(path.read_text(encoding="utf-8"))
+        except OSError:
+            continue
+    return texts
@@ -0,0 +1,179 @@
+"""
+model_routing.py - Pick the Claude model for each reasoning call.
+
+Responsibility:
+- route(task_type, meta, body): puts a task in a tier ("fast", "standard"
+  or "strong") from its type and complexity signals (body length, Odoo
+  amount, sender importance) and maps the tier to a model name
+- route_file(): the same for a task file on disk
+- usage_tokens(): token counts from a CLI result event, so the
+  orchestrator can report latency, tokens and outcomes per route
+
+Boundary:
+- Decision logic only: passing --model to the CLI and recording the
+  per-route metrics stay in orchestrator.py
+- MODEL_ROUTING=off, or an empty model name for a tier, leaves the CLI
+  on its default model
+
+Assumptions:
+- Model names are anything `claude --model` accepts: aliases such as
+  "haiku" / "sonnet" / "opus" or full model IDs
+"""
+
+import logging
+import os
+import re
+from email.utils import parseaddr
+from pathlib import Path
+
+import yaml
+
+import triage
+
+logger = logging.getLogger("model_routing")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+MODEL_ROUTING = os.environ.get("MODEL_ROUTING", "on")
+
+TIERS = ("fast", "standard", "strong")
+TIER_MODELS = {
+    "fast": os.environ.get("CLAUDE_MODEL_FAST", "haiku"),
+    "standard": os.environ.get("CLAUDE_MODEL_STANDARD", "sonnet"),
+    "strong": os.environ.get("CLAUDE_MODEL_STRONG", "opus"),
+}
+
+# task type → tier before complexity signals are applied
+BASE_TIERS = {
+    "tweet": "fast",                    # mostly like / ignore decisions
+    "watchlist": "fast",
+    "linkedin_post": "fast",
+    "instagram_dm": "standard",
+    "facebook_dm": "standard",
+    "email": "standard",
+    "odoo_event": "standard",
+    "linkedin_post_draft": "strong",    # public posts written from scratch
+    "facebook_post_draft": "strong",
+}
+DEFAULT_TIER = "standard"
+
+LONG_BODY_CHARS = 4000          # longer task bodies go up one tier
+ODOO_HIGH_AMOUNT = float(os.environ.get("ODOO_HIGH_AMOUNT", "10000"))
+ODOO_LOW_AMOUNT = float(os.environ.get("ODOO_LOW_AMOUNT", "500"))
+
+# Comma-separated addresses, @domains or platform usernames whose messages
+# always get the strong model (e.g. "ceo@client.com,@bigcustomer.com,jane_doe")
+IMPORTANT_SENDERS = {s.strip().lower() for s in os.environ.get("IMPORTANT_SENDERS", "").split(",") if s.strip()}
+IMPORTANT_LABELS = {"IMPORTANT", "STARRED"}
+
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n?", re.DOTALL)
+
+
+# ---------------------------------------------------------------------------
+# Signals
+# ---------------------------------------------------------------------------
+
+def _amount(meta: dict) -> float:
+    values = []
+    for key in ("amount_total", "amount_due"):
+        try:
+            values.append(abs(float(meta.get(key) or 0)))
+        except (TypeError, ValueError):
+            pass
+    return max(values, default=0.0)
+
+
+def _sender_important(task_type: str, meta: dict) -> str | None:
+    """Why the sender counts as important, or None."""
+    if task_type == "email":
+        address = parseaddr(str(meta.get("from", "")))[1].lower()
+        if address and (address in IMPORTANT_SENDERS
+                        or "@" + address.rpartition("@")[2] in IMPORTANT_SENDERS):
+            return f"important sender {address}"
+        labels = meta.get("labels") or []
+        if isinstance(labels, str):
+            labels = re.findall(r"[A-Za-z0-9_]+", labels)
+        starred = IMPORTANT_LABELS.intersection(labels)
+        if starred:
+            return f"gmail label {sorted(starred)[0]}"
+        return None
+    name = str(meta.get("sender") or meta.get("author_username") or meta.get("partner") or "")
+    handle = name.strip().lower().lstrip("@")
+    if handle and (handle in IMPORTANT_SENDERS or "@" + handle in IMPORTANT_SENDERS):
+        return f"important sender {name}"
+    return None
+
+
+def _step(tier: str, delta: int) -> str:
+    return TIERS[max(0, min(len(TIERS) - 1, TIERS.index(tier) + delta))]
+
+
+# ---------------------------------------------------------------------------
+# Routing
+# ---------------------------------------------------------------------------
+
+def route(task_type: str, meta: dict, body: str = "") -> tuple[str, str, str]:
+    """Returns (tier, model, reason); model is "" when the CLI default should be used."""
+    tier = BASE_TIERS.get(task_type, DEFAULT_TIER)
+    reason = f"{task_type} default"
+
+    if task_type == "odoo_event":
+        amount = _amount(meta)
+        if amount >= ODOO_HIGH_AMOUNT:
+            tier, reason = "strong", f"odoo amount {amount:,.2f}"
+        elif amount < ODOO_LOW_AMOUNT and "overdue" not in str(meta.get("event_type", "")):
+            tier, reason = "fast", f"odoo amount {amount:,.2f}"
+    elif task_type == "email" and triage.header_signals(meta):
+        tier, reason = "fast", "bulk mail"
+
+    important = _sender_important(task_type, meta)
+    if important:
+        tier = "strong" if task_type in ("email", "instagram_dm", "facebook_dm", "odoo_event") \
+            else _step(tier, 1)
+        reason = important
+    elif len(body) > LONG_BODY_CHARS and tier != "strong":
+        tier, reason = _step(tier, 1), f"long body ({len(body)} chars)"
+
+    model = TIER_MODELS.get(tier, "") if MODEL_ROUTING == "on" else ""
+    return tier, model, reason
+
+
+def route_file(task_file: Path, task_type: str | None = None) -> tuple[str, str, str]:
+    """route() for a task file; a missing or unreadable file routes on task_type alone."""
+    meta, body = {}, ""
+    try:
+        text = task_file.read_text(encoding="utf-8")
+    except OSError:
+        text = ""
+    match = _FRONTMATTER_RE.match(text)
+    if match:
+        try:
+            meta = yaml.safe_load(match.group(1)) or {}
+        except yaml.YAMLError:
+            logger.warning("Unparseable frontmatter in %s — routing on type only", task_file.name)
+        body = text[match.end():]
+    else:
+        body = text
+    if not isinstance(meta, dict):
+        meta = {}
+    return route(task_type or meta.get("type", "email"), meta, body)
+
+
+def usage_tokens(result: dict) -> dict[str, int]:
+    """Token counts by kind from a CLI result event ({} when it reports none)."""
+    usage = result.get("usage") or {}
+    kinds = {
+        "input": "input_tokens",
+        "output": "output_tokens",
+        "cache_read": "cache_read_input_tokens",
+        "cache_write": "cache_creation_input_tokens",
+    }
+    tokens = {}
+    for kind, key in kinds.items():
+        try:
+            tokens[kind] = int(usage.get(key) or 0)
+        except (TypeError, ValueError):
+            tokens[kind] = 0
+    return {k: v for k, v in tokens.items() if v}
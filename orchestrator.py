@@ -32,6 +32,7 @@ import logging
 import os
 import re
 import signal
+import shlex
 import shutil
 import subprocess
 import sys
@@ -41,6 +42,16 @@ from pathlib import Path
 
 import yaml
 
+from heartbeat import beat
+import claude_session
+import metrics
+import model_routing
+import prompt_registry
+import reasoning_cache
+import structured_reasoning
+import tracing
+import triage
+import usage_ledger
 from browser.x_actions import execute_tweet_actions as browser_execute_tweet_actions
 from browser.linkedin_actions import (
     execute_linkedin_actions as browser_execute_linkedin_actions,
@@ -68,7 +79,26 @@ DONE_DIR = VAULT_PATH / "Done"
 POLL_INTERVAL = 15  # seconds between folder scans
 MAX_REASONING_PER_CYCLE = 3  # max Claude Code calls before checking Approved/
 BROWSER_ACTION_TIMEOUT = 150  # seconds before killing a hung browser action
-CLAUDE_CMD = "claude"  # Claude Code CLI command
+# Claude Code CLI command; may include arguments (e.g. "python fake_claude.py" in benchmarks)
+CLAUDE_CMD = os.environ.get("CLAUDE_CMD", "claude")
+# How reasoning prompts reach Claude: "subprocess" starts one `claude -p` per task;
+# "session" keeps CLAUDE_WORKERS persistent stream-json processes (claude_session.py)
+REASONING_BACKEND = os.environ.get("REASONING_BACKEND", "subprocess")
+CLAUDE_WORKERS = int(os.environ.get("CLAUDE_WORKERS", "1"))
+# "files": Claude reads the task and writes plan/approval files with tools;
+# "json": task inlined, Claude answers with JSON and we render the files
+REASONING_OUTPUT_MODE = os.environ.get("REASONING_OUTPUT_MODE", "files")
+# Tools removed from the session in "json" mode. Leaving out --allowedTools only
+# drops pre-approval — read-only tools such as Read would still run — so the
+# structured path denies them explicitly instead of relying on the prompt
+STRUCTURED_DISALLOWED_TOOLS = (
+    "Read,Write,Edit,MultiEdit,NotebookEdit,Bash,Glob,Grep,"
+    "WebFetch,WebSearch,Task,mcp__gmail__send_email"
+)
+# Local triage before Claude (triage.py): "on" archives confident no-action tasks,
+# "shadow" only logs what it would archive, "off" sends everything to Claude.
+# Shadow by default: review the [triage:shadow] log lines before switching it on.
+TRIAGE_MODE = os.environ.get("TRIAGE_MODE", "shadow")
 
 # LinkedIn rate limits
 LINKEDIN_DAILY_ACTION_LIMIT = 5    # max like+comment actions per 24h window
@@ -130,6 +160,77 @@ logging.basicConfig(
 )
 logger = logging.getLogger("orchestrator")
 
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+TASKS_REASONED = metrics.counter(
+    "tasks_reasoned_total", "Needs_Action tasks sent to Claude, by task type and result.",
+    ("type", "result"),
+)
+CLAUDE_SECONDS = metrics.histogram(
+    "claude_subprocess_seconds", "Wall time of one Claude Code CLI invocation.",
+    ("purpose", "outcome"),
+)
+TASKS_TRIAGED = metrics.counter(
+    "tasks_triaged_total", "Needs_Action tasks archived by local triage without a Claude call.",
+    ("type", "reason"),
+)
+APPROVALS_EXECUTED = metrics.counter(
+    "approvals_executed_total", "Approved actions executed, by platform and outcome.",
+    ("platform", "outcome"),
+)
+BROWSER_ACTION_SECONDS = metrics.histogram(
+    "browser_action_seconds", "Wall time of one approved browser action.", ("platform",),
+)
+REASONING_CACHE_HITS = metrics.counter(
+    "reasoning_cache_hits_total", "Tasks answered from reasoning_cache instead of Claude.",
+    ("type", "result"),
+)
+TASKS_THROTTLED = metrics.counter(
+    "tasks_throttled_total", "Low-priority tasks held back because a daily Claude budget is spent.",
+    ("type",),
+)
+REASONING_ROUTE_SECONDS = metrics.histogram(
+    "reasoning_route_seconds", "Wall time of one reasoning call, by model_routing tier and model.",
+    ("tier", "model", "outcome"),
+)
+REASONING_ROUTE_TOKENS = metrics.counter(
+    "reasoning_route_tokens_total", "Tokens reported by the CLI for reasoning calls, by route.",
+    ("tier", "model", "kind"),
+)
+TASKS_ROUTED = metrics.counter(
+    "tasks_routed_total", "Reasoning results by model_routing tier and task type.",
+    ("tier", "type", "result"),
+)
+QUEUE_DEPTH = metrics.gauge("queue_depth", "Files waiting in each vault folder.", ("folder",))
+QUOTA_REMAINING = metrics.gauge(
+    "quota_remaining", "Daily browser actions left per platform.", ("platform",),
+)
+
+# action type → platform label; browser platforms also feed BROWSER_ACTION_SECONDS
+ACTION_PLATFORMS = {
+    "email_action": "email",
+    "tweet_action": "x",
+    "linkedin_action": "linkedin",
+    "linkedin_post_action": "linkedin",
+    "instagram_action": "instagram",
+    "facebook_action": "facebook",
+    "facebook_post_action": "facebook",
+    "odoo_action": "odoo",
+}
+BROWSER_PLATFORMS = {"x", "linkedin", "instagram", "facebook"}
+
+# Needs_Action task type → platform label (traces); anything else is email
+TASK_PLATFORMS = {
+    "tweet": "x",
+    "watchlist": "x",
+    "linkedin_post": "linkedin",
+    "instagram_dm": "instagram",
+    "facebook_dm": "facebook",
+    "odoo_event": "odoo",
+}
+
 # ---------------------------------------------------------------------------
 # State tracking
 # ---------------------------------------------------------------------------
@@ -439,9 +540,12 @@ def _send_session_alert_email(platform: str):
     )
 
     proc = None
+    outcome = "error"
+    result = None
+    start_time = time.time()
     try:
         proc = subprocess.Popen(
-            [CLAUDE_CMD, "-p", "--allowedTools", "mcp__gmail__send_email"],
+            _claude_command("-p", *claude_session.STREAM_OUTPUT_ARGS, "--allowedTools", "mcp__gmail__send_email"),
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -449,7 +553,9 @@ def _send_session_alert_email(platform: str):
             cwd=str(ORCHESTRATOR_WORKSPACE_DIR),
         )
         stdout, stderr = proc.communicate(input=send_prompt, timeout=60)
+        result = claude_session.parse_stream(stdout or "")
         if proc.returncode == 0:
+            outcome = "ok"
             logger.info("Session alert email sent for '%s'.", platform)
             _record_session_alert_sent(platform)
         else:
@@ -458,6 +564,7 @@ def _send_session_alert_email(platform: str):
                 platform, proc.returncode, stderr[:300],
             )
     except subprocess.TimeoutExpired:
+        outcome = "timeout"
         logger.error("Session alert email timed out for '%s' — killing.", platform)
         if proc:
             _kill_process_tree(proc.pid)
@@ -467,6 +574,11 @@ def _send_session_alert_email(platform: str):
                 proc.kill()
     except Exception:
         logger.exception("Unexpected error sending session alert for '%s'", platform)
+    finally:
+        usage_ledger.record(
+            "session_alert", "session_alert", platform, result,
+            backend="subprocess", outcome=outcome, duration=time.time() - start_time,
+        )
 
 
 def _record_platform_failure(platform: str):
@@ -522,7 +634,13 @@ def _schedule_linkedin_post_if_due():
         "LinkedIn post interval elapsed (%.1fh since last draft) — scheduling new post draft.",
         (datetime.now() - last).total_seconds() / 3600,
     )
-    _trigger_claude_linkedin_post_draft()
+    throttle_reason = usage_ledger.throttled("linkedin_post_draft")
+    if throttle_reason:
+        # Counts as this interval's draft, so the skip is logged once per interval
+        logger.warning("Skipping LinkedIn post draft: %s", throttle_reason)
+        TASKS_THROTTLED.inc(type="linkedin_post_draft")
+    else:
+        _trigger_claude_linkedin_post_draft()
     _save_last_linkedin_post_time()
 
 
@@ -560,7 +678,13 @@ def _schedule_facebook_post_if_due():
         "Facebook post interval elapsed (%.1fh since last draft) — scheduling new post draft.",
         (datetime.now() - last).total_seconds() / 3600,
     )
-    _trigger_claude_facebook_post_draft()
+    throttle_reason = usage_ledger.throttled("facebook_post_draft")
+    if throttle_reason:
+        # Counts as this interval's draft, so the skip is logged once per interval
+        logger.warning("Skipping Facebook post draft: %s", throttle_reason)
+        TASKS_THROTTLED.inc(type="facebook_post_draft")
+    else:
+        _trigger_claude_facebook_post_draft()
     _save_last_facebook_post_time()
 
 
@@ -584,7 +708,29 @@ def _parse_frontmatter(filepath: Path) -> dict:
 # Claude Code integration
 # ---------------------------------------------------------------------------
 
-def _trigger_claude_reasoning(task_file: Path):
+def _claude_command(*args: str) -> list:
+    """argv for one Claude Code CLI call: CLAUDE_CMD (shell-split) plus args."""
+    return shlex.split(CLAUDE_CMD, posix=os.name != "nt") + list(args)
+
+
+def _reason_with_template(template_name: str, task_file: Path, approval_prefix: str) -> str | None:
+    """Render prompts/<template_name>.md for a Needs_Action task and run it.
+
+    The template's static instructions form the prompt prefix; only the
+    tail (task, plan and approval paths) differs between tasks. Returns
+    Claude's output, or None if the call did not finish cleanly.
+    """
+    template = prompt_registry.get(template_name)
+    prompt = template.render(
+        task_file=task_file,
+        plan_file=PLANS_DIR / f"PLAN_{task_file.name}",
+        approval_file=PENDING_APPROVAL_DIR / f"{approval_prefix}{task_file.name}",
+        task_name=task_file.name,
+    )
+    return _invoke_claude_reasoning(task_file, prompt, prompt_id=template.id)
+
+
+def _trigger_claude_reasoning(task_file: Path) -> str | None:
     """
     Invoke Claude Code CLI to reason about an email task file.
 
@@ -595,62 +741,10 @@ def _trigger_claude_reasoning(task_file: Path):
     - Creating an approval file in /Pending_Approval that contains:
       the original email, all metadata, AND the drafted reply
     """
-    prompt = f"""You are an AI Email Assistant. You must read an email and draft a reply.
-
-STEP 1: Read the email task file at this exact path:
-  {task_file}
-
-STEP 2: Create a plan file at this exact path:
-  {PLANS_DIR / ('PLAN_' + task_file.name)}
-
-The plan file should contain:
-- Summary of the email
-- What action is needed (reply, forward, archive, etc.)
-- Your reasoning for the drafted reply
-
-STEP 3: Create an approval file at this exact path:
-  {PENDING_APPROVAL_DIR / ('REPLY_' + task_file.name)}
-
-The approval file MUST use this EXACT format (including the YAML frontmatter between --- delimiters):
-
----
-type: email_action
-action: send_reply
-to: "<extract the sender's email address from the email>"
-sender_name: "<extract the sender's display name>"
-subject: "Re: <original subject>"
-in_reply_to: "<the gmail message_id from the email>"
-original_date: "<date from the original email>"
-status: pending_approval
-source_task: "{task_file.name}"
----
-
-# Original Email
-
-**From:** <sender>
-**Subject:** <subject>
-**Date:** <date>
-**Gmail ID:** <message_id>
-
-<paste the full original email content here>
-
-# Proposed Reply
+    return _reason_with_template("email", task_file, "REPLY_")
 
-<Write your professional, helpful reply here. This is the ONLY section that will be sent as the email body. Do NOT include greetings like "Dear..." unless appropriate. Write naturally.>
 
-IMPORTANT RULES:
-- You MUST create both files (plan + approval) by writing them to disk.
-- The "# Proposed Reply" section is what gets sent as the actual email. Write it carefully.
-- Do NOT send any email yourself. Only create the files.
-- Do NOT modify or delete any existing files.
-- Extract the sender email address carefully from the "from" field in the task file.
-- If the email doesn't need a reply (e.g. it's a newsletter or notification), still create the plan file explaining why, but skip creating the approval file.
-"""
-
-    _invoke_claude_reasoning(task_file, prompt)
-
-
-def _trigger_claude_tweet_reasoning(task_file: Path):
+def _trigger_claude_tweet_reasoning(task_file: Path) -> str | None:
     """
     Invoke Claude Code CLI to reason about a tweet task file.
 
@@ -660,79 +754,10 @@ def _trigger_claude_tweet_reasoning(task_file: Path):
     - Creating a plan file in /Plans
     - Creating an approval file in /Pending_Approval with proposed actions
     """
-    prompt = f"""You are an AI Twitter/X Engagement Assistant for @arahmanmoin1, a software engineer
-focused on coding, AI, web development, and personal brand building.
-
-STEP 1: Read the tweet task file at this exact path:
-  {task_file}
-
-STEP 2: Analyze the tweet and decide which engagement actions are appropriate.
-Consider:
-- Is this tweet relevant to our brand (coding, AI, web dev, agentic systems)?
-- Is the author someone worth engaging with?
-- Would replying add value to the conversation?
-- Is the tone appropriate for professional engagement?
-
-Possible actions (pick one or more, or "ignore"):
-- "like" — Show appreciation (use for relevant, positive tweets)
-- "retweet" — Amplify (use sparingly, only for highly relevant content)
-- "reply" — Engage in conversation (primary value action)
-- "ignore" — Skip engagement (spam, irrelevant, or negative content)
-
-STEP 3: Create a plan file at this exact path:
-  {PLANS_DIR / ('PLAN_' + task_file.name)}
-
-The plan file should contain:
-- Summary of the tweet
-- Why you chose these actions
-- Your reasoning for the reply content (if replying)
-
-STEP 4: Create an approval file at this exact path:
-  {PENDING_APPROVAL_DIR / ('ACTION_TWEET_' + task_file.name)}
-
-The approval file MUST use this EXACT format:
-
----
-type: tweet_action
-actions: ["list", "of", "actions"]
-tweet_id: "<tweet_id from the task file>"
-author_username: "<author_username from the task file>"
-conversation_id: "<conversation_id from the task file>"
-source_task: "{task_file.name}"
-status: pending_approval
----
-
-# Original Tweet
-
-**Author:** @<username> (<display name>)
-**Tweet ID:** <id>
-**Type:** <mention/reply/quote_tweet/keyword_match>
-**Created:** <timestamp>
-
-<paste the full tweet content here>
-
-# Proposed Actions
-
-## Action 1: <action type>
-<For "reply" actions, write the full reply text here. Keep it professional, friendly,
-authentic, and concise (under 280 characters). Match the energy of the original tweet.
-For "like" or "retweet", just note "Will like/retweet this tweet.">
-
-IMPORTANT RULES:
-- You MUST create both files (plan + approval) by writing them to disk.
-- For replies, write naturally as @arahmanmoin1. Be helpful, technical when appropriate,
-  and genuinely engaged. No corporate-speak.
-- Do NOT post any tweets yourself. Only create the files.
-- Do NOT modify or delete any existing files.
-- If the tweet is spam, irrelevant, or negative, create the plan file explaining why
-  you're ignoring it, but skip creating the approval file.
-- Keep replies under 280 characters.
-"""
+    return _reason_with_template("tweet", task_file, "ACTION_TWEET_")
 
-    _invoke_claude_reasoning(task_file, prompt)
 
-
-def _trigger_claude_linkedin_reasoning(task_file: Path):
+def _trigger_claude_linkedin_reasoning(task_file: Path) -> str | None:
     """
     Invoke Claude Code CLI to reason about a LinkedIn post task file.
 
@@ -742,78 +767,10 @@ def _trigger_claude_linkedin_reasoning(task_file: Path):
     - Creating a plan file in /Plans
     - Creating an approval file in /Pending_Approval with proposed actions
     """
-    prompt = f"""You are an AI LinkedIn Engagement Assistant for the user with LinkedIn username 'arm-test',
-a software engineer focused on coding, AI, web development, and personal brand building.
-
-STEP 1: Read the LinkedIn post task file at this exact path:
-  {task_file}
-
-STEP 2: Analyze the post and decide which engagement actions are appropriate.
-Consider:
-- Is this post relevant to our brand (coding, AI, web dev, agentic systems, tech)?
-- Is the author someone worth engaging with professionally?
-- Would commenting add genuine value to the conversation?
-- Is the tone appropriate for professional engagement on LinkedIn?
-
-Possible actions (pick one or more, or "ignore"):
-- "like" — Show appreciation (use for relevant, positive posts)
-- "comment" — Engage in conversation (primary value action)
-- "ignore" — Skip engagement (spam, irrelevant, or off-topic content)
-
-STEP 3: Create a plan file at this exact path:
-  {PLANS_DIR / ('PLAN_' + task_file.name)}
-
-The plan file should contain:
-- Summary of the post
-- Why you chose these actions
-- Your reasoning for the comment content (if commenting)
-
-STEP 4: Create an approval file at this exact path:
-  {PENDING_APPROVAL_DIR / ('ACTION_LINKEDIN_' + task_file.name)}
-
-The approval file MUST use this EXACT format:
-
----
-type: linkedin_action
-actions: ["list", "of", "actions"]
-post_id: "<post_id from the task file>"
-post_urn: "<post_urn from the task file>"
-author_username: "<author_username from the task file>"
-source_task: "{task_file.name}"
-status: pending_approval
----
-
-# Original LinkedIn Post
-
-**Author:** <author name> (@<username>)
-**Post ID:** <id>
-**URN:** <urn>
-**Created:** <timestamp>
-
-<paste the full post content here>
-
-# Proposed Actions
-
-## Action 1: <action type>
-<For "comment" actions, write the full comment text here. Keep it professional, insightful,
-and concise (under 1000 characters). Match the tone of LinkedIn — be genuinely helpful
-and add value to the conversation.
-For "like", just note "Will like this post.">
-
-IMPORTANT RULES:
-- You MUST create both files (plan + approval) by writing them to disk.
-- For comments, write naturally and professionally. Be helpful and technically engaged
-  where appropriate. No generic platitudes or corporate-speak.
-- Do NOT post any content yourself. Only create the files.
-- Do NOT modify or delete any existing files.
-- If the post is spam, irrelevant, or off-topic, create the plan file explaining why
-  you're ignoring it, but skip creating the approval file.
-"""
-
-    _invoke_claude_reasoning(task_file, prompt)
+    return _reason_with_template("linkedin_post", task_file, "ACTION_LINKEDIN_")
 
 
-def _trigger_claude_odoo_reasoning(task_file: Path):
+def _trigger_claude_odoo_reasoning(task_file: Path) -> str | None:
     """
     Invoke Claude Code CLI to reason about an Odoo event task file.
 
@@ -823,193 +780,21 @@ def _trigger_claude_odoo_reasoning(task_file: Path):
     - Creating a plan file in /Plans
     - Creating an approval file in /Pending_Approval with suggested next steps
     """
-    prompt = f"""You are an AI Business Operations Assistant monitoring Odoo (ERP system) for the user.
-
-STEP 1: Read the Odoo event task file at this exact path:
-  {task_file}
-
-STEP 2: Analyze the event and determine what action or follow-up is recommended.
-Consider:
-- What changed? (new record, state change, payment status change, overdue?)
-- How urgent is this? (overdue invoice > new order > routine state change)
-- Is any immediate follow-up required? (send reminder, confirm order, escalate?)
-- What is the business impact? (large amount, key customer, blocked workflow?)
-
-STEP 3: Create a plan file at this exact path:
-  {PLANS_DIR / ('PLAN_' + task_file.name)}
-
-The plan file should contain:
-- What happened and why it matters
-- Urgency assessment (high / medium / low)
-- Recommended action and reasoning
-
-STEP 4: Create an approval file at this exact path:
-  {PENDING_APPROVAL_DIR / ('ACTION_ODOO_' + task_file.name)}
-
-The approval file MUST use this EXACT format:
-
----
-type: odoo_action
-odoo_model: "<odoo_model from the task file>"
-record_id: "<record_id from the task file>"
-record_name: "<record_name from the task file>"
-event_type: "<event_type from the task file>"
-urgency: "<high|medium|low>"
-source_task: "{task_file.name}"
-status: pending_approval
----
-
-# Odoo Event: <event_type> — <record_name>
-
-## Summary
-<1-2 sentence summary of what happened>
-
-## Urgency: <HIGH / MEDIUM / LOW>
-<Brief reason for the urgency level>
-
-## Recommended Actions
-<List of specific actions for the human to take in Odoo or externally.
-Be concrete and actionable. Example:
-- Send payment reminder email to [Customer Name]
-- Register payment in Odoo: Accounting > Customers > Invoices > [INV-XXXX] > Register Payment
-- Confirm the sales order and schedule delivery
-- Escalate to manager: amount exceeds threshold>
-
-## Context
-<Any additional context, risks, or notes the human should know>
-
-IMPORTANT RULES:
-- You MUST create both files (plan + approval) by writing them to disk.
-- Be specific and actionable. Name the exact record, customer, and amounts.
-- Do NOT modify Odoo or send any emails yourself. Only create the files.
-- Do NOT modify or delete any existing files.
-- If the event is routine and requires no action (e.g. minor internal state change),
-  create the plan file explaining why, but skip creating the approval file.
-"""
-
-    _invoke_claude_reasoning(task_file, prompt)
+    return _reason_with_template("odoo_event", task_file, "ACTION_ODOO_")
 
 
-def _trigger_claude_instagram_reasoning(task_file: Path):
+def _trigger_claude_instagram_reasoning(task_file: Path) -> str | None:
     """
     Invoke Claude Code CLI to reason about an Instagram DM and draft a reply.
     """
-    prompt = f"""You are an AI Instagram DM Assistant managing direct messages for the user.
-
-STEP 1: Read the Instagram DM task file at this exact path:
-  {task_file}
-
-STEP 2: Analyze the message and decide whether a reply is appropriate.
-Consider:
-- Is this a genuine message from a real person (not spam/bot)?
-- What is the sender asking or saying?
-- What tone is appropriate? (friendly, professional, helpful)
-- Does this require a response at all?
-
-STEP 3: Create a plan file at this exact path:
-  {PLANS_DIR / ('PLAN_' + task_file.name)}
-
-The plan file should contain:
-- Summary of the message
-- Your reasoning for the reply approach
-- Why you chose to reply or ignore
-
-STEP 4: If a reply is appropriate, create an approval file at this exact path:
-  {PENDING_APPROVAL_DIR / ('ACTION_INSTAGRAM_' + task_file.name)}
-
-The approval file MUST use this EXACT format:
-
----
-type: instagram_action
-action: reply
-thread_id: "<thread_id from the task file>"
-sender: "<sender from the task file>"
-source_task: "{task_file.name}"
-status: pending_approval
----
-
-# Instagram DM Reply — <sender>
-
-## Original Message
-<paste the full message content here>
-
-## Proposed Reply
-
-## Action 1: Reply
-<Write the full reply text here. Keep it natural, conversational, and genuine.
-Match the tone of the original message. Be concise — Instagram DMs are casual.
-Do NOT use corporate language or generic filler phrases.>
-
-IMPORTANT RULES:
-- You MUST create both files (plan + approval) by writing them to disk.
-- Write naturally as if you are the account owner.
-- Do NOT send any message yourself. Only create the files.
-- Do NOT modify or delete any existing files.
-- If the message is spam, a bot, or clearly doesn't need a reply, create only
-  the plan file explaining why — skip creating the approval file.
-"""
-    _invoke_claude_reasoning(task_file, prompt)
+    return _reason_with_template("instagram_dm", task_file, "ACTION_INSTAGRAM_")
 
 
-def _trigger_claude_facebook_reasoning(task_file: Path):
+def _trigger_claude_facebook_reasoning(task_file: Path) -> str | None:
     """
     Invoke Claude Code CLI to reason about a Facebook DM and draft a reply.
     """
-    prompt = f"""You are an AI Facebook Messenger Assistant managing direct messages for the user.
-
-STEP 1: Read the Facebook DM task file at this exact path:
-  {task_file}
-
-STEP 2: Analyze the message and decide whether a reply is appropriate.
-Consider:
-- Is this a genuine message from a real person (not spam/bot)?
-- What is the sender asking or saying?
-- What tone is appropriate? (friendly, professional, helpful)
-- Does this require a response at all?
-
-STEP 3: Create a plan file at this exact path:
-  {PLANS_DIR / ('PLAN_' + task_file.name)}
-
-The plan file should contain:
-- Summary of the message
-- Your reasoning for the reply approach
-- Why you chose to reply or ignore
-
-STEP 4: If a reply is appropriate, create an approval file at this exact path:
-  {PENDING_APPROVAL_DIR / ('ACTION_FACEBOOK_' + task_file.name)}
-
-The approval file MUST use this EXACT format:
-
----
-type: facebook_action
-action: reply
-thread_id: "<thread_id from the task file>"
-sender: "<sender from the task file>"
-source_task: "{task_file.name}"
-status: pending_approval
----
-
-# Facebook DM Reply — <sender>
-
-## Original Message
-<paste the full message content here>
-
-## Proposed Reply
-
-## Action 1: Reply
-<Write the full reply text here. Keep it natural, conversational, and genuine.
-Match the tone of the original message. Be concise — Messenger DMs are casual.
-Do NOT use corporate language or generic filler phrases.>
-
-IMPORTANT RULES:
-- You MUST create both files (plan + approval) by writing them to disk.
-- Write naturally as if you are the account owner.
-- Do NOT send any message yourself. Only create the files.
-- Do NOT modify or delete any existing files.
-- If the message is spam, a bot, or clearly doesn't need a reply, create only
-  the plan file explaining why — skip creating the approval file.
-"""
-    _invoke_claude_reasoning(task_file, prompt)
+    return _reason_with_template("facebook_dm", task_file, "ACTION_FACEBOOK_")
 
 
 def _trigger_claude_facebook_post_draft():
@@ -1022,43 +807,11 @@ def _trigger_claude_facebook_post_draft():
     approval_filename = f"ACTION_FACEBOOK_POST_{timestamp}.md"
     approval_path = PENDING_APPROVAL_DIR / approval_filename
 
-    prompt = f"""You are an AI Facebook Content Creator for the user, a software engineer
-focused on coding, AI, web development, and agentic systems.
-
-Your task is to draft ONE original Facebook post for human review and approval.
-This post will be reviewed before being published — do NOT publish anything yourself.
-
-Create an approval file at this exact path:
-  {approval_path}
-
-The approval file MUST use this EXACT format (including the YAML frontmatter):
-
----
-type: facebook_post_action
-source_task: "scheduled_post"
-status: pending_approval
----
-
-# Proposed Facebook Post
-
-<Write an engaging Facebook post here. The post should:
-- Be conversational and relatable — Facebook is more personal than LinkedIn
-- Be about a relevant topic: AI, coding, developer life, tech tips, personal stories
-- Be 100-250 words
-- Share genuine insight, a practical tip, or a short story
-- End with a question to encourage comments
-- Use short paragraphs — no markdown headers or bullet points
-- Feel authentic and personal>
-
-IMPORTANT RULES:
-- Create ONLY this one file — nothing else.
-- Do NOT read any other files.
-- Do NOT post or send anything.
-- Write the post content directly after the "# Proposed Facebook Post" heading.
-"""
+    template = prompt_registry.get("facebook_post_draft")
+    prompt = template.render(approval_file=approval_path)
 
     logger.info("Drafting scheduled Facebook post → %s", approval_filename)
-    _invoke_claude_reasoning(approval_path, prompt)
+    _invoke_claude_reasoning(approval_path, prompt, task_type="facebook_post_draft", prompt_id=template.id)
 
 
 def _trigger_claude_linkedin_post_draft():
@@ -1071,45 +824,12 @@ def _trigger_claude_linkedin_post_draft():
     approval_filename = f"ACTION_LINKEDIN_POST_{timestamp}.md"
     approval_path = PENDING_APPROVAL_DIR / approval_filename
 
-    prompt = f"""You are an AI LinkedIn Content Creator for the user 'arm-test', a software engineer
-focused on coding, AI, web development, and agentic systems.
-
-Your task is to draft ONE original LinkedIn post for human review and approval.
-This post will be reviewed before being published — do NOT publish anything yourself.
-
-Create an approval file at this exact path:
-  {approval_path}
-
-The approval file MUST use this EXACT format (including the YAML frontmatter):
-
----
-type: linkedin_post_action
-source_task: "scheduled_post"
-status: pending_approval
----
-
-# Proposed LinkedIn Post
-
-<Write a professional, engaging LinkedIn post here. The post should:
-- Open with a compelling hook (first line is critical on LinkedIn)
-- Be about a relevant tech topic: AI agents, coding, web dev, developer tools,
-  agentic systems, Python, productivity, or personal brand building
-- Be 150-300 words
-- Share genuine insight, a practical tip, or a lesson learned
-- End with a question or call to action to encourage engagement
-- Use LinkedIn formatting: short paragraphs, line breaks — no markdown headers
-- Feel authentic and personal, not corporate or generic>
-
-IMPORTANT RULES:
-- Create ONLY this one file — nothing else.
-- Do NOT read any other files.
-- Do NOT post or send anything.
-- Write the post content directly after the "# Proposed LinkedIn Post" heading.
-"""
+    template = prompt_registry.get("linkedin_post_draft")
+    prompt = template.render(approval_file=approval_path)
 
     logger.info("Drafting scheduled LinkedIn post → %s", approval_filename)
     # Re-use _invoke_claude_reasoning with the approval path as the task identifier
-    _invoke_claude_reasoning(approval_path, prompt)
+    _invoke_claude_reasoning(approval_path, prompt, task_type="linkedin_post_draft", prompt_id=template.id)
 
 
 def _kill_process_tree(pid: int):
@@ -1128,22 +848,72 @@ def _kill_process_tree(pid: int):
         logger.warning("Failed to kill process tree for PID %d", pid, exc_info=True)
 
 
-def _invoke_claude_reasoning(task_file: Path, prompt: str):
+def _invoke_claude_reasoning(task_file: Path, prompt: str, allowed_tools: str = "Read,Write,Edit",
+                             task_type: str | None = None, prompt_id: str = "",
+                             disallowed_tools: str = "") -> str | None:
     """Common Claude Code CLI invocation for reasoning tasks.
 
+    The model comes from model_routing (task type plus complexity signals
+    read from task_file; task_type overrides the file's own type, e.g. for
+    post drafts whose file does not exist yet). Latency, tokens and outcome
+    are recorded per route, and the call's usage goes to usage_ledger tagged
+    with prompt_id (the prompt_registry template version) for cache-hit rates.
+
+    Returns Claude's final output text on success, None otherwise.
+    allowed_tools are pre-approved; an empty value only drops that
+    pre-approval, the CLI's default tools stay available. disallowed_tools
+    removes tools from the session outright (structured output mode passes
+    STRUCTURED_DISALLOWED_TOOLS so Claude really runs without tools).
+    """
+    tier, model, reason = model_routing.route_file(task_file, task_type)
+    cli_args = ("--model", model) if model else ()
+    if allowed_tools:
+        cli_args += ("--allowedTools", allowed_tools)
+    if disallowed_tools:
+        cli_args += ("--disallowedTools", disallowed_tools)
+    logger.info("[ROUTE] %s → %s tier (%s; %s)", task_file.name, tier, model or "default model", reason)
+
+    start_time = time.time()
+    if REASONING_BACKEND == "session":
+        output, outcome, result = _invoke_claude_session(task_file, prompt, cli_args)
+    else:
+        output, outcome, result = _invoke_claude_subprocess(task_file, prompt, cli_args)
+
+    elapsed = time.time() - start_time
+    route_model = model or "default"
+    REASONING_ROUTE_SECONDS.observe(elapsed, tier=tier, model=route_model, outcome=outcome)
+    for kind, count in model_routing.usage_tokens(result).items():
+        REASONING_ROUTE_TOKENS.inc(count, tier=tier, model=route_model, kind=kind)
+    if not task_type:
+        task_type = _parse_frontmatter(task_file).get("type", "email") if task_file.exists() else "unknown"
+    usage_ledger.record(
+        "reasoning", task_type, task_file.name, result,
+        model=route_model, backend=REASONING_BACKEND, outcome=outcome, duration=elapsed,
+        prompt_version=prompt_id,
+    )
+    return output
+
+
+def _invoke_claude_subprocess(task_file: Path, prompt: str, cli_args: tuple) -> tuple[str | None, str, dict]:
+    """One `claude -p --output-format stream-json` process per prompt.
+
     Uses Popen + manual timeout instead of subprocess.run(timeout=) because
     the latter does not reliably kill the process tree on Windows, causing
     the orchestrator to hang indefinitely.
-    """
 
+    Returns (output text or None, outcome, result event).
+    """
     logger.info("[START] Claude Code reasoning for: %s", task_file.name)
     start_time = time.time()
     timeout_secs = 120
 
     proc = None
+    outcome = "error"
+    output = None
+    result = {}
     try:
         proc = subprocess.Popen(
-            [CLAUDE_CMD, "-p", "--allowedTools", "Read,Write,Edit"],
+            _claude_command("-p", *claude_session.STREAM_OUTPUT_ARGS, *cli_args),
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -1152,22 +922,27 @@ def _invoke_claude_reasoning(task_file: Path, prompt: str):
         )
         stdout, stderr = proc.communicate(input=prompt, timeout=timeout_secs)
         elapsed = int(time.time() - start_time)
+        # No result event: a CLI without stream-json output printed plain text
+        result = claude_session.parse_stream(stdout or "") or {"result": stdout}
 
-        if proc.returncode == 0:
+        if proc.returncode == 0 and not result.get("is_error"):
+            outcome = "ok"
             logger.info(
                 "[DONE] Claude Code finished %s in %ds", task_file.name, elapsed
             )
+            output = str(result.get("result") or "")
             audit_path = LOG_DIR / f"claude_output_{task_file.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-            audit_path.write_text(stdout or "", encoding="utf-8")
+            audit_path.write_text(output, encoding="utf-8")
         else:
             logger.error(
                 "[FAIL] Claude Code failed for %s (exit=%d, %ds): %s",
                 task_file.name,
                 proc.returncode,
                 elapsed,
-                stderr[:500],
+                (stderr or str(result.get("result", "")))[:500],
             )
     except subprocess.TimeoutExpired:
+        outcome = "timeout"
         elapsed = int(time.time() - start_time)
         logger.error("[TIMEOUT] Claude Code timed out for %s after %ds — killing process tree", task_file.name, elapsed)
         if proc:
@@ -1182,6 +957,100 @@ def _invoke_claude_reasoning(task_file: Path, prompt: str):
             "Install it or update CLAUDE_CMD.",
             CLAUDE_CMD,
         )
+    finally:
+        CLAUDE_SECONDS.observe(time.time() - start_time, purpose="reasoning", outcome=outcome)
+    return output, outcome, result
+
+
+def _invoke_claude_session(task_file: Path, prompt: str, cli_args: tuple = ()) -> tuple[str | None, str, dict]:
+    """Run a reasoning prompt as one turn on a persistent Claude worker.
+
+    Same contract as the subprocess path: the turn's result text is kept
+    as the audit log, and a timed-out or crashed worker is killed and
+    restarted on its next turn. Each distinct cli_args (model, tools) gets
+    its own pool.
+    """
+    logger.info("[START] Claude session reasoning for: %s", task_file.name)
+    start_time = time.time()
+    timeout_secs = 120
+    outcome = "error"
+    output = None
+    result = {}
+    try:
+        pool = claude_session.get_pool(
+            _claude_command(*cli_args),
+            ORCHESTRATOR_WORKSPACE_DIR,
+            CLAUDE_WORKERS,
+        )
+        result = pool.run(prompt, timeout_secs)
+        elapsed = int(time.time() - start_time)
+        if result.get("is_error"):
+            logger.error(
+                "[FAIL] Claude session failed for %s (%s, %ds): %s",
+                task_file.name, result.get("subtype", "error"), elapsed, str(result.get("result", ""))[:500],
+            )
+        else:
+            outcome = "ok"
+            logger.info("[DONE] Claude session finished %s in %ds", task_file.name, elapsed)
+            audit_path = LOG_DIR / f"claude_output_{task_file.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+            audit_path.write_text(str(result.get("result") or ""), encoding="utf-8")
+            output = str(result.get("result") or "")
+    except TimeoutError:
+        outcome = "timeout"
+        logger.error(
+            "[TIMEOUT] Claude session timed out for %s after %ds — worker recycled",
+            task_file.name, int(time.time() - start_time),
+        )
+    except claude_session.SessionError as exc:
+        logger.error("[FAIL] Claude session crashed on %s — worker recycled: %s", task_file.name, exc)
+    except FileNotFoundError:
+        logger.error(
+            "Claude Code CLI ('%s') not found on PATH. "
+            "Install it or update CLAUDE_CMD.",
+            CLAUDE_CMD,
+        )
+    finally:
+        CLAUDE_SECONDS.observe(time.time() - start_time, purpose="reasoning", outcome=outcome)
+    return output, outcome, result
+
+
+def _reason_structured(task_file: Path, meta: dict, task_type: str) -> str:
+    """Reason about a task in JSON mode and write the plan/approval files ourselves.
+
+    The task is inlined into the prompt and every tool is denied on the
+    command line (STRUCTURED_DISALLOWED_TOOLS), not just by the prompt. An
+    answer that fails validation gets one repair round with the problems
+    listed; if that fails too, no files are written and the error is raised
+    so the caller counts the task as failed. Returns the accepted answer.
+    """
+    task_text = task_file.read_text(encoding="utf-8")
+    prompt, prompt_id = structured_reasoning.build_prompt(task_type, task_file, task_text)
+    answer = _invoke_claude_reasoning(
+        task_file, prompt, allowed_tools="", prompt_id=prompt_id,
+        disallowed_tools=STRUCTURED_DISALLOWED_TOOLS,
+    )
+    if answer is None:
+        raise RuntimeError(f"Claude produced no answer for {task_file.name}")
+    try:
+        result = structured_reasoning.validate(task_type, structured_reasoning.parse_result(answer))
+    except structured_reasoning.StructuredOutputError as exc:
+        logger.warning("Invalid structured answer for %s (%s) — asking for a repair", task_file.name, exc)
+        answer = _invoke_claude_reasoning(
+            task_file, structured_reasoning.repair_prompt(prompt, answer, exc.errors), allowed_tools="",
+            prompt_id=prompt_id, disallowed_tools=STRUCTURED_DISALLOWED_TOOLS,
+        )
+        if answer is None:
+            raise RuntimeError(f"Claude produced no repair answer for {task_file.name}")
+        result = structured_reasoning.validate(task_type, structured_reasoning.parse_result(answer))
+
+    approval = structured_reasoning.write_outputs(
+        task_type, task_file, meta, task_text, result, PLANS_DIR, PENDING_APPROVAL_DIR,
+    )
+    logger.info(
+        "Structured result for %s: %s%s", task_file.name, result["decision"],
+        f" → {approval.name}" if approval else "",
+    )
+    return answer
 
 
 # ---------------------------------------------------------------------------
@@ -1239,9 +1108,12 @@ RULES:
     logger.info("Invoking Claude Code + Gmail MCP to send email to %s", to)
 
     proc = None
+    outcome = "error"
+    result = None
+    start_time = time.time()
     try:
         proc = subprocess.Popen(
-            [CLAUDE_CMD, "-p", "--allowedTools", "mcp__gmail__send_email"],
+            _claude_command("-p", *claude_session.STREAM_OUTPUT_ARGS, "--allowedTools", "mcp__gmail__send_email"),
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -1249,6 +1121,7 @@ RULES:
             cwd=str(ORCHESTRATOR_WORKSPACE_DIR),
         )
         stdout, stderr = proc.communicate(input=send_prompt, timeout=120)
+        result = claude_session.parse_stream(stdout or "")
 
         # Log Claude's output for audit
         audit_path = LOG_DIR / f"mcp_send_{approved_file.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
@@ -1258,7 +1131,8 @@ RULES:
             encoding="utf-8",
         )
 
-        if proc.returncode == 0:
+        if proc.returncode == 0 and not (result or {}).get("is_error"):
+            outcome = "ok"
             logger.info("Email sent successfully via MCP to %s (subject: %s)", to, subject)
             return True
         else:
@@ -1271,6 +1145,7 @@ RULES:
             return False
 
     except subprocess.TimeoutExpired:
+        outcome = "timeout"
         logger.error("Claude Code MCP send timed out for: %s — killing process tree", approved_file.name)
         if proc:
             _kill_process_tree(proc.pid)
@@ -1282,6 +1157,12 @@ RULES:
     except FileNotFoundError:
         logger.error("Claude Code CLI ('%s') not found on PATH.", CLAUDE_CMD)
         return False
+    finally:
+        CLAUDE_SECONDS.observe(time.time() - start_time, purpose="send_email", outcome=outcome)
+        usage_ledger.record(
+            "send_email", "email_action", approved_file.name, result,
+            backend="subprocess", outcome=outcome, duration=time.time() - start_time,
+        )
 
 
 def _execute_tweet_actions(approved_file: Path, meta: dict) -> bool:
@@ -1695,6 +1576,15 @@ def _execute_approved_action(approved_file: Path):
 
     success = False
 
+    # Trace context lives on the source task (Claude may not copy it across)
+    source_task = meta.get("source_task", "")
+    task_meta = {}
+    if source_task and (NEEDS_ACTION_DIR / source_task).exists():
+        task_meta = _parse_frontmatter(NEEDS_ACTION_DIR / source_task)
+    trace_id = meta.get("trace_id") or task_meta.get("trace_id")
+    approved_at = approved_file.stat().st_mtime  # when the approval file was written
+    action_started = time.time()
+
     if action_type == "email_action" and action in ("send_reply", "send_email"):
         success = _execute_send_email(approved_file, meta)
     elif action_type == "tweet_action":
@@ -1786,12 +1676,23 @@ def _execute_approved_action(approved_file: Path):
     # Move to Done/ with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     status = "completed" if success else "failed"
+    platform = ACTION_PLATFORMS.get(action_type, "unknown")
+    APPROVALS_EXECUTED.inc(platform=platform, outcome=status)
+    if platform in BROWSER_PLATFORMS:
+        BROWSER_ACTION_SECONDS.observe(time.time() - action_started, platform=platform)
+    finished = time.time()
+    task_name = source_task or approved_file.name
+    tracing.record_span(trace_id, "approval_wait", approved_at, action_started, platform, task_name)
+    tracing.record_span(
+        trace_id, "execution", action_started, finished, platform, task_name,
+        action_type=action_type, success=success,
+    )
+    tracing.record_span(trace_id, "end_to_end", tracing.traced_at(task_meta), finished, platform, task_name)
     dest = DONE_DIR / f"{status}_{timestamp}_{approved_file.name}"
     shutil.move(str(approved_file), str(dest))
     logger.info("Moved %s → %s", approved_file.name, dest.name)
 
     # Clean up the corresponding plan file and move original task to Done
-    source_task = meta.get("source_task", "")
     if source_task:
         plan_file = PLANS_DIR / f"PLAN_{source_task}"
         if plan_file.exists():
@@ -1845,6 +1746,40 @@ def _approved_priority(filename: str) -> int:
         return 7
 
 
+# ---------------------------------------------------------------------------
+# Local triage
+# ---------------------------------------------------------------------------
+
+def _triage_task(filepath: Path, meta: dict, task_type: str, trace_id: str | None,
+                 detected_at: float | None, platform: str) -> bool:
+    """Archive a task without reasoning if triage is confident it needs no action.
+
+    Returns True if the task was moved to Done/ (as triaged_*), so the caller
+    skips it. Any triage failure falls through to normal Claude reasoning.
+    """
+    started = time.time()
+    try:
+        decision, p_ignore, reason = triage.classify(filepath, meta)
+    except Exception:
+        logger.exception("Triage failed for %s — sending to Claude", filepath.name)
+        return False
+    finished = time.time()
+    tracing.record_span(trace_id, "triage", started, finished, platform, filepath.name, decision=decision)
+
+    if decision != "ignore":
+        return False
+    if TRIAGE_MODE == "shadow":
+        logger.info("[triage:shadow] Would archive %s (%s, p_ignore=%.3f)", filepath.name, reason, p_ignore)
+        return False
+
+    TASKS_TRIAGED.inc(type=task_type, reason=reason)
+    tracing.record_span(trace_id, "end_to_end", detected_at, finished, platform, filepath.name)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    shutil.move(str(filepath), str(DONE_DIR / f"triaged_{timestamp}_{filepath.name}"))
+    logger.info("[triage] Archived %s → Done/ (%s, p_ignore=%.3f)", filepath.name, reason, p_ignore)
+    return True
+
+
 # ---------------------------------------------------------------------------
 # Folder monitors
 # ---------------------------------------------------------------------------
@@ -1857,10 +1792,12 @@ def _scan_needs_action():
     Deduplication is handled by checking if an approval file already exists
     (in Pending_Approval/ or Approved/) — no separate state tracking needed.
 
+    - Tasks local triage is confident need no action → Done/ as triaged_*, no Claude call.
     - Promo/newsletter emails (no reply needed) → moved to Done/ immediately.
     - Reply-worthy emails → stay in Needs_Action/ and Plans/ until approval cycle completes."""
     current_files = sorted(
-        (f.name for f in NEEDS_ACTION_DIR.iterdir() if f.is_file()),
+        # Dotfiles are in-progress writes (e.g. tracing.stamp's temp file)
+        (f.name for f in NEEDS_ACTION_DIR.iterdir() if f.is_file() and not f.name.startswith(".")),
         key=_task_priority,
     )
 
@@ -1869,10 +1806,12 @@ def _scan_needs_action():
 
     total = len(current_files)
     reasoning_count = 0
+    throttle_logged = False
 
     for idx, filename in enumerate(current_files, 1):
         if not _running:
             break
+        beat()  # one task can take a full Claude call; keep the supervisor informed
 
         # Yield to approved-action processing after MAX_REASONING_PER_CYCLE Claude calls
         if reasoning_count >= MAX_REASONING_PER_CYCLE:
@@ -1909,6 +1848,15 @@ def _scan_needs_action():
         if (PENDING_APPROVAL_DIR / approval_name).exists() or (APPROVED_DIR / approval_name).exists():
             continue
 
+        # Low-priority tasks wait in Needs_Action/ once today's Claude budget is spent
+        throttle_reason = usage_ledger.throttled(task_type)
+        if throttle_reason:
+            if not throttle_logged:
+                logger.warning("Holding low-priority tasks until tomorrow: %s", throttle_reason)
+                throttle_logged = True
+            TASKS_THROTTLED.inc(type=task_type)
+            continue
+
         # Check for an orphaned plan: plan exists but no approval is in-flight.
         # This happens when:
         #   - Claude created a plan but decided no action was needed (and the task
@@ -1917,7 +1865,8 @@ def _scan_needs_action():
         #     the plan and task files.
         # Fix: delete the orphaned plan so the task gets re-reasoned this cycle.
         plan_name = f"PLAN_{filename}"
-        if (PLANS_DIR / plan_name).exists():
+        orphaned = (PLANS_DIR / plan_name).exists()
+        if orphaned:
             logger.info(
                 "Orphaned plan detected for %s (plan exists but no approval in-flight) "
                 "— deleting plan and re-processing.",
@@ -1928,33 +1877,88 @@ def _scan_needs_action():
             except Exception:
                 logger.warning("Could not delete orphaned plan %s", plan_name, exc_info=True)
 
-        logger.info("[%d/%d] Processing %s task: %s", idx, total, task_type, filename)
+        platform = TASK_PLATFORMS.get(task_type, "email")
+        detected_at = tracing.traced_at(meta, filepath)
+        trace_id = meta.get("trace_id") or tracing.stamp(filepath)
+        tracing.record_span(trace_id, "queue", detected_at, time.time(), platform, filename)
 
+        # Cheap local classification first; archived tasks don't count toward the batch
+        if TRIAGE_MODE != "off" and _triage_task(filepath, meta, task_type, trace_id, detected_at, platform):
+            continue
+
+        # Same content reasoned about before (re-fire, re-queue, re-detection): replay it.
+        # An orphaned plan may mean the human rejected that answer, so it is
+        # dropped from the cache and the task is reasoned afresh.
+        cache_key, cached = None, None
+        if reasoning_cache.REASONING_CACHE != "off":
+            cache_key = reasoning_cache.cache_key(task_type, filepath.read_text(encoding="utf-8"))
+            if orphaned:
+                reasoning_cache.forget(cache_key)
+                cache_key = None
+            else:
+                cached = reasoning_cache.lookup(cache_key)
+
+        logger.info(
+            "[%d/%d] Processing %s task: %s%s", idx, total, task_type, filename,
+            " (cached reasoning)" if cached else "",
+        )
+        route_tier = model_routing.route_file(filepath, task_type)[0]
+        reasoning_started = time.time()
+
+        reasoning_failed = False
+        output = None   # Claude's answer; None when the call timed out or failed
         try:
-            if task_type in ("tweet", "watchlist"):
-                _trigger_claude_tweet_reasoning(filepath)
+            if cached:
+                reasoning_cache.replay(cached, filename, trace_id, PLANS_DIR / plan_name, PENDING_APPROVAL_DIR / approval_name)
+            elif REASONING_OUTPUT_MODE == "json" and task_type in structured_reasoning.TYPE_SPECS:
+                output = _reason_structured(filepath, meta, task_type)
+            elif task_type in ("tweet", "watchlist"):
+                output = _trigger_claude_tweet_reasoning(filepath)
             elif task_type == "linkedin_post":
-                _trigger_claude_linkedin_reasoning(filepath)
+                output = _trigger_claude_linkedin_reasoning(filepath)
             elif task_type == "odoo_event":
-                _trigger_claude_odoo_reasoning(filepath)
+                output = _trigger_claude_odoo_reasoning(filepath)
             elif task_type == "instagram_dm":
-                _trigger_claude_instagram_reasoning(filepath)
+                output = _trigger_claude_instagram_reasoning(filepath)
             elif task_type == "facebook_dm":
-                _trigger_claude_facebook_reasoning(filepath)
+                output = _trigger_claude_facebook_reasoning(filepath)
             else:
-                _trigger_claude_reasoning(filepath)
+                output = _trigger_claude_reasoning(filepath)
         except Exception:
+            reasoning_failed = True
             logger.exception("[%d/%d] ERROR processing %s, skipping", idx, total, filename)
 
         reasoning_count += 1
 
         # Check if an approval file was created
         approval_file = PENDING_APPROVAL_DIR / approval_name
-        if approval_file.exists():
+        needs_approval = approval_file.exists()
+        if reasoning_failed:
+            result = "error"
+        else:
+            result = "approval" if needs_approval else "no_action"
+        if cached:
+            REASONING_CACHE_HITS.inc(type=task_type, result=result)
+        else:
+            TASKS_REASONED.inc(type=task_type, result=result)
+            TASKS_ROUTED.inc(tier=route_tier, type=task_type, result=result)
+            # Only a clean run is worth replaying: a timeout may have left just the plan
+            if cache_key and not reasoning_failed and output is not None:
+                reasoning_cache.store(
+                    cache_key, task_type, filename, trace_id, PLANS_DIR / plan_name, approval_file,
+                )
+        reasoning_finished = time.time()
+        tracing.record_span(
+            trace_id, "reasoning", reasoning_started, reasoning_finished, platform, filename,
+            result=result, cached=bool(cached),
+        )
+
+        if needs_approval:
             # Needs human approval: keep task and plan in place
             logger.info("[%d/%d] Approval file created — %s stays until approved", idx, total, filename)
         else:
             # No action needed (spam/irrelevant): move to Done/ immediately
+            tracing.record_span(trace_id, "end_to_end", detected_at, reasoning_finished, platform, filename)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             dest = DONE_DIR / f"processed_{timestamp}_{filename}"
             if filepath.exists():
@@ -1982,6 +1986,7 @@ def _scan_approved():
         key=_approved_priority,
     )
     for filename in current_files:
+        beat()  # each action may block for up to BROWSER_ACTION_TIMEOUT
         filepath = APPROVED_DIR / filename
         if not filepath.exists():
             continue  # already processed (e.g. by a concurrent instance)
@@ -1989,6 +1994,21 @@ def _scan_approved():
         _execute_approved_action(filepath)
 
 
+def _update_gauges():
+    """Refresh queue-depth and quota gauges once per cycle."""
+    for name, folder in (
+        ("Needs_Action", NEEDS_ACTION_DIR),
+        ("Plans", PLANS_DIR),
+        ("Pending_Approval", PENDING_APPROVAL_DIR),
+        ("Approved", APPROVED_DIR),
+    ):
+        QUEUE_DEPTH.set(sum(1 for f in folder.iterdir() if f.is_file()), folder=name)
+    QUOTA_REMAINING.set(_x_actions_remaining(), platform="x")
+    QUOTA_REMAINING.set(_linkedin_actions_remaining(), platform="linkedin")
+    QUOTA_REMAINING.set(_instagram_actions_remaining(), platform="instagram")
+    QUOTA_REMAINING.set(_facebook_actions_remaining(), platform="facebook")
+
+
 # ---------------------------------------------------------------------------
 # Main loop
 # ---------------------------------------------------------------------------
@@ -2022,6 +2042,20 @@ def main():
     logger.info("orchestrator.py starting — System Coordinator")
     logger.info("Vault: %s", VAULT_PATH)
     logger.info("Poll interval: %ds", POLL_INTERVAL)
+    logger.info("Reasoning backend: %s (output mode: %s)", REASONING_BACKEND, REASONING_OUTPUT_MODE)
+    logger.info(
+        "Daily Claude budget: %s tokens, $%.2f (low-priority types held once spent)",
+        f"{usage_ledger.DAILY_TOKEN_BUDGET:,}" if usage_ledger.DAILY_TOKEN_BUDGET else "unlimited",
+        usage_ledger.DAILY_COST_BUDGET,
+    )
+    logger.info(
+        "Model routing: %s (%s)", model_routing.MODEL_ROUTING,
+        ", ".join(f"{tier}={name or 'default'}" for tier, name in model_routing.TIER_MODELS.items()),
+    )
+    logger.info(
+        "Reasoning cache: %s (TTL %gh, max %d entries)", reasoning_cache.REASONING_CACHE,
+        reasoning_cache.TTL_HOURS, reasoning_cache.MAX_ENTRIES,
+    )
     logger.info("=" * 60)
 
     needs_count = len([f for f in NEEDS_ACTION_DIR.iterdir() if f.is_file()])
@@ -2032,20 +2066,27 @@ def main():
         approved_count,
     )
 
+    metrics.start_exporter()
+
     while _running:
+        beat()
         try:
             _scan_needs_action()
             _scan_approved()
             _schedule_linkedin_post_if_due()
             _schedule_facebook_post_if_due()
+            _update_gauges()
         except Exception:
             logger.exception("Error during orchestration cycle")
 
         for _ in range(POLL_INTERVAL):
             if not _running:
                 break
+            beat()
             time.sleep(1)
 
+    claude_session.shutdown()
+
     if lock_file and lock_file.exists():
         try:
             lock_file.unlink()
@@ -0,0 +1,188 @@
+"""
+prompt_registry.py - Versioned prompt templates with cache-friendly prefixes.
+
+Responsibility:
+- get(name): loads prompts/<name>.md. Everything above the %%TASK%% line
+  is the static part (persona, steps, output format, rules) and is sent
+  byte-for-byte identical for every task; the tail below it carries the
+  $placeholders (paths, task name, task content) and is sent last, so
+  consecutive calls share one long prefix the provider can serve from its
+  prompt cache
+- register(): the same for templates assembled in code
+  (structured_reasoning.py)
+- Versions: a template's version is the first 12 hex digits of the SHA-256
+  of its text; each version is archived in the usage ledger the first
+  time it is used, so any two versions can be diffed later
+- CLI: per-version cache-hit rates, template hashes, version diffs
+
+Boundary:
+- Rendering only: which template a task uses and the Claude call itself
+  stay in orchestrator.py
+- Cache-hit rate = cache-read tokens / all prompt tokens (fresh input +
+  cache reads + cache writes), from ledger rows tagged with the version
+
+Usage:
+    python prompt_registry.py list --days 7
+    python prompt_registry.py hash email
+    python prompt_registry.py diff email [OLD_VERSION [NEW_VERSION]]
+"""
+
+import argparse
+import difflib
+import hashlib
+import logging
+import re
+import string
+import sys
+import threading
+from pathlib import Path
+
+import usage_ledger
+
+logger = logging.getLogger("prompt_registry")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).resolve().parent
+PROMPTS_DIR = BASE_DIR / "prompts"
+SEPARATOR = "%%TASK%%"
+
+_PLACEHOLDER_RE = re.compile(r"\$(?:\w|\{)")
+
+
+# ---------------------------------------------------------------------------
+# Templates
+# ---------------------------------------------------------------------------
+
+class PromptTemplate:
+    def __init__(self, name: str, static: str, tail: str = ""):
+        if _PLACEHOLDER_RE.search(static):
+            raise ValueError(f"{name}: $placeholders must come after the {SEPARATOR} line")
+        self.name = name
+        self.static = static.rstrip("\n") + "\n\n"
+        self.tail = tail
+        self.text = f"{self.static}{SEPARATOR}\n{tail}" if tail else self.static
+        self.version = hashlib.sha256(self.text.encode("utf-8")).hexdigest()[:12]
+        self.id = f"{name}@{self.version}"
+
+    def render(self, **values) -> str:
+        """Static part followed by the tail with values substituted (missing values raise KeyError)."""
+        return self.static + string.Template(self.tail).substitute(
+            {key: str(value) for key, value in values.items()}
+        )
+
+
+_cache: dict[str, tuple[float, PromptTemplate]] = {}
+_archived: set[str] = set()
+_lock = threading.Lock()
+
+
+def parse(name: str, text: str) -> PromptTemplate:
+    static, sep, tail = text.partition(f"\n{SEPARATOR}\n")
+    if not sep:
+        static, tail = text, ""
+    return PromptTemplate(name, static, tail)
+
+
+def _archive(template: PromptTemplate):
+    if template.id in _archived:
+        return
+    usage_ledger.archive_prompt(template.id, template.name, template.version, template.text)
+    _archived.add(template.id)
+
+
+def get(name: str) -> PromptTemplate:
+    """Template prompts/<name>.md, re-read when the file changes."""
+    path = PROMPTS_DIR / f"{name}.md"
+    mtime = path.stat().st_mtime
+    with _lock:
+        cached = _cache.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        template = parse(name, path.read_text(encoding="utf-8"))
+        if cached and cached[1].version != template.version:
+            logger.info("Prompt template %s changed: %s → %s", name, cached[1].version, template.version)
+        _cache[name] = (mtime, template)
+        _archive(template)
+        return template
+
+
+def register(name: str, static: str, tail: str = "") -> PromptTemplate:
+    """Template built in code; archived like file templates."""
+    template = PromptTemplate(name, static, tail)
+    with _lock:
+        _archive(template)
+    return template
+
+
+# ---------------------------------------------------------------------------
+# Hashing and diffing
+# ---------------------------------------------------------------------------
+
+def names() -> list[str]:
+    return sorted(p.stem for p in PROMPTS_DIR.glob("*.md"))
+
+
+def diff(name: str, old: str | None = None, new: str | None = None) -> str:
+    """Unified diff between two archived versions (default: previous → current)."""
+    current = None
+    if (PROMPTS_DIR / f"{name}.md").exists():
+        template = get(name)
+        usage_ledger.archive_prompt(template.id, name, template.version, template.text)
+        current = template.version
+    history = usage_ledger.prompt_versions(name)     # oldest first
+    texts = {v["version"]: v["text"] for v in history}
+    new = new or current or (history[-1]["version"] if history else None)
+    if old is None:
+        older = [v["version"] for v in history if v["version"] != new]
+        old = older[-1] if older else None
+    if old is None or new is None:
+        return ""
+    for version in (old, new):
+        if version not in texts:
+            raise KeyError(f"{name}: unknown version {version}")
+    return "".join(difflib.unified_diff(
+        texts[old].splitlines(keepends=True),
+        texts[new].splitlines(keepends=True),
+        fromfile=f"{name}@{old}", tofile=f"{name}@{new}",
+    ))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Prompt template registry")
+    sub = parser.add_subparsers(dest="command", required=True)
+    lst = sub.add_parser("list", help="templates with per-version cache-hit rates")
+    lst.add_argument("--days", type=int, default=7)
+    hsh = sub.add_parser("hash", help="current version and static-prefix size of templates")
+    hsh.add_argument("names", nargs="*")
+    dff = sub.add_parser("diff", help="diff two archived versions of a template")
+    dff.add_argument("name")
+    dff.add_argument("old", nargs="?")
+    dff.add_argument("new", nargs="?")
+    args = parser.parse_args(argv)
+
+    if args.command == "hash":
+        for name in args.names or names():
+            template = get(name)
+            print(f"{template.id:<42} static {len(template.static):>6} chars  tail {len(template.tail):>5} chars")
+        return 0
+
+    if args.command == "diff":
+        print(diff(args.name, args.old, args.new) or "no differences")
+        return 0
+
+    current = {get(name).id for name in names()}
+    print(f"{'template version':<42} {'calls':>6} {'prompt tok':>11} {'cache rd':>10} {'cache wr':>10} {'hit rate':>9}")
+    for row in usage_ledger.prompt_stats(args.days):
+        marker = "*" if row["prompt_version"] in current else " "
+        print(f"{row['prompt_version']:<41}{marker} {row['calls']:>6} {row['prompt_tokens']:>11,} "
+              f"{row['cache_read']:>10,} {row['cache_write']:>10,} {row['hit_rate']:>8.1%}")
+    print(f"(last {args.days} days; * = current file version)")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+reasoning_cache.py - Replays earlier reasoning for tasks whose content was seen before.
+
+Responsibility:
+- cache_key(): SHA-256 of the task type and a normalised copy of the task
+  file. Per-delivery frontmatter (received_at, trace ids, status) is
+  dropped and whitespace collapsed, so the daily invoice_overdue re-fire,
+  a task re-queued after its orphaned plan was deleted and a tweet
+  re-detected after a processed-ID file loss all map to the same key
+- store(): keeps the plan and approval Claude wrote for a key, with the
+  task file name and trace id replaced by placeholders
+- replay(): writes them back for a new task file with its own name, trace
+  id and paths; no Claude call is made
+- Entries expire after TTL_HOURS; beyond MAX_ENTRIES the least recently
+  used are evicted; forget() drops an entry whose answer was rejected
+
+Boundary:
+- Stores only what reasoning produced (plan / approval text); the caller
+  decides which runs are worth storing (clean Claude runs only) and when an
+  entry must be forgotten (an orphaned plan after a rejection)
+- A cache failure never blocks reasoning: lookup misses and store is skipped
+
+Usage:
+    python reasoning_cache.py stats
+    python reasoning_cache.py clear
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+
+logger = logging.getLogger("reasoning_cache")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_PATH = BASE_DIR / "credentials" / ".reasoning_cache.db"
+
+REASONING_CACHE = os.environ.get("REASONING_CACHE", "on")
+TTL_HOURS = float(os.environ.get("REASONING_CACHE_TTL_HOURS", "168"))
+MAX_ENTRIES = int(os.environ.get("REASONING_CACHE_MAX_ENTRIES", "2000"))
+
+# Frontmatter keys that differ between deliveries of the same content
+VOLATILE_KEYS = {"received_at", "traced_at", "trace_id", "status"}
+
+TASK_NAME = "{{task_name}}"
+TASK_STEM = "{{task_stem}}"
+TRACE_ID = "{{trace_id}}"
+
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n?", re.DOTALL)
+_KEY_RE = re.compile(r"^(\w+)\s*:")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    task_type TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    approval TEXT,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=10)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# ---------------------------------------------------------------------------
+# Keys
+# ---------------------------------------------------------------------------
+
+def normalise(text: str) -> str:
+    """Task text without per-delivery frontmatter and with whitespace collapsed."""
+    match = _FRONTMATTER_RE.match(text)
+    header, body = (match.group(1), text[match.end():]) if match else ("", text)
+    kept = []
+    for line in header.splitlines():
+        key = _KEY_RE.match(line)
+        if key and key.group(1) in VOLATILE_KEYS:
+            continue
+        kept.append(" ".join(line.split()))
+    return "\n".join(kept) + "\n---\n" + " ".join(body.split())
+
+
+def cache_key(task_type: str, text: str) -> str:
+    return hashlib.sha256(f"{task_type}\n{normalise(text)}".encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Store / lookup / replay
+# ---------------------------------------------------------------------------
+
+def _template(text: str, task_name: str, trace_id: str | None) -> str:
+    text = text.replace(task_name, TASK_NAME).replace(Path(task_name).stem, TASK_STEM)
+    return text.replace(trace_id, TRACE_ID) if trace_id else text
+
+
+def _fill(text: str, task_name: str, trace_id: str | None) -> str:
+    text = text.replace(TASK_NAME, task_name).replace(TASK_STEM, Path(task_name).stem)
+    return text.replace(TRACE_ID, trace_id or "")
+
+
+def lookup(key: str) -> dict | None:
+    """Live entry for key ({"plan", "approval", "hits"}) or None."""
+    now = time.time()
+    try:
+        with closing(_connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT plan, approval, hits FROM entries WHERE key = ? AND created >= ?",
+                (key, now - TTL_HOURS * 3600),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+    except sqlite3.Error:
+        logger.warning("Reasoning cache lookup failed", exc_info=True)
+        return None
+    return {"plan": row[0], "approval": row[1], "hits": row[2] + 1}
+
+
+def store(key: str, task_type: str, task_name: str, trace_id: str | None,
+          plan_path: Path, approval_path: Path):
+    """Remember the plan (and approval, if any) reasoning just wrote for a task."""
+    try:
+        plan = plan_path.read_text(encoding="utf-8")
+        approval = approval_path.read_text(encoding="utf-8") if approval_path.exists() else None
+    except OSError:
+        return      # no plan written: nothing worth replaying
+    now = time.time()
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, task_type, plan, approval, created, last_used, hits)"
+                " VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, task_type, _template(plan, task_name, trace_id),
+                 _template(approval, task_name, trace_id) if approval is not None else None, now, now),
+            )
+            _evict(conn, now)
+    except sqlite3.Error:
+        logger.warning("Reasoning cache store failed for %s", task_name, exc_info=True)
+
+
+def forget(key: str):
+    """Drop an entry, e.g. when the answer it holds was rejected."""
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+    except sqlite3.Error:
+        logger.warning("Reasoning cache forget failed", exc_info=True)
+
+
+def _evict(conn: sqlite3.Connection, now: float):
+    conn.execute("DELETE FROM entries WHERE created < ?", (now - TTL_HOURS * 3600,))
+    conn.execute(
+        "DELETE FROM entries WHERE key NOT IN (SELECT key FROM entries ORDER BY last_used DESC LIMIT ?)",
+        (MAX_ENTRIES,),
+    )
+
+
+def replay(entry: dict, task_name: str, trace_id: str | None, plan_path: Path, approval_path: Path) -> bool:
+    """Write a cached plan/approval for a new task file; True if an approval was written."""
+    plan_path.write_text(_fill(entry["plan"], task_name, trace_id), encoding="utf-8")
+    if entry["approval"] is None:
+        return False
+    approval_path.write_text(_fill(entry["approval"], task_name, trace_id), encoding="utf-8")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Reasoning result cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="entries and hits per task type")
+    sub.add_parser("clear", help="drop every entry")
+    args = parser.parse_args(argv)
+
+    with closing(_connect()) as conn, conn:
+        if args.command == "clear":
+            removed = conn.execute("DELETE FROM entries").rowcount
+            print(f"removed {removed} entries")
+            return 0
+        rows = conn.execute(
+            "SELECT task_type, COUNT(*), SUM(hits), SUM(approval IS NOT NULL) FROM entries"
+            " GROUP BY task_type ORDER BY task_type"
+        ).fetchall()
+    print(f"{'type':<16} {'entries':>8} {'hits':>6} {'approvals':>10}")
+    for task_type, entries, hits, approvals in rows:
+        print(f"{task_type:<16} {entries:>8} {hits or 0:>6} {approvals or 0:>10}")
+    print(f"(TTL {TTL_HOURS:g}h, max {MAX_ENTRIES} entries)")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
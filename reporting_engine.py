@@ -12,10 +12,13 @@ import json
 import logging
 import os
 import re
+import time
 import xmlrpc.client
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from heartbeat import beat
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -236,6 +239,21 @@ def update_dashboard(financials, activity):
 
 REPORT_INTERVAL = 3600  # 1 Hour
 
+def run_cycle():
+    """Collect data, write one report and refresh the Dashboard metrics."""
+    logger.info("Starting reporting cycle...")
+
+    # 1. Collect Data
+    odoo = OdooReporter(ODOO_CONFIG_PATH)
+    financials = odoo.get_financial_summary()
+    activity = get_activity_stats()
+
+    # 2. Generate Report
+    generate_report(financials, activity)
+
+    # 3. Update Dashboard
+    update_dashboard(financials, activity)
+
 def main():
     logger.info("=" * 60)
     logger.info("reporting_engine.py starting — Business Reporting & Analytics")
@@ -243,26 +261,17 @@ def main():
     logger.info("=" * 60)
     
     while True:
+        beat()
         try:
-            logger.info("Starting reporting cycle...")
-            
-            # 1. Collect Data
-            odoo = OdooReporter(ODOO_CONFIG_PATH)
-            financials = odoo.get_financial_summary()
-            activity = get_activity_stats()
-            
-            # 2. Generate Report
-            generate_report(financials, activity)
-            
-            # 3. Update Dashboard
-            update_dashboard(financials, activity)
-            
+            run_cycle()
             logger.info(f"Reporting cycle complete. Sleeping for {REPORT_INTERVAL}s...")
         except Exception as e:
             logger.error(f"Error in reporting loop: {e}")
         
-        time.sleep(REPORT_INTERVAL)
+        # Sleep in short increments so the supervisor keeps seeing heartbeats
+        for _ in range(REPORT_INTERVAL):
+            beat()
+            time.sleep(1)
 
 if __name__ == "__main__":
-    import time
     main()
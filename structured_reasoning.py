@@ -0,0 +1,437 @@
+"""
+structured_reasoning.py - JSON-result reasoning; the orchestrator writes the files.
+
+Responsibility:
+- build_prompt(): one self-contained prompt per task with the task file
+  inlined last, after the type's fixed instructions (a prompt_registry
+  template, so the prefix is shared across tasks), asking for a single JSON object (decision, summary, reasoning,
+  actions, reply/comment text, Odoo urgency and recommendations) — no
+  tool calls needed
+- parse_result() / validate(): extract the JSON from the CLI output and
+  check it against the task type's rules (allowed actions, required text,
+  length limits); repair_prompt() asks once more with the errors listed
+- render_plan() / render_approval(): produce the same Plans/ and
+  Pending_Approval/ Markdown the file-writing prompts ask Claude for, so
+  every executor in orchestrator.py parses them unchanged
+- write_outputs(): writes the plan and, for "act" decisions, the approval
+
+Boundary:
+- Pure formatting and validation; invoking Claude stays in orchestrator.py
+- Header values copied from the task (ids, usernames, addresses) come from
+  its frontmatter, never from the model
+
+Usage:
+    REASONING_OUTPUT_MODE=json python orchestrator.py
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from email.utils import parseaddr
+from pathlib import Path
+
+import prompt_registry
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+MAX_TASK_CHARS = 12_000     # task file text inlined into the prompt
+
+# task type → approval prefix, allowed actions, the action that carries text,
+# the JSON field holding that text and its length limit
+TYPE_SPECS = {
+    "email": {
+        "prefix": "REPLY_", "actions": ("reply",), "text_action": "reply",
+        "text_field": "reply_text", "max_chars": 5000,
+        "role": "You are an AI Email Assistant. Decide whether this email needs a reply and draft it.",
+        "guidance": (
+            "- Newsletters, notifications and automated mail need no reply: decision \"ignore\".\n"
+            "- reply_text is sent verbatim as the email body. Write naturally; no subject line."
+        ),
+    },
+    "tweet": {
+        "prefix": "ACTION_TWEET_", "actions": ("like", "retweet", "reply"), "text_action": "reply",
+        "text_field": "reply_text", "max_chars": 280,
+        "role": (
+            "You are an AI Twitter/X Engagement Assistant for @arahmanmoin1, a software engineer "
+            "focused on coding, AI, web development, and personal brand building."
+        ),
+        "guidance": (
+            "- like: relevant, positive tweets. retweet: sparingly, highly relevant only.\n"
+            "- reply: the primary value action; friendly, technical when appropriate, under 280 characters.\n"
+            "- Spam, irrelevant or negative content: decision \"ignore\"."
+        ),
+    },
+    "linkedin_post": {
+        "prefix": "ACTION_LINKEDIN_", "actions": ("like", "comment"), "text_action": "comment",
+        "text_field": "comment_text", "max_chars": 1000,
+        "role": (
+            "You are an AI LinkedIn Engagement Assistant for the user 'arm-test', a software engineer "
+            "focused on coding, AI, web development, and personal brand building."
+        ),
+        "guidance": (
+            "- like: relevant, positive posts. comment: adds genuine value, under 1000 characters,\n"
+            "  no generic platitudes or corporate-speak.\n"
+            "- Spam, irrelevant or off-topic posts: decision \"ignore\"."
+        ),
+    },
+    "odoo_event": {
+        "prefix": "ACTION_ODOO_", "actions": (), "text_action": None,
+        "text_field": None, "max_chars": 0,
+        "role": "You are an AI Business Operations Assistant monitoring Odoo (ERP system) for the user.",
+        "guidance": (
+            "- Urgency: overdue invoice > new order > routine state change.\n"
+            "- recommended_actions are concrete steps for the human (name record, customer, amount).\n"
+            "- Routine events needing no follow-up: decision \"ignore\"."
+        ),
+    },
+    "instagram_dm": {
+        "prefix": "ACTION_INSTAGRAM_", "actions": ("reply",), "text_action": "reply",
+        "text_field": "reply_text", "max_chars": 1000,
+        "role": "You are an AI Instagram DM Assistant managing direct messages for the user.",
+        "guidance": (
+            "- Reply as the account owner: natural, casual, concise.\n"
+            "- Spam, bots or messages needing no answer: decision \"ignore\"."
+        ),
+    },
+    "facebook_dm": {
+        "prefix": "ACTION_FACEBOOK_", "actions": ("reply",), "text_action": "reply",
+        "text_field": "reply_text", "max_chars": 1000,
+        "role": "You are an AI Facebook Messenger Assistant managing direct messages for the user.",
+        "guidance": (
+            "- Reply as the account owner: natural, casual, concise.\n"
+            "- Spam, bots or messages needing no answer: decision \"ignore\"."
+        ),
+    },
+}
+TYPE_SPECS["watchlist"] = TYPE_SPECS["tweet"]
+
+URGENCIES = ("high", "medium", "low")
+
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n?", re.DOTALL)
+_FENCE_RE = re.compile(r"^```(?:json)?\s*\n(.*?)\n```\s*$", re.DOTALL)
+
+
+class StructuredOutputError(ValueError):
+    """The model's answer is not a valid result for this task type."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+# ---------------------------------------------------------------------------
+# Prompt
+# ---------------------------------------------------------------------------
+
+def _schema(task_type: str) -> str:
+    spec = TYPE_SPECS[task_type]
+    lines = [
+        '  "decision": "act" or "ignore",',
+        '  "summary": "<1-2 sentences: what this task is about>",',
+        '  "reasoning": "<why you chose this decision and these actions>",',
+    ]
+    if spec["actions"]:
+        lines.append(f'  "actions": [<one or more of {", ".join(json.dumps(a) for a in spec["actions"])}>],')
+        lines.append(f'  "{spec["text_field"]}": "<text for the {spec["text_action"]} action, '
+                     f'max {spec["max_chars"]} characters; empty if not used>"')
+    else:
+        lines += [
+            '  "urgency": "high", "medium" or "low",',
+            '  "urgency_reason": "<one sentence>",',
+            '  "recommended_actions": ["<concrete step>", ...],',
+            '  "context": "<risks or notes for the human; may be empty>"',
+        ]
+    return "{\n" + "\n".join(lines) + "\n}"
+
+
+_TAIL = """Task type: $task_type
+Task file: $task_name
+
+<<<TASK
+$task_text
+TASK>>>
+"""
+
+
+def template(task_type: str) -> prompt_registry.PromptTemplate:
+    """The type's prompt: role, guidance and JSON shape first, the task last."""
+    spec = TYPE_SPECS[task_type]
+    static = f"""{spec['role']}
+
+The complete task file is given at the end of this prompt, between <<<TASK and TASK>>>
+markers. Do not read or write any files and do not call any tools — everything you need
+is there.
+
+Guidance:
+{spec['guidance']}
+- Do NOT send, post or change anything yourself; a human approves every action.
+
+Respond with ONLY a JSON object (no prose, no code fences) in exactly this shape:
+{_schema(task_type)}
+"""
+    return prompt_registry.register(f"structured_{task_type}", static, _TAIL)
+
+
+def build_prompt(task_type: str, task_file: Path, task_text: str) -> tuple[str, str]:
+    """(prompt, prompt_registry id) for one task."""
+    if len(task_text) > MAX_TASK_CHARS:
+        task_text = task_text[:MAX_TASK_CHARS] + "\n[... truncated ...]"
+    prompt_template = template(task_type)
+    prompt = prompt_template.render(task_type=task_type, task_name=task_file.name, task_text=task_text)
+    return prompt, prompt_template.id
+
+
+def repair_prompt(original_prompt: str, answer: str, errors: list[str]) -> str:
+    return (
+        f"{original_prompt}\n"
+        f"Your previous answer was rejected:\n{answer[:2000]}\n\n"
+        "Problems:\n" + "\n".join(f"- {e}" for e in errors) +
+        "\n\nAnswer again with ONLY the corrected JSON object."
+    )
+
+
+# ---------------------------------------------------------------------------
+# Parsing and validation
+# ---------------------------------------------------------------------------
+
+def parse_result(text: str) -> dict:
+    """The JSON object in a CLI answer (tolerates code fences and stray prose)."""
+    text = (text or "").strip()
+    fenced = _FENCE_RE.match(text)
+    if fenced:
+        text = fenced.group(1)
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        raise StructuredOutputError(["no JSON object in the answer"])
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError as exc:
+        raise StructuredOutputError([f"invalid JSON: {exc}"]) from exc
+    if not isinstance(data, dict):
+        raise StructuredOutputError(["top-level JSON value must be an object"])
+    return data
+
+
+def validate(task_type: str, data: dict) -> dict:
+    """Normalised copy of `data`; raises StructuredOutputError listing every problem."""
+    spec = TYPE_SPECS[task_type]
+    errors = []
+    result = {
+        "decision": str(data.get("decision", "")).strip().lower(),
+        "summary": str(data.get("summary") or "").strip(),
+        "reasoning": str(data.get("reasoning") or "").strip(),
+    }
+    if result["decision"] not in ("act", "ignore"):
+        errors.append('decision must be "act" or "ignore"')
+    if not result["summary"]:
+        errors.append("summary is required")
+
+    if result["decision"] == "act" and spec["actions"]:
+        actions = data.get("actions")
+        if isinstance(actions, str):
+            actions = [actions]
+        actions = [str(a).strip().lower() for a in actions or []]
+        unknown = [a for a in actions if a not in spec["actions"]]
+        if unknown:
+            errors.append(f"unknown actions {unknown}; allowed: {list(spec['actions'])}")
+        if not actions:
+            errors.append("actions must list at least one action when decision is \"act\"")
+        result["actions"] = list(dict.fromkeys(a for a in actions if a in spec["actions"]))
+
+        text = str(data.get(spec["text_field"]) or "").strip()
+        if spec["text_action"] in result["actions"]:
+            if not text:
+                errors.append(f'{spec["text_field"]} is required for the "{spec["text_action"]}" action')
+            elif len(text) > spec["max_chars"]:
+                errors.append(f'{spec["text_field"]} is {len(text)} characters; max {spec["max_chars"]}')
+        result[spec["text_field"]] = text
+
+    if result["decision"] == "act" and not spec["actions"]:
+        urgency = str(data.get("urgency", "")).strip().lower()
+        if urgency not in URGENCIES:
+            errors.append(f"urgency must be one of {list(URGENCIES)}")
+        steps = data.get("recommended_actions") or []
+        if isinstance(steps, str):
+            steps = [steps]
+        steps = [str(s).strip() for s in steps if str(s).strip()]
+        if not steps:
+            errors.append("recommended_actions must list at least one step")
+        result.update({
+            "urgency": urgency,
+            "urgency_reason": str(data.get("urgency_reason") or "").strip(),
+            "recommended_actions": steps,
+            "context": str(data.get("context") or "").strip(),
+        })
+
+    if errors:
+        raise StructuredOutputError(errors)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _q(value) -> str:
+    """YAML-safe double-quoted scalar."""
+    return json.dumps("" if value is None else str(value), ensure_ascii=False)
+
+
+def _task_body(task_text: str) -> str:
+    match = _FRONTMATTER_RE.match(task_text)
+    return (task_text[match.end():] if match else task_text).strip()
+
+
+def render_plan(task_type: str, task_file: Path, result: dict) -> str:
+    decision = result["decision"]
+    actions = ", ".join(result.get("actions", [])) or ("follow-up" if decision == "act" else "none")
+    lines = [
+        f"# Plan: {task_file.name}",
+        "",
+        f"**Task type:** {task_type}",
+        f"**Decision:** {decision} ({actions})",
+        f"**Generated:** {datetime.now().isoformat(timespec='seconds')} (structured output)",
+        "",
+        "## Summary",
+        result["summary"],
+        "",
+        "## Reasoning",
+        result["reasoning"] or "_(none given)_",
+        "",
+    ]
+    if result.get("urgency"):
+        lines += ["## Urgency", f"{result['urgency'].upper()} — {result.get('urgency_reason', '')}", ""]
+    return "\n".join(lines)
+
+
+def _action_sections(result: dict, spec: dict, noun: str) -> list[str]:
+    lines = []
+    for i, action in enumerate(result["actions"], 1):
+        lines.append(f"## Action {i}: {action.capitalize()}")
+        if action == spec["text_action"]:
+            lines.append(result[spec["text_field"]])
+        elif action == "retweet":
+            lines.append(f"Will retweet this {noun}.")
+        else:
+            lines.append(f"Will like this {noun}.")
+        lines.append("")
+    return lines
+
+
+def render_approval(task_type: str, task_file: Path, meta: dict, task_text: str, result: dict) -> str:
+    """Approval Markdown in the exact shape the matching executor parses."""
+    spec = TYPE_SPECS[task_type]
+    body = _task_body(task_text)
+    source = f"source_task: {_q(task_file.name)}"
+    trace = [f"trace_id: {_q(meta['trace_id'])}"] if meta.get("trace_id") else []
+
+    if task_type == "email":
+        sender_name, address = parseaddr(str(meta.get("from", "")))
+        subject = str(meta.get("subject", ""))
+        if not subject.lower().startswith("re:"):
+            subject = f"Re: {subject}"
+        front = [
+            "type: email_action", "action: send_reply",
+            f"to: {_q(address or meta.get('from', ''))}",
+            f"sender_name: {_q(sender_name)}",
+            f"subject: {_q(subject)}",
+            f"in_reply_to: {_q(meta.get('message_id', ''))}",
+            f"original_date: {_q(meta.get('date', ''))}",
+        ]
+        sections = [
+            "# Original Email", "",
+            f"**From:** {meta.get('from', '')}",
+            f"**Subject:** {meta.get('subject', '')}",
+            f"**Date:** {meta.get('date', '')}",
+            f"**Gmail ID:** {meta.get('message_id', '')}",
+            "", body, "",
+            "# Proposed Reply", "", result["reply_text"], "",
+        ]
+    elif task_type in ("tweet", "watchlist"):
+        front = [
+            "type: tweet_action",
+            f"actions: {json.dumps(result['actions'])}",
+            f"tweet_id: {_q(meta.get('tweet_id', ''))}",
+            f"author_username: {_q(meta.get('author_username', ''))}",
+            f"conversation_id: {_q(meta.get('conversation_id', ''))}",
+        ]
+        sections = [
+            "# Original Tweet", "",
+            f"**Author:** @{meta.get('author_username', '')} ({meta.get('author_name', '')})",
+            f"**Tweet ID:** {meta.get('tweet_id', '')}",
+            f"**Type:** {meta.get('tweet_type', '')}",
+            f"**Created:** {meta.get('created_at', '')}",
+            "", body, "",
+            "# Proposed Actions", "",
+        ] + _action_sections(result, spec, "tweet")
+    elif task_type == "linkedin_post":
+        front = [
+            "type: linkedin_action",
+            f"actions: {json.dumps(result['actions'])}",
+            f"post_id: {_q(meta.get('post_id', ''))}",
+            f"post_urn: {_q(meta.get('post_urn', ''))}",
+            f"author_username: {_q(meta.get('author_username', ''))}",
+        ]
+        sections = [
+            "# Original LinkedIn Post", "",
+            f"**Author:** {meta.get('author_name', '')} (@{meta.get('author_username', '')})",
+            f"**Post ID:** {meta.get('post_id', '')}",
+            f"**URN:** {meta.get('post_urn', '')}",
+            f"**Created:** {meta.get('created_at', '')}",
+            "", body, "",
+            "# Proposed Actions", "",
+        ] + _action_sections(result, spec, "post")
+    elif task_type == "odoo_event":
+        front = [
+            "type: odoo_action",
+            f"odoo_model: {_q(meta.get('odoo_model', ''))}",
+            f"record_id: {_q(meta.get('record_id', ''))}",
+            f"record_name: {_q(meta.get('record_name', ''))}",
+            f"event_type: {_q(meta.get('event_type', ''))}",
+            f"urgency: {_q(result['urgency'])}",
+        ]
+        sections = [
+            f"# Odoo Event: {meta.get('event_type', '')} — {meta.get('record_name', '')}", "",
+            "## Summary", result["summary"], "",
+            f"## Urgency: {result['urgency'].upper()}", result["urgency_reason"], "",
+            "## Recommended Actions",
+        ] + [f"- {step}" for step in result["recommended_actions"]] + [
+            "", "## Context", result["context"] or "_(none)_", "",
+        ]
+    else:  # instagram_dm / facebook_dm
+        platform = "Instagram" if task_type == "instagram_dm" else "Facebook"
+        front = [
+            f"type: {task_type.split('_')[0]}_action", "action: reply",
+            f"thread_id: {_q(meta.get('thread_id', ''))}",
+            f"sender: {_q(meta.get('sender', ''))}",
+        ]
+        sections = [
+            f"# {platform} DM Reply — {meta.get('sender', '')}", "",
+            "## Original Message", body, "",
+            "## Proposed Reply", "",
+            "## Action 1: Reply", result["reply_text"], "",
+        ]
+
+    front += [source] + trace + ["status: pending_approval"]
+    return "\n".join(["---"] + front + ["---", ""] + sections)
+
+
+def _write(path: Path, text: str):
+    """Write via a temp file so the approval never appears half-written."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_outputs(task_type: str, task_file: Path, meta: dict, task_text: str, result: dict,
+                  plans_dir: Path, pending_dir: Path) -> Path | None:
+    """Write the plan (always) and approval (decision "act"); return the approval path."""
+    _write(plans_dir / f"PLAN_{task_file.name}", render_plan(task_type, task_file, result))
+    if result["decision"] != "act":
+        return None
+    approval = pending_dir / f"{TYPE_SPECS[task_type]['prefix']}{task_file.name}"
+    _write(approval, render_approval(task_type, task_file, meta, task_text, result))
+    return approval
@@ -0,0 +1,232 @@
+"""
+tracing.py - End-to-end latency tracing for vault tasks.
+
+Responsibility:
+- write_task(): writes a new Needs_Action file with trace_id and traced_at
+  already in its frontmatter, atomically, so the orchestrator never sees it
+  unstamped or half-written (watchers' create_action_file use this)
+- stamp(): the same for a file that is already on disk (fallback for
+  files written some other way)
+- record_span(): appends one stage timing to logs/traces.jsonl
+- report CLI: p50/p95 time-in-stage per platform
+
+Stages recorded by the orchestrator:
+    queue          traced_at                  → picked up by the orchestrator
+    triage         local triage start         → decision (triage.py)
+    reasoning      Claude invocation start    → end
+    approval_wait  approval file written      → picked up from Approved/
+    execution      executor start             → end (browser/MCP/ack)
+    end_to_end     traced_at                  → moved to Done/
+
+Boundary:
+- Observability only; a tracing failure never affects task processing
+- Does NOT parse YAML — callers pass the frontmatter dict they already have
+
+Usage:
+    python tracing.py report [--hours 24] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).resolve().parent
+TRACE_LOG = BASE_DIR / "logs" / "traces.jsonl"
+
+STAGES = ("queue", "triage", "reasoning", "approval_wait", "execution", "end_to_end")
+
+_write_lock = threading.Lock()
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---", re.DOTALL)
+
+
+# ---------------------------------------------------------------------------
+# Producer side
+# ---------------------------------------------------------------------------
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def _stamped(text: str) -> tuple[str, str | None]:
+    """(text with trace_id/traced_at added, trace id); unchanged if it already has one.
+
+    The trace id is None when the text has no frontmatter.
+    """
+    match = _FRONTMATTER_RE.match(text)
+    if not match:
+        return text, None
+    existing = re.search(r'^trace_id:\s*"?([0-9a-f]+)"?\s*$', match.group(1), re.MULTILINE)
+    if existing:
+        return text, existing.group(1)
+    trace_id = new_trace_id()
+    header = f'trace_id: "{trace_id}"\ntraced_at: "{datetime.now().isoformat()}"\n'
+    body_start = text.index("\n") + 1
+    return text[:body_start] + header + text[body_start:], trace_id
+
+
+def _replace(filepath: Path, text: str, tag: str):
+    """Write via a hidden temp file (skipped by the orchestrator's scan) and os.replace."""
+    tmp = filepath.with_name(f".{filepath.name}.{tag}.tmp")
+    try:
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, filepath)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def write_task(filepath: Path, content: str) -> str | None:
+    """Write a new task file with its trace id already in the frontmatter; return the id."""
+    text, trace_id = _stamped(content)
+    _replace(filepath, text, trace_id or new_trace_id())
+    return trace_id
+
+
+def stamp(filepath: Path) -> str | None:
+    """Add trace_id/traced_at to a task file's frontmatter; return the trace id.
+
+    Files that already carry a trace_id keep it. Returns None if the file has
+    no frontmatter or cannot be rewritten. The file is already visible to the
+    orchestrator, so it is replaced atomically — a concurrent reader sees the
+    old or the new text, never a half-written one.
+    """
+    try:
+        text = filepath.read_text(encoding="utf-8")
+        stamped, trace_id = _stamped(text)
+        if stamped is not text:
+            _replace(filepath, stamped, trace_id)
+        return trace_id
+    except (OSError, ValueError):
+        return None
+
+
+def traced_at(meta: dict, fallback_path: Path | None = None) -> float | None:
+    """Epoch seconds at which the task was detected (falls back to file mtime)."""
+    value = meta.get("traced_at")
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if value:
+        try:
+            return datetime.fromisoformat(str(value)).timestamp()
+        except ValueError:
+            pass
+    if fallback_path is not None:
+        try:
+            return fallback_path.stat().st_mtime
+        except OSError:
+            pass
+    return None
+
+
+def record_span(trace_id: str | None, stage: str, start: float | None, end: float,
+                platform: str, task: str = "", **attrs) -> None:
+    """Append one span (epoch-second start/end) to the trace log."""
+    if not trace_id or start is None:
+        return
+    span = {
+        "trace_id": trace_id,
+        "stage": stage,
+        "platform": platform,
+        "task": task,
+        "start": round(start, 3),
+        "end": round(end, 3),
+        "duration": round(max(0.0, end - start), 3),
+    }
+    span.update(attrs)
+    try:
+        TRACE_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with _write_lock, open(TRACE_LOG, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(span) + "\n")
+    except OSError:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def load_spans(since: float | None = None, path: Path | None = None) -> list[dict]:
+    spans = []
+    try:
+        with open(path or TRACE_LOG, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    span = json.loads(line)
+                except ValueError:
+                    continue
+                if since is None or span.get("end", 0) >= since:
+                    spans.append(span)
+    except FileNotFoundError:
+        pass
+    return spans
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(spans: list[dict]) -> dict:
+    """{platform: {stage: {"count", "p50", "p95"}}} in seconds."""
+    grouped: dict[str, dict[str, list[float]]] = {}
+    for span in spans:
+        grouped.setdefault(span["platform"], {}).setdefault(span["stage"], []).append(span["duration"])
+    summary = {}
+    for platform, stages in sorted(grouped.items()):
+        summary[platform] = {}
+        for stage in sorted(stages, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)):
+            values = sorted(stages[stage])
+            summary[platform][stage] = {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+    return summary
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds:.1f}s"
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Task latency traces")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="p50/p95 time-in-stage per platform")
+    report.add_argument("--hours", type=float, default=None, help="only spans from the last N hours")
+    report.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.hours * 3600 if args.hours else None
+    summary = summarize(load_spans(since))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    if not summary:
+        print(f"No spans in {TRACE_LOG}")
+        return
+    print(f"{'platform':<12}{'stage':<16}{'count':>7}{'p50':>10}{'p95':>10}")
+    for platform, stages in summary.items():
+        for stage, stats in stages.items():
+            print(f"{platform:<12}{stage:<16}{stats['count']:>7}"
+                  f"{_fmt(stats['p50']):>10}{_fmt(stats['p95']):>10}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
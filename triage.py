@@ -0,0 +1,419 @@
+"""
+triage.py - Local pre-classifier that runs before Claude reasoning.
+
+Responsibility:
+- classify(): decides per Needs_Action task whether it can be archived
+  without a Claude call ("ignore") or must be reasoned about ("reason")
+- Header heuristics for email tasks: no-reply senders (a reply cannot be
+  delivered anyway), List-Unsubscribe / bulk Precedence headers and
+  Gmail promotion/social/forum categories
+- A small naive Bayes model over subject/sender/body tokens, trained on
+  the vault's own history:
+    ignore  Done/processed_* tasks that never produced an action, and
+            Rejected/ approval files
+    act     tasks whose approval ended up in Done/ as completed_/failed_
+- train CLI: rebuilds the model and prints its leave-out accuracy; run it
+  from cron, or let get_model() retrain a stale model on a background
+  thread — classification never waits for training
+
+Boundary:
+- Only ever answers "ignore" when confident; everything else goes to
+  Claude exactly as before. Bulk-mail headers only archive once a trained
+  model agrees (transactional mail such as bank alerts carries them too).
+  DMs and Odoo events are never triaged
+- Files archived by triage are moved to Done/ as triaged_* and are not
+  used as training data, so the model never learns from its own output
+- Does NOT parse YAML — the orchestrator passes the frontmatter it has
+
+Usage:
+    python triage.py train
+    python triage.py classify AI_Employee_Vault/Needs_Action/EMAIL_....md
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger("triage")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).resolve().parent
+VAULT_PATH = BASE_DIR / "AI_Employee_Vault"
+DONE_DIR = VAULT_PATH / "Done"
+REJECTED_DIR = VAULT_PATH / "Rejected"
+MODEL_PATH = BASE_DIR / "credentials" / ".triage_model.json"
+
+TRIAGE_TYPES = {"email", "tweet", "watchlist", "linkedin_post"}
+IGNORE_THRESHOLD = 0.98     # model-only archive needs P(ignore) at least this high
+MIN_CLASS_SAMPLES = 20      # per class, before the model is trusted at all
+MODEL_MAX_AGE = 6 * 3600    # seconds before the model is retrained from the vault
+BODY_CHARS = 2000           # body text considered per task
+
+NO_REPLY_RE = re.compile(
+    r"(^|[<\s\"'])(no[-_.]?reply|do[-_.]?not[-_.]?reply|mailer-daemon|postmaster)[^@\s]*@",
+    re.IGNORECASE,
+)
+BULK_LABELS = {"CATEGORY_PROMOTIONS", "CATEGORY_SOCIAL", "CATEGORY_FORUMS"}
+BULK_PRECEDENCE = {"bulk", "list", "junk"}
+
+# Approval filename prefix → task type it was proposed for
+APPROVAL_TASK_TYPES = {
+    "REPLY_": "email",
+    "ACTION_TWEET_": "tweet",
+    "ACTION_LINKEDIN_": "linkedin_post",
+    "ACTION_INSTAGRAM_": "instagram_dm",
+    "ACTION_FACEBOOK_": "facebook_dm",
+    "ACTION_ODOO_": "odoo_event",
+}
+
+_DONE_NAME_RE = re.compile(r"^(processed|completed|failed|triaged)_\d{8}_\d{6}_(.+)$")
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n?", re.DOTALL)
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9']{2,19}")
+_EMAIL_RE = re.compile(r"[\w.+-]+@([\w-]+\.)+[\w-]+")
+
+
+# ---------------------------------------------------------------------------
+# Features
+# ---------------------------------------------------------------------------
+
+def _flat_frontmatter(text: str) -> dict:
+    """Top-level key: value pairs (training reads thousands of files; no YAML)."""
+    match = _FRONTMATTER_RE.match(text)
+    fields = {}
+    for line in (match.group(1).splitlines() if match else []):
+        key, sep, value = line.partition(":")
+        if sep and not line.startswith((" ", "\t")):
+            fields[key.strip()] = value.strip().strip('"')
+    return fields
+
+
+def _body(text: str) -> str:
+    match = _FRONTMATTER_RE.match(text)
+    return text[match.end():] if match else text
+
+
+def features(meta: dict, body: str) -> set[str]:
+    """Binary token features for one task."""
+    feats = {f"type:{meta.get('type', 'email')}"}
+    sender = str(meta.get("from") or meta.get("author_username") or meta.get("to") or "")
+    address = _EMAIL_RE.search(sender)
+    if address:
+        feats.add(f"sender:{address.group(0).lower()}")
+        feats.add(f"domain:{address.group(0).split('@', 1)[1].lower()}")
+    elif sender:
+        feats.add(f"sender:{sender.lower()}")
+    for token in _TOKEN_RE.findall(str(meta.get("subject", "")).lower()):
+        feats.add(f"subj:{token}")
+    if meta.get("tweet_type"):
+        feats.add(f"kind:{meta['tweet_type']}")
+    feats.update(_TOKEN_RE.findall(body[:BODY_CHARS].lower()))
+    feats.update(f"label:{label}" for label in _labels(meta))
+    if _truthy(meta.get("list_unsubscribe")):
+        feats.add("flag:list_unsubscribe")
+    return feats
+
+
+def _truthy(value) -> bool:
+    return value is True or str(value).lower() == "true"
+
+
+def _labels(meta: dict) -> list[str]:
+    """Gmail label ids, from a YAML list or the flat parser's raw "[A, B]" string."""
+    labels = meta.get("labels") or []
+    if isinstance(labels, str):
+        labels = re.findall(r"[A-Za-z0-9_]+", labels)
+    return list(labels)
+
+
+# ---------------------------------------------------------------------------
+# Naive Bayes
+# ---------------------------------------------------------------------------
+
+class NaiveBayes:
+    """Binarised multinomial naive Bayes over two classes, ignore/act."""
+
+    CLASSES = ("ignore", "act")
+
+    def __init__(self):
+        self.docs = {c: 0 for c in self.CLASSES}
+        self.tokens = {c: Counter() for c in self.CLASSES}
+        self.totals = {c: 0 for c in self.CLASSES}
+        self.vocab = 0
+        self.trained_at = 0.0
+
+    def fit(self, samples: list[tuple[set[str], str]]) -> "NaiveBayes":
+        for feats, label in samples:
+            self.docs[label] += 1
+            self.tokens[label].update(feats)
+            self.totals[label] += len(feats)
+        self.vocab = len(self.tokens["ignore"].keys() | self.tokens["act"].keys())
+        self.trained_at = time.time()
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return all(self.docs[c] >= MIN_CLASS_SAMPLES for c in self.CLASSES)
+
+    def p_ignore(self, feats: set[str]) -> float:
+        vocab = self.vocab or 1
+        total_docs = sum(self.docs.values()) or 1
+        scores = {}
+        for c in self.CLASSES:
+            score = math.log((self.docs[c] + 1) / (total_docs + 2))
+            denom = self.totals[c] + vocab
+            for f in feats:
+                score += math.log((self.tokens[c][f] + 1) / denom)
+            scores[c] = score
+        # Two-class softmax, computed stably
+        diff = scores["act"] - scores["ignore"]
+        return 1.0 / (1.0 + math.exp(diff)) if diff < 700 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "docs": self.docs,
+            "tokens": {c: dict(self.tokens[c]) for c in self.CLASSES},
+            "totals": self.totals,
+            "trained_at": self.trained_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NaiveBayes":
+        model = cls()
+        model.docs = {c: data["docs"].get(c, 0) for c in cls.CLASSES}
+        model.tokens = {c: Counter(data["tokens"].get(c, {})) for c in cls.CLASSES}
+        model.totals = {c: data["totals"].get(c, 0) for c in cls.CLASSES}
+        model.vocab = len(model.tokens["ignore"].keys() | model.tokens["act"].keys())
+        model.trained_at = data.get("trained_at", 0.0)
+        return model
+
+
+# ---------------------------------------------------------------------------
+# Training data from the vault
+# ---------------------------------------------------------------------------
+
+def training_samples(done_dir: Path | None = None, rejected_dir: Path | None = None) -> list[tuple[set[str], str]]:
+    """(features, label) for every historical task with a known outcome."""
+    done_dir = done_dir or DONE_DIR
+    rejected_dir = rejected_dir or REJECTED_DIR
+
+    processed, acted = {}, set()
+    if done_dir.exists():
+        for path in done_dir.iterdir():
+            match = _DONE_NAME_RE.match(path.name)
+            if not match:
+                continue
+            status, rest = match.groups()
+            if status == "processed":
+                processed[rest] = path
+            elif status in ("completed", "failed"):
+                for prefix in APPROVAL_TASK_TYPES:
+                    if rest.startswith(prefix):
+                        acted.add(rest[len(prefix):])
+                        break
+
+    samples = []
+    for task_name, path in processed.items():
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            continue
+        meta = _flat_frontmatter(text)
+        if meta.get("type", "email") not in TRIAGE_TYPES:
+            continue
+        label = "act" if task_name in acted else "ignore"
+        samples.append((features(meta, _body(text)), label))
+
+    if rejected_dir.exists():
+        for path in rejected_dir.glob("*.md"):
+            task_type = next((t for p, t in APPROVAL_TASK_TYPES.items() if path.name.startswith(p)), None)
+            if task_type not in TRIAGE_TYPES:
+                continue
+            try:
+                text = path.read_text(encoding="utf-8")
+            except OSError:
+                continue
+            meta = _flat_frontmatter(text)
+            meta["type"] = task_type
+            samples.append((features(meta, _body(text)), "ignore"))
+    return samples
+
+
+def train(save: bool = True) -> NaiveBayes:
+    samples = training_samples()
+    model = NaiveBayes().fit(samples)
+    if save:
+        MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = MODEL_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(model.to_dict()), encoding="utf-8")
+        tmp.replace(MODEL_PATH)
+    logger.info("Triage model trained: %d ignore / %d act samples", model.docs["ignore"], model.docs["act"])
+    return model
+
+
+_model: NaiveBayes | None = None
+_model_mtime = 0.0
+_model_lock = threading.Lock()
+_training: threading.Thread | None = None
+
+
+def _train_in_background():
+    """Retrain on a daemon thread (at most one at a time); the result is saved and picked up by get_model()."""
+    global _training
+    with _model_lock:
+        if _training is not None and _training.is_alive():
+            return
+        _training = threading.Thread(target=_train_quietly, name="triage-train", daemon=True)
+        _training.start()
+
+
+def _train_quietly():
+    try:
+        train()
+    except Exception:
+        logger.exception("Triage retraining failed; keeping the current model")
+
+
+def get_model() -> NaiveBayes:
+    """The current model from disk, reloaded when the file changes.
+
+    Never trains inline: a missing model or one older than MODEL_MAX_AGE is
+    retrained in the background (or by `python triage.py train` from cron),
+    and meanwhile the current one — or an untrained, never-ready model — is
+    returned.
+    """
+    global _model, _model_mtime
+    with _model_lock:
+        try:
+            mtime = MODEL_PATH.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        if mtime and mtime != _model_mtime:
+            try:
+                _model = NaiveBayes.from_dict(json.loads(MODEL_PATH.read_text(encoding="utf-8")))
+                _model_mtime = mtime
+            except (OSError, ValueError, KeyError):
+                logger.warning("Triage model at %s unreadable; retraining.", MODEL_PATH)
+                _model = None
+        model = _model
+    if model is None or time.time() - model.trained_at > MODEL_MAX_AGE:
+        _train_in_background()
+    return model or NaiveBayes()
+
+
+# ---------------------------------------------------------------------------
+# Classification
+# ---------------------------------------------------------------------------
+
+def header_signals(meta: dict) -> list[str]:
+    """Bulk-mail signals present in an email task's frontmatter."""
+    signals = []
+    if _truthy(meta.get("list_unsubscribe")):
+        signals.append("list-unsubscribe")
+    if str(meta.get("precedence", "")).lower() in BULK_PRECEDENCE:
+        signals.append("precedence-bulk")
+    signals.extend(label.lower() for label in _labels(meta) if label in BULK_LABELS)
+    return signals
+
+
+def classify(filepath: Path, meta: dict) -> tuple[str, float, str]:
+    """
+    Decide whether a task needs Claude.
+
+    Returns (decision, p_ignore, reason):
+      ("ignore", p, reason) — archive without reasoning
+      ("reason", p, reason) — send to Claude as usual
+    """
+    task_type = meta.get("type", "email")
+    if task_type not in TRIAGE_TYPES:
+        return "reason", 0.0, f"{task_type} is never triaged"
+
+    sender = str(meta.get("from", ""))
+    if task_type == "email" and NO_REPLY_RE.search(f" {sender}"):
+        return "ignore", 1.0, "no-reply sender"
+
+    try:
+        model = get_model()
+        body = _body(filepath.read_text(encoding="utf-8"))
+    except Exception:
+        logger.exception("Triage model unavailable; deferring %s to Claude", filepath.name)
+        return "reason", 0.0, "model unavailable"
+
+    p = model.p_ignore(features(meta, body)) if model.ready else None
+    signals = header_signals(meta) if task_type == "email" else []
+    if p is None:
+        # Bulk headers are on bank alerts and receipts too; without history to check them, ask Claude
+        return "reason", 0.0, "model not ready"
+    if signals:
+        # Bulk headers are enough once the model leans the same way
+        if p >= 0.5:
+            return "ignore", p, ", ".join(signals)
+        return "reason", p, f"{', '.join(signals)} but history says act"
+    if p >= IGNORE_THRESHOLD:
+        return "ignore", p, "model"
+    return "reason", p, "ambiguous"
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def evaluate(samples: list[tuple[set[str], str]], holdout: float = 0.2, seed: int = 0) -> dict:
+    """Train on a random split and report accuracy of confident ignores on the rest."""
+    rng = random.Random(seed)
+    shuffled = samples[:]
+    rng.shuffle(shuffled)
+    cut = int(len(shuffled) * (1 - holdout))
+    model = NaiveBayes().fit(shuffled[:cut])
+    test = shuffled[cut:]
+    archived = [(label, model.p_ignore(feats)) for feats, label in test]
+    confident = [label for label, p in archived if p >= IGNORE_THRESHOLD]
+    return {
+        "train": cut,
+        "test": len(test),
+        "archived": len(confident),
+        "wrongly_archived": sum(1 for label in confident if label == "act"),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Local task triage")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("train", help="retrain the model from Done/ and Rejected/")
+    cls = sub.add_parser("classify", help="show the triage decision for task files")
+    cls.add_argument("files", nargs="+", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        samples = training_samples()
+        model = train()
+        print(f"ignore samples: {model.docs['ignore']}  act samples: {model.docs['act']}  "
+              f"ready: {model.ready}")
+        if samples:
+            stats = evaluate(samples)
+            print(f"holdout: {stats['test']} tasks, {stats['archived']} archived, "
+                  f"{stats['wrongly_archived']} of them should have been acted on")
+        return 0
+
+    if not MODEL_PATH.exists():
+        train()
+    for path in args.files:
+        meta = _flat_frontmatter(path.read_text(encoding="utf-8"))
+        decision, p, reason = classify(path, meta)
+        print(f"{decision:<7} p_ignore={p:.3f}  {reason:<32} {path.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+usage_ledger.py - Token and cost ledger for every Claude Code invocation.
+
+Responsibility:
+- record(): one row per CLI call in a SQLite ledger (logs/claude_usage.db)
+  with purpose, task type, model, outcome, duration, input/output/cache
+  tokens, cost, turns and tool calls, taken from the CLI's result event
+- Daily budgets: once today's billable tokens (input + output + cache
+  writes) or cost pass CLAUDE_DAILY_TOKEN_BUDGET / CLAUDE_DAILY_COST_BUDGET,
+  throttled() tells the orchestrator to hold LOW_PRIORITY_TYPES until the
+  next day; emails, DMs and Odoo events are never held
+- report CLI: usage grouped by day, task type, model, purpose or prompt
+  template version; the texts of those versions are archived here too
+  (prompt_registry.py)
+
+Boundary:
+- The ledger never raises into the caller: a locked or unwritable database
+  costs one missing row and a warning, not a failed task
+- Figures are what the CLI reports; calls that report no usage (older CLI,
+  timeouts) are still recorded with zero tokens
+
+Usage:
+    python usage_ledger.py report --days 7 --by type
+    python usage_ledger.py budget
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger("usage_ledger")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).resolve().parent
+LEDGER_PATH = BASE_DIR / "logs" / "claude_usage.db"
+
+# 0 disables the corresponding budget
+DAILY_TOKEN_BUDGET = int(os.environ.get("CLAUDE_DAILY_TOKEN_BUDGET", "3000000"))
+DAILY_COST_BUDGET = float(os.environ.get("CLAUDE_DAILY_COST_BUDGET", "20"))
+
+# Task types held back once a daily budget is spent
+LOW_PRIORITY_TYPES = {"tweet", "watchlist", "linkedin_post", "linkedin_post_draft", "facebook_post_draft"}
+
+BUDGET_CACHE_SECONDS = 30   # today's totals are re-queried at most this often
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS invocations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    purpose TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    task_name TEXT,
+    backend TEXT,
+    model TEXT,
+    outcome TEXT,
+    duration_s REAL,
+    input_tokens INTEGER DEFAULT 0,
+    output_tokens INTEGER DEFAULT 0,
+    cache_read_tokens INTEGER DEFAULT 0,
+    cache_write_tokens INTEGER DEFAULT 0,
+    cost_usd REAL DEFAULT 0,
+    num_turns INTEGER DEFAULT 0,
+    tool_calls INTEGER DEFAULT 0,
+    prompt_version TEXT
+);
+CREATE INDEX IF NOT EXISTS invocations_day ON invocations (day, task_type);
+CREATE TABLE IF NOT EXISTS prompt_versions (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    text TEXT NOT NULL,
+    first_seen REAL NOT NULL
+);
+"""
+# Columns added after the first release; created on ledgers that predate them
+_MIGRATIONS = {"prompt_version": "ALTER TABLE invocations ADD COLUMN prompt_version TEXT"}
+
+_today_cache = {"at": 0.0, "day": "", "tokens": 0, "cost": 0.0}
+
+
+# ---------------------------------------------------------------------------
+# Ledger
+# ---------------------------------------------------------------------------
+
+_migrated: set[Path] = set()
+
+
+def _connect() -> sqlite3.Connection:
+    LEDGER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(LEDGER_PATH, timeout=10)
+    if LEDGER_PATH not in _migrated:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(invocations)")}
+        for column, statement in _MIGRATIONS.items():
+            if column not in columns:
+                conn.execute(statement)
+        conn.commit()
+        _migrated.add(LEDGER_PATH)
+    return conn
+
+
+def _int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def usage_from_result(result: dict | None) -> dict:
+    """Ledger columns from a CLI result event (stream-json or json output)."""
+    result = result or {}
+    usage = result.get("usage") or {}
+    try:
+        cost = float(result.get("total_cost_usd", result.get("cost_usd")) or 0)
+    except (TypeError, ValueError):
+        cost = 0.0
+    return {
+        "input_tokens": _int(usage.get("input_tokens")),
+        "output_tokens": _int(usage.get("output_tokens")),
+        "cache_read_tokens": _int(usage.get("cache_read_input_tokens")),
+        "cache_write_tokens": _int(usage.get("cache_creation_input_tokens")),
+        "cost_usd": cost,
+        "num_turns": _int(result.get("num_turns")),
+        "tool_calls": _int(result.get("tool_calls")),
+    }
+
+
+def record(purpose: str, task_type: str, task_name: str, result: dict | None, *,
+           model: str = "", backend: str = "", outcome: str = "", duration: float = 0.0,
+           prompt_version: str = ""):
+    """Append one invocation to the ledger; prompt_version is a prompt_registry id (name@hash)."""
+    row = usage_from_result(result)
+    now = time.time()
+    row.update({
+        "ts": now,
+        "day": date.fromtimestamp(now).isoformat(),
+        "purpose": purpose,
+        "task_type": task_type,
+        "task_name": task_name,
+        "backend": backend,
+        "model": model,
+        "outcome": outcome,
+        "duration_s": round(duration, 3),
+        "prompt_version": prompt_version or None,
+    })
+    columns = ", ".join(row)
+    placeholders = ", ".join(f":{key}" for key in row)
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(f"INSERT INTO invocations ({columns}) VALUES ({placeholders})", row)
+    except sqlite3.Error:
+        logger.warning("Could not record Claude usage for %s", task_name, exc_info=True)
+        return
+    if _today_cache["day"] == row["day"]:
+        _today_cache["tokens"] += row["input_tokens"] + row["output_tokens"] + row["cache_write_tokens"]
+        _today_cache["cost"] += row["cost_usd"]
+
+
+def archive_prompt(prompt_id: str, name: str, version: str, text: str):
+    """Keep the text of a prompt template version (first sighting wins)."""
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO prompt_versions (id, name, version, text, first_seen)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (prompt_id, name, version, text, time.time()),
+            )
+    except sqlite3.Error:
+        logger.warning("Could not archive prompt version %s", prompt_id, exc_info=True)
+
+
+def prompt_versions(name: str) -> list[dict]:
+    """Archived versions of one template, oldest first."""
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT version, text, first_seen FROM prompt_versions WHERE name = ? ORDER BY first_seen",
+            (name,),
+        ).fetchall()
+    return [{"version": v, "text": t, "first_seen": f} for v, t, f in rows]
+
+
+def prompt_stats(days: int = 7) -> list[dict]:
+    """Calls and prompt-cache hit rate per prompt version over the last `days` days."""
+    since = (date.today() - timedelta(days=days - 1)).isoformat()
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            """SELECT prompt_version, COUNT(*), SUM(input_tokens), SUM(cache_read_tokens),
+                      SUM(cache_write_tokens)
+               FROM invocations WHERE day >= ? AND prompt_version IS NOT NULL
+               GROUP BY prompt_version ORDER BY prompt_version""",
+            (since,),
+        ).fetchall()
+    stats = []
+    for version, calls, fresh, cache_read, cache_write in rows:
+        prompt_tokens = (fresh or 0) + (cache_read or 0) + (cache_write or 0)
+        stats.append({
+            "prompt_version": version,
+            "calls": calls,
+            "prompt_tokens": prompt_tokens,
+            "cache_read": cache_read or 0,
+            "cache_write": cache_write or 0,
+            "hit_rate": (cache_read or 0) / prompt_tokens if prompt_tokens else 0.0,
+        })
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Budgets
+# ---------------------------------------------------------------------------
+
+def spent_today() -> tuple[int, float]:
+    """(billable tokens, cost) recorded today."""
+    today = date.today().isoformat()
+    if _today_cache["day"] == today and time.time() - _today_cache["at"] < BUDGET_CACHE_SECONDS:
+        return _today_cache["tokens"], _today_cache["cost"]
+    try:
+        with closing(_connect()) as conn:
+            tokens, cost = conn.execute(
+                "SELECT COALESCE(SUM(input_tokens + output_tokens + cache_write_tokens), 0),"
+                " COALESCE(SUM(cost_usd), 0) FROM invocations WHERE day = ?",
+                (today,),
+            ).fetchone()
+    except sqlite3.Error:
+        logger.warning("Could not read today's Claude usage", exc_info=True)
+        return 0, 0.0
+    _today_cache.update({"at": time.time(), "day": today, "tokens": int(tokens), "cost": float(cost)})
+    return int(tokens), float(cost)
+
+
+def over_budget() -> str | None:
+    """Which daily budget is spent, or None."""
+    tokens, cost = spent_today()
+    if DAILY_TOKEN_BUDGET and tokens >= DAILY_TOKEN_BUDGET:
+        return f"daily token budget spent ({tokens:,} / {DAILY_TOKEN_BUDGET:,})"
+    if DAILY_COST_BUDGET and cost >= DAILY_COST_BUDGET:
+        return f"daily cost budget spent (${cost:.2f} / ${DAILY_COST_BUDGET:.2f})"
+    return None
+
+
+def throttled(task_type: str) -> str | None:
+    """Reason to hold a task of this type until tomorrow, or None."""
+    if task_type not in LOW_PRIORITY_TYPES:
+        return None
+    return over_budget()
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+GROUP_COLUMNS = {
+    "day": "day", "type": "task_type", "model": "model", "purpose": "purpose", "prompt": "prompt_version",
+}
+
+
+def report(days: int = 7, by: str = "type") -> list[dict]:
+    """Usage totals for the last `days` days, grouped by GROUP_COLUMNS[by]."""
+    column = GROUP_COLUMNS[by]
+    since = (date.today() - timedelta(days=days - 1)).isoformat()
+    with closing(_connect()) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            f"""SELECT {column} AS grp, COUNT(*) AS calls,
+                       SUM(outcome != 'ok') AS failed,
+                       SUM(input_tokens) AS input, SUM(output_tokens) AS output,
+                       SUM(cache_read_tokens) AS cache_read, SUM(cache_write_tokens) AS cache_write,
+                       SUM(cost_usd) AS cost, AVG(num_turns) AS turns,
+                       SUM(tool_calls) AS tool_calls, AVG(duration_s) AS seconds
+                FROM invocations WHERE day >= ? GROUP BY grp ORDER BY cost DESC, calls DESC""",
+            (since,),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Claude usage ledger")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("report", help="usage totals per group")
+    rep.add_argument("--days", type=int, default=7)
+    rep.add_argument("--by", choices=sorted(GROUP_COLUMNS), default="type")
+    sub.add_parser("budget", help="today's spend against the daily budgets")
+    args = parser.parse_args(argv)
+
+    if args.command == "budget":
+        tokens, cost = spent_today()
+        print(f"{date.today().isoformat()}  tokens {tokens:,} / {DAILY_TOKEN_BUDGET:,}  "
+              f"cost ${cost:.2f} / ${DAILY_COST_BUDGET:.2f}")
+        print(over_budget() or "within budget")
+        return 0
+
+    rows = report(args.days, args.by)
+    print(f"{args.by:<22} {'calls':>6} {'fail':>5} {'input':>10} {'output':>9} {'cache_rd':>10} "
+          f"{'cache_wr':>9} {'cost $':>8} {'turns':>6} {'tools':>6} {'avg s':>6}")
+    for row in rows:
+        print(f"{str(row['grp'] or '-'):<22} {row['calls']:>6} {row['failed'] or 0:>5} "
+              f"{row['input'] or 0:>10,} {row['output'] or 0:>9,} {row['cache_read'] or 0:>10,} "
+              f"{row['cache_write'] or 0:>9,} {row['cost'] or 0:>8.2f} {row['turns'] or 0:>6.1f} "
+              f"{row['tool_calls'] or 0:>6} {row['seconds'] or 0:>6.1f}")
+    print(f"(last {args.days} days, generated {datetime.now().strftime('%Y-%m-%d %H:%M')})")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Async Base Watcher - asyncio variant of BaseWatcher for in-process hosting.
+
+Responsibility:
+- Same polling contract and loop hooks as BaseWatcher (heartbeat, poll
+  metrics, metrics exporter), but check_for_updates() and
+  create_action_file() are coroutines
+- Writes action files for one poll concurrently, bounded by max_concurrency
+- SyncWatcherAdapter runs an existing BaseWatcher subclass on a worker thread
+  (asyncio.to_thread) so main_watcher's host mode can put it on the shared
+  component loop without rewriting it
+
+Boundary:
+- Does NOT perform reasoning, planning, or action execution
+- Does NOT restart crashed watchers or install signal handlers — that stays
+  with the supervisor (main_watcher.py); a failing poll is logged and
+  retried next interval, exactly like BaseWatcher
+
+Assumptions:
+- No watcher is natively async yet: Gmail and Odoo are hosted through
+  SyncWatcherAdapter, one call at a time (max_concurrency=1), because their
+  API clients are not thread-safe
+- Wrapped watchers must not override BaseWatcher.run(); the adapter replaces
+  the loop, so per-watcher run() setup/teardown would silently be skipped
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from base_watcher import BaseWatcher, POLL_ERRORS, POLL_SECONDS, TASKS_CREATED
+from heartbeat import beat
+import metrics
+import tracing
+
+
+class AsyncBaseWatcher(ABC):
+    def __init__(self, vault_path: str, check_interval: int = 120, max_concurrency: int = 4):
+        self.vault_path = Path(vault_path)
+        self.needs_action = self.vault_path / "Needs_Action"
+        self.needs_action.mkdir(parents=True, exist_ok=True)
+        self.check_interval = check_interval
+        self.max_concurrency = max_concurrency
+        self._running = True
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    def stop(self):
+        """Ask the loop to exit. Safe to call from a signal handler or another thread."""
+        self._running = False
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    @abstractmethod
+    async def check_for_updates(self) -> list:
+        """Check the external source for new items. Return a list of raw items."""
+        pass
+
+    @abstractmethod
+    async def create_action_file(self, item) -> Path:
+        """Create a structured Markdown file in Needs_Action/ for a single item."""
+        pass
+
+    async def _process_item(self, semaphore: asyncio.Semaphore, item):
+        async with semaphore:
+            if not self._running:
+                return
+            try:
+                filepath = await self.create_action_file(item)
+                if isinstance(filepath, Path):
+                    await asyncio.to_thread(tracing.stamp, filepath)
+                TASKS_CREATED.inc(watcher=self.name)
+                self.logger.info("Created action file: %s", filepath)
+            except Exception:
+                self.logger.exception("Error processing individual item, skipping")
+
+    async def poll_once(self):
+        """One poll: fetch updates, then write their action files concurrently."""
+        with POLL_SECONDS.time(watcher=self.name):
+            updates = await self.check_for_updates()
+        if not updates:
+            return
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.gather(*(self._process_item(semaphore, item) for item in updates))
+
+    async def _sleep_interval(self):
+        """Wait out check_interval, beating every second and waking on stop()."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.check_interval
+        while self._running:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            beat()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=min(remaining, 1.0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.logger.info(
+            "%s started. Polling every %ds. Vault: %s",
+            self.name,
+            self.check_interval,
+            self.vault_path,
+        )
+        metrics.start_exporter()
+        while self._running:
+            beat()
+            try:
+                await self.poll_once()
+            except Exception:
+                POLL_ERRORS.inc(watcher=self.name)
+                self.logger.exception("Error during polling cycle")
+            await self._sleep_interval()
+        self.logger.info("%s stopped.", self.name)
+
+
+# ---------------------------------------------------------------------------
+# Adapter for existing synchronous watchers
+# ---------------------------------------------------------------------------
+
+class SyncWatcherAdapter(AsyncBaseWatcher):
+    """Run a BaseWatcher subclass on the shared loop via worker threads."""
+
+    def __init__(self, watcher: BaseWatcher, max_concurrency: int = 1):
+        super().__init__(
+            vault_path=str(watcher.vault_path),
+            check_interval=watcher.check_interval,
+            max_concurrency=max_concurrency,
+        )
+        self.watcher = watcher
+        self.logger = watcher.logger
+
+    @property
+    def name(self) -> str:
+        return self.watcher.__class__.__name__
+
+    def stop(self):
+        self.watcher._running = False
+        super().stop()
+
+    async def check_for_updates(self) -> list:
+        return await asyncio.to_thread(self.watcher.check_for_updates)
+
+    async def create_action_file(self, item) -> Path:
+        return await asyncio.to_thread(self.watcher.create_action_file, item)
+
+
+# ---------------------------------------------------------------------------
+# Hosting helper
+# ---------------------------------------------------------------------------
+
+def as_async(watcher: BaseWatcher | AsyncBaseWatcher) -> AsyncBaseWatcher:
+    """Return watcher unchanged if already async, else wrap it."""
+    if isinstance(watcher, AsyncBaseWatcher):
+        return watcher
+    if type(watcher).run is not BaseWatcher.run:
+        raise TypeError(
+            f"{type(watcher).__name__} overrides run(); it cannot be hosted "
+            "through SyncWatcherAdapter"
+        )
+    return SyncWatcherAdapter(watcher)
@@ -5,6 +5,8 @@ Responsibility:
 - Provides the polling loop structure for long-running watchers
 - Manages the Needs_Action output directory
 - Enforces a consistent interface: check_for_updates() and create_action_file()
+- Stamps any new action file that create_action_file did not already write
+  through tracing.write_task with a trace id (see tracing.py)
 
 Boundary:
 - Does NOT perform reasoning, planning, or action execution
@@ -15,9 +17,25 @@ import time
 import logging
 import signal
 import sys
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from heartbeat import beat
+import metrics
+import tracing
+
+POLL_SECONDS = metrics.histogram(
+    "watcher_poll_seconds", "Duration of one check_for_updates() cycle.", ("watcher",),
+)
+POLL_ERRORS = metrics.counter(
+    "watcher_poll_errors_total", "Polling cycles that raised.", ("watcher",),
+)
+TASKS_CREATED = metrics.counter(
+    "tasks_created_total", "Action files written to Needs_Action/.", ("watcher",),
+)
+
 
 class BaseWatcher(ABC):
     def __init__(self, vault_path: str, check_interval: int = 120):
@@ -28,8 +46,11 @@ class BaseWatcher(ABC):
         self._running = True
         self.logger = logging.getLogger(self.__class__.__name__)
 
-        signal.signal(signal.SIGINT, self._shutdown)
-        signal.signal(signal.SIGTERM, self._shutdown)
+        # When hosted on a worker thread (main_watcher host mode) the host
+        # owns signal handling and stops the watcher via _running instead
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self._shutdown)
+            signal.signal(signal.SIGTERM, self._shutdown)
 
     def _shutdown(self, signum, frame):
         self.logger.info("Shutdown signal received (signal %s). Stopping...", signum)
@@ -52,22 +73,31 @@ class BaseWatcher(ABC):
             self.check_interval,
             self.vault_path,
         )
+        metrics.start_exporter()
+        name = self.__class__.__name__
         while self._running:
+            beat()
             try:
-                updates = self.check_for_updates()
+                with POLL_SECONDS.time(watcher=name):
+                    updates = self.check_for_updates()
                 for item in updates:
                     if not self._running:
                         break
                     try:
                         filepath = self.create_action_file(item)
+                        if isinstance(filepath, Path):
+                            tracing.stamp(filepath)
+                        TASKS_CREATED.inc(watcher=name)
                         self.logger.info("Created action file: %s", filepath)
                     except Exception:
                         self.logger.exception("Error processing individual item, skipping")
             except Exception:
+                POLL_ERRORS.inc(watcher=name)
                 self.logger.exception("Error during polling cycle")
             # Sleep in short increments so shutdown signals are responsive
             for _ in range(self.check_interval):
                 if not self._running:
                     break
+                beat()
                 time.sleep(1)
         self.logger.info("%s stopped.", self.__class__.__name__)
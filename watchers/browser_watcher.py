@@ -0,0 +1,423 @@
+"""
+Browser Watcher - Shared base class for the Playwright-driven watchers.
+
+Responsibility:
+- Owns the persistent Playwright driver, browser, context and page
+- Escalating recovery: recycle the page, then the context, and only then
+  relaunch Chromium (reusing the running Playwright driver)
+- Restarts Chromium when its resident memory passes MEMORY_LIMIT_MB
+- Saves the session after each good poll; SessionStore writes it only when
+  the full storage state (cookies and localStorage) changed
+- Counts consecutive poll failures and restarts the browser at the threshold
+- DMInboxWatcher: the shared inbox-delta poll for the Instagram and
+  Messenger DM watchers
+
+Boundary:
+- BrowserWatcher does NOT scrape anything — subclasses implement check_for_updates() and
+  create_action_file() and call _ensure_browser_ready() / _poll_succeeded() /
+  _poll_failed() around their scraping
+- Does NOT log in; a missing or expired session is reported, not repaired
+
+Assumptions:
+- Subclasses set platform, browser_module, session_path and setup_script
+- browser_module exposes create_playwright_instance, launch_browser,
+  new_context, save_session and check_login_state
+- psutil is optional; without it the memory check is skipped
+- The project root is on sys.path (subclass modules insert it) so the
+  browser package is importable
+"""
+
+import hashlib
+from pathlib import Path
+from types import ModuleType
+
+from base_watcher import BaseWatcher
+from browser.inbox_preview import classify_preview
+
+try:
+    import psutil
+except ImportError:  # memory-triggered restarts are disabled without psutil
+    psutil = None
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+MAX_CONSECUTIVE_FAILURES = 3
+MEMORY_LIMIT_MB = 1024          # restart Chromium once its processes exceed this RSS
+
+
+# ---------------------------------------------------------------------------
+# BrowserWatcher
+# ---------------------------------------------------------------------------
+
+class BrowserWatcher(BaseWatcher):
+    platform: str = "Browser"
+    browser_module: ModuleType | None = None
+    session_path: Path | None = None
+    setup_script: str = ""
+    max_consecutive_failures: int = MAX_CONSECUTIVE_FAILURES
+    memory_limit_mb: int = MEMORY_LIMIT_MB
+
+    def __init__(self, vault_path: str, check_interval: int = 120):
+        super().__init__(vault_path=vault_path, check_interval=check_interval)
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._browser_healthy = False
+        self._consecutive_failures = 0
+
+    # -- Browser lifecycle ---------------------------------------------------
+
+    def _launch(self):
+        """Launch Chromium, reusing the running Playwright driver when possible."""
+        mod = self.browser_module
+        if self._pw is not None:
+            try:
+                return mod.launch_browser(self._pw, headless=True, session_path=self.session_path)
+            except Exception:
+                self.logger.warning("Launch on existing Playwright driver failed — starting a fresh driver.")
+                self._stop_driver()
+        self._pw = mod.create_playwright_instance()
+        return mod.launch_browser(self._pw, headless=True, session_path=self.session_path)
+
+    def _start_browser(self):
+        """Start the browser with session restore and verify the login."""
+        if not self.session_path.exists():
+            self.logger.error(
+                "Session file not found at %s. "
+                "Run 'python %s' to log in first.",
+                self.session_path, self.setup_script,
+            )
+            self._browser_healthy = False
+            return
+
+        try:
+            self._browser, self._context = self._launch()
+            self._page = self._context.new_page()
+
+            if self.browser_module.check_login_state(self._page):
+                self.logger.info("Browser started and %s login verified.", self.platform)
+                self._browser_healthy = True
+                self._consecutive_failures = 0
+            else:
+                self.logger.warning(
+                    "Browser started but login verification failed. "
+                    "Session may be expired — run %s again.", self.setup_script,
+                )
+                self._browser_healthy = False
+
+        except Exception:
+            self.logger.exception("Failed to start browser")
+            self._browser_healthy = False
+
+    def _close_browser(self):
+        """Close Chromium but leave the Playwright driver running."""
+        if self._browser:
+            try:
+                self._browser.close()
+            except Exception:
+                self.logger.debug("Error closing browser")
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._browser_healthy = False
+
+    def _stop_driver(self):
+        if self._pw:
+            try:
+                self._pw.stop()
+            except Exception:
+                self.logger.debug("Error stopping playwright")
+        self._pw = None
+
+    def _stop_browser(self):
+        """Close the browser and Playwright."""
+        self._close_browser()
+        self._stop_driver()
+
+    def _restart_browser(self):
+        """Relaunch Chromium on the existing driver (crash/memory recovery)."""
+        self.logger.info("Restarting %s browser...", self.platform)
+        self._save_session()
+        self._close_browser()
+        self._start_browser()
+
+    # -- Health checks and recycling -----------------------------------------
+
+    def _page_responsive(self) -> bool:
+        try:
+            if self._page is None or self._page.is_closed():
+                return False
+            self._page.evaluate("() => document.readyState")
+            return True
+        except Exception:
+            return False
+
+    def _recycle_page(self) -> bool:
+        """Replace the current page with a fresh one from the same context."""
+        try:
+            if self._page is not None and not self._page.is_closed():
+                self._page.close()
+        except Exception:
+            pass
+        try:
+            self._page = self._context.new_page()
+            if self._page_responsive():
+                self.logger.info("Recycled %s page.", self.platform)
+                return True
+        except Exception:
+            self.logger.debug("Page recycle failed", exc_info=True)
+        return False
+
+    def _recycle_context(self) -> bool:
+        """Replace the context (and page) on the running browser."""
+        self._save_session()
+        try:
+            if self._context is not None:
+                self._context.close()
+        except Exception:
+            pass
+        try:
+            self._context = self.browser_module.new_context(self._browser, self.session_path)
+            self._page = self._context.new_page()
+            if self._page_responsive():
+                self.logger.info("Recycled %s browser context.", self.platform)
+                return True
+        except Exception:
+            self.logger.debug("Context recycle failed", exc_info=True)
+        return False
+
+    def _recover(self):
+        """Escalate page → context → browser until something responds."""
+        if self._browser is not None and self._browser.is_connected():
+            if self._recycle_page() or self._recycle_context():
+                return
+        self._restart_browser()
+
+    def _ensure_browser_ready(self) -> bool:
+        """Return True if the page is usable, recovering it first if needed."""
+        if not self._browser_healthy:
+            if self.session_path.exists():
+                self.logger.warning("Browser unhealthy — attempting restart.")
+                self._restart_browser()
+            else:
+                self.logger.warning("Browser unhealthy and no session file. Skipping poll.")
+            return self._browser_healthy
+
+        if not self._page_responsive():
+            self.logger.warning("%s page unresponsive — recovering.", self.platform)
+            self._recover()
+        return self._browser_healthy
+
+    # -- Memory ---------------------------------------------------------------
+
+    def _chromium_rss_mb(self) -> float | None:
+        """Total RSS of this process's Chromium children, or None if unknown."""
+        if psutil is None:
+            return None
+        total = 0
+        try:
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    if "chrom" in child.name().lower() or "headless_shell" in child.name():
+                        total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except Exception:
+            return None
+        return total / (1024 * 1024)
+
+    def _check_memory(self):
+        rss = self._chromium_rss_mb()
+        if rss is not None and rss > self.memory_limit_mb:
+            self.logger.warning(
+                "%s Chromium RSS %.0f MB exceeds %d MB — restarting browser.",
+                self.platform, rss, self.memory_limit_mb,
+            )
+            self._restart_browser()
+
+    # -- Session persistence --------------------------------------------------
+
+    def _save_session(self):
+        """Hand the context's state to save_session; SessionStore skips unchanged state."""
+        if self._context is None:
+            return
+        try:
+            if self.browser_module.save_session(self._context, self.session_path):
+                self.logger.debug("%s session changed — saved.", self.platform)
+        except Exception:
+            self.logger.debug("Session save failed", exc_info=True)
+
+    # -- Poll bookkeeping -----------------------------------------------------
+
+    def _poll_succeeded(self):
+        self._consecutive_failures = 0
+        self._save_session()
+        self._check_memory()
+
+    def _poll_failed(self):
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.max_consecutive_failures:
+            self.logger.error(
+                "Browser failed %d times consecutively — restarting.",
+                self._consecutive_failures,
+            )
+            self._restart_browser()
+        else:
+            self._recover()
+
+    def run(self):
+        """Run the polling loop and always release the browser on exit."""
+        try:
+            super().run()
+        finally:
+            self.logger.info("Shutting down %s browser...", self.platform)
+            self._save_session()
+            self._stop_browser()
+
+
+# ---------------------------------------------------------------------------
+# DMInboxWatcher
+# ---------------------------------------------------------------------------
+
+def _message_hash(text: str) -> str:
+    return hashlib.md5(text.encode()).hexdigest()[:12]
+
+
+class DMInboxWatcher(BrowserWatcher):
+    """
+    BrowserWatcher for DM inboxes polled as deltas (Instagram, Messenger).
+
+    Subclasses keep self.processed ({thread_id: {"last_hash", "sender"}}) and
+    implement _save_processed(). browser_module must also expose
+    build_inbox_url, build_thread_url, parse_inbox_from_page,
+    parse_messages_from_page, open_thread_in_panel, dismiss_overlays and
+    human_delay.
+    """
+
+    inbox_label: str = "Inbox"
+    inbox_delta_mode: bool = True
+    max_conversations: int = 20
+
+    def _mark_seen(self, thread_id: str, preview_hash: str, sender: str):
+        self.processed[thread_id] = {"last_hash": preview_hash, "sender": sender}
+        self._save_processed()
+
+    def _fetch_new_messages(self, max_new: int | None = None) -> list[dict]:
+        """
+        Poll the inbox once and return new-message dicts.
+
+        Changed threads are collected from a single inbox render first. With
+        inbox_delta_mode on, a preview is used as the message only when it
+        comes from the dedicated preview element and classify_preview() calls
+        it complete; outgoing previews are just recorded, and every other
+        changed thread is opened — via the side panel, so the inbox stays
+        loaded between them. Opening stops once max_new messages exist.
+        """
+        mod = self.browser_module
+        new_messages = []
+        try:
+            self._page.goto(mod.build_inbox_url(), wait_until="domcontentloaded", timeout=30_000)
+            mod.human_delay(2.5, 4.0)
+            mod.dismiss_overlays(self._page)
+
+            conversations = mod.parse_inbox_from_page(self._page, max_conversations=self.max_conversations)
+            self.logger.info("%s: found %d conversation(s).", self.inbox_label, len(conversations))
+
+            to_open = []
+            for conv in conversations:
+                thread_id = conv["thread_id"]
+                preview = conv.get("preview_text", "")
+                sender = conv.get("sender_text", "unknown")
+
+                # Check if the inbox entry changed since last seen
+                preview_hash = _message_hash(preview)
+                prev = self.processed.get(thread_id, {})
+
+                if prev.get("last_hash") == preview_hash:
+                    self.logger.debug("Thread %s — no new messages.", thread_id)
+                    continue
+
+                self.logger.info("Thread %s (%s) — new message detected.", thread_id, sender)
+                entry = {
+                    "thread_id": thread_id,
+                    "thread_url": mod.build_thread_url(thread_id),
+                    "sender": sender,
+                    "preview_text": preview,
+                    "preview_hash": preview_hash,
+                }
+
+                if not self.inbox_delta_mode:
+                    to_open.append(entry)
+                    continue
+
+                kind, text = classify_preview(conv.get("preview_snippet"))
+                if kind == "outgoing":
+                    # Last message is ours — nothing to answer
+                    self._mark_seen(thread_id, preview_hash, sender)
+                elif kind == "complete":
+                    new_messages.append({**entry, "message_text": text})
+                else:
+                    to_open.append(entry)
+
+            if self.inbox_delta_mode:
+                self.logger.info(
+                    "Delta: %d message(s) from previews, %d thread(s) to open.",
+                    len(new_messages), len(to_open),
+                )
+
+            for entry in to_open:
+                if max_new is not None and len(new_messages) >= max_new:
+                    break
+                thread_id = entry["thread_id"]
+                try:
+                    last_message = self._read_last_incoming(thread_id)
+                    if last_message is None:
+                        self.logger.warning("Thread %s — could not extract message text.", thread_id)
+                        # Update hash to avoid re-processing on next poll
+                        self._mark_seen(thread_id, entry["preview_hash"], entry["sender"])
+                        continue
+                    new_messages.append({**entry, "message_text": last_message})
+                except Exception:
+                    self.logger.exception("Error reading %s thread %s", self.platform, thread_id)
+
+                if self.inbox_delta_mode:
+                    mod.human_delay(0.8, 1.5)
+                else:
+                    mod.human_delay(2.0, 3.0)  # polite gap between full page loads
+
+        except Exception:
+            self.logger.exception("Error polling %s", self.inbox_label)
+
+        return new_messages
+
+    def _read_last_incoming(self, thread_id: str) -> str | None:
+        """
+        Open a thread and return the text of its last incoming message.
+
+        In delta mode the thread is opened from the inbox list; a full page
+        load is only used when that fails (or delta mode is off).
+        """
+        mod = self.browser_module
+        opened = self.inbox_delta_mode and mod.open_thread_in_panel(self._page, thread_id)
+        if not opened:
+            self._page.goto(
+                mod.build_thread_url(thread_id),
+                wait_until="domcontentloaded",
+                timeout=30_000,
+            )
+            mod.human_delay(2.0, 3.5)
+            mod.dismiss_overlays(self._page)
+
+        messages = mod.parse_messages_from_page(self._page)
+
+        # Get the last incoming message
+        incoming = [m for m in messages if m.get("is_incoming")]
+        if not incoming:
+            # If we can't determine direction, take the last message
+            incoming = messages[-1:] if messages else []
+        if not incoming:
+            return None
+        return incoming[-1]["text"]
@@ -33,8 +33,10 @@ from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 
 # Add parent dir to path so base_watcher can be imported when run standalone
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from base_watcher import BaseWatcher
+import tracing
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -181,7 +183,8 @@ class GmailWatcher(BaseWatcher):
             self.service.users()
             .messages()
             .get(userId="me", id=message["id"], format="metadata",
-                 metadataHeaders=["From", "Subject", "Date", "Message-ID"])
+                 metadataHeaders=["From", "Subject", "Date", "Message-ID",
+                                  "List-Unsubscribe", "Precedence"])
             .execute()
         )
 
@@ -191,6 +194,10 @@ class GmailWatcher(BaseWatcher):
         date = headers.get("Date", "Unknown")
         message_id = headers.get("Message-ID", message["id"])
         snippet = msg.get("snippet", "")
+        # Bulk-mail signals for the orchestrator's local triage (see triage.py)
+        labels = json.dumps(msg.get("labelIds", []))
+        list_unsubscribe = "true" if "List-Unsubscribe" in headers else "false"
+        precedence = headers.get("Precedence", "").strip().lower().replace('"', "")
 
         # Try to get full body, but don't block if it fails
         body = ""
@@ -218,6 +225,9 @@ from: "{sender}"
 subject: "{subject}"
 date: "{date}"
 received_at: "{datetime.now().isoformat()}"
+labels: {labels}
+list_unsubscribe: {list_unsubscribe}
+precedence: "{precedence}"
 status: pending
 ---
 
@@ -243,7 +253,7 @@ status: pending
 """
 
         filepath = self.needs_action / filename
-        filepath.write_text(content, encoding="utf-8")
+        tracing.write_task(filepath, content)
 
         # Track as processed and persist
         self.processed_ids.add(message["id"])
@@ -9,7 +9,8 @@ Responsibility:
   each new message so Claude can draft a reply
 - Only fetches while pipeline capacity remains (executed_replies + in_flight
   < DAILY_ACTION_LIMIT), preventing reply spam
-- Keeps browser open between poll cycles; saves session after each poll
+- Keeps browser open between poll cycles via BrowserWatcher (page/context
+  recycling, memory-triggered restarts, session saved when its state changes)
 
 Boundary:
 - READ-ONLY scraping of the inbox — does NOT send messages
@@ -21,7 +22,6 @@ Assumptions:
   (created via browser/instagram_setup.py)
 """
 
-import hashlib
 import json
 import logging
 import re
@@ -32,18 +32,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from base_watcher import BaseWatcher
-from browser.instagram_browser import (
-    create_playwright_instance,
-    launch_browser,
-    save_session,
-    check_login_state,
-    dismiss_overlays,
-    parse_inbox_from_page,
-    parse_messages_from_page,
-    build_thread_url,
-    human_delay,
-)
+from browser_watcher import DMInboxWatcher
+import tracing
+from browser import instagram_browser
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -63,6 +54,12 @@ QUOTA_WINDOW_HOURS = 24
 CHECK_INTERVAL = 180            # seconds between polls (3 minutes)
 MAX_CONSECUTIVE_FAILURES = 3
 
+# Inbox delta mode: take complete messages straight from the dedicated inbox
+# preview element and open the remaining changed threads from the inbox list
+# instead of a full page load per thread. Set False to always navigate into
+# each thread.
+INBOX_DELTA_MODE = True
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -92,87 +89,28 @@ def _sanitize_filename(text: str, max_len: int = 40) -> str:
     return text.strip("_")[:max_len]
 
 
-def _message_hash(text: str) -> str:
-    return hashlib.md5(text.encode()).hexdigest()[:12]
-
-
 # ---------------------------------------------------------------------------
 # InstagramWatcher
 # ---------------------------------------------------------------------------
 
-class InstagramWatcher(BaseWatcher):
+class InstagramWatcher(DMInboxWatcher):
+    platform = "Instagram"
+    browser_module = instagram_browser
+    session_path = SESSION_PATH
+    setup_script = "browser/instagram_setup.py"
+    max_consecutive_failures = MAX_CONSECUTIVE_FAILURES
+    inbox_label = "Instagram inbox"
+    inbox_delta_mode = INBOX_DELTA_MODE
+
     def __init__(self):
         super().__init__(vault_path=str(VAULT_PATH), check_interval=CHECK_INTERVAL)
 
         # {thread_id: {"last_hash": str, "sender": str}}
         self.processed: dict[str, dict] = {}
 
-        self._pw = None
-        self._browser = None
-        self._context = None
-        self._page = None
-        self._browser_healthy = False
-        self._consecutive_failures = 0
-
         self._load_processed()
         self._start_browser()
 
-    # -- Browser lifecycle ---------------------------------------------------
-
-    def _start_browser(self):
-        if not SESSION_PATH.exists():
-            logger.error(
-                "Session file not found at %s. "
-                "Run 'python browser/instagram_setup.py' to log in first.",
-                SESSION_PATH,
-            )
-            self._browser_healthy = False
-            return
-
-        try:
-            self._pw = create_playwright_instance()
-            self._browser, self._context = launch_browser(
-                self._pw, headless=True, session_path=SESSION_PATH,
-            )
-            self._page = self._context.new_page()
-
-            if check_login_state(self._page):
-                logger.info("Browser started and Instagram login verified.")
-                self._browser_healthy = True
-                self._consecutive_failures = 0
-            else:
-                logger.warning(
-                    "Browser started but login verification failed. "
-                    "Session may be expired — run browser/instagram_setup.py again."
-                )
-                self._browser_healthy = False
-
-        except Exception:
-            logger.exception("Failed to start browser")
-            self._browser_healthy = False
-
-    def _stop_browser(self):
-        for resource, name in [
-            (self._browser, "browser"),
-            (self._pw, "playwright"),
-        ]:
-            if resource:
-                try:
-                    resource.close() if name == "browser" else resource.stop()
-                except Exception:
-                    pass
-        self._browser = None
-        self._context = None
-        self._page = None
-        self._pw = None
-        self._browser_healthy = False
-
-    def _restart_browser(self):
-        logger.info("Restarting Instagram browser...")
-        self._stop_browser()
-        human_delay(2.0, 5.0)
-        self._start_browser()
-
     # -- Processed state persistence -----------------------------------------
 
     def _load_processed(self):
@@ -225,83 +163,6 @@ class InstagramWatcher(BaseWatcher):
         )
         return slots
 
-    # -- DM fetching ---------------------------------------------------------
-
-    def _fetch_new_messages(self) -> list[dict]:
-        """
-        Poll the inbox, click into conversations with new messages, and return
-        a list of new-message dicts for create_action_file().
-        """
-        new_messages = []
-        try:
-            from browser.instagram_browser import build_inbox_url
-            self._page.goto(build_inbox_url(), wait_until="domcontentloaded", timeout=30_000)
-            human_delay(2.5, 4.0)
-            dismiss_overlays(self._page)
-
-            conversations = parse_inbox_from_page(self._page, max_conversations=20)
-            logger.info("Inbox: found %d conversation(s).", len(conversations))
-
-            for conv in conversations:
-                thread_id = conv["thread_id"]
-                preview = conv.get("preview_text", "")
-                sender = conv.get("sender_text", "unknown")
-
-                # Check if preview changed since last seen
-                preview_hash = _message_hash(preview)
-                prev = self.processed.get(thread_id, {})
-
-                if prev.get("last_hash") == preview_hash:
-                    logger.debug("Thread %s — no new messages.", thread_id)
-                    continue
-
-                # New or updated message — click into thread for full text
-                logger.info("Thread %s (@%s) — new message detected.", thread_id, sender)
-                try:
-                    self._page.goto(
-                        build_thread_url(thread_id),
-                        wait_until="domcontentloaded",
-                        timeout=30_000,
-                    )
-                    human_delay(2.0, 3.5)
-                    dismiss_overlays(self._page)
-
-                    messages = parse_messages_from_page(self._page)
-
-                    # Get the last incoming message
-                    incoming = [m for m in messages if m.get("is_incoming")]
-                    if not incoming:
-                        # If we can't determine direction, take the last message
-                        incoming = messages[-1:] if messages else []
-
-                    if not incoming:
-                        logger.warning("Thread %s — could not extract message text.", thread_id)
-                        # Update hash to avoid re-processing on next poll
-                        self.processed[thread_id] = {"last_hash": preview_hash, "sender": sender}
-                        self._save_processed()
-                        continue
-
-                    last_message = incoming[-1]["text"]
-
-                    new_messages.append({
-                        "thread_id": thread_id,
-                        "thread_url": build_thread_url(thread_id),
-                        "sender": sender,
-                        "message_text": last_message,
-                        "preview_text": preview,
-                        "preview_hash": preview_hash,
-                    })
-
-                except Exception:
-                    logger.exception("Error reading thread %s", thread_id)
-
-                human_delay(2.0, 3.0)  # polite gap between conversations
-
-        except Exception:
-            logger.exception("Error polling Instagram inbox")
-
-        return new_messages
-
     # -- BaseWatcher interface -----------------------------------------------
 
     def check_for_updates(self) -> list:
@@ -313,17 +174,11 @@ class InstagramWatcher(BaseWatcher):
             )
             return []
 
-        if not self._browser_healthy:
-            if SESSION_PATH.exists():
-                logger.warning("Browser unhealthy — attempting restart.")
-                self._restart_browser()
-            else:
-                logger.warning("No session file. Skipping poll.")
-            if not self._browser_healthy:
-                return []
+        if not self._ensure_browser_ready():
+            return []
 
         try:
-            new_messages = self._fetch_new_messages()
+            new_messages = self._fetch_new_messages(max_new=slots)
 
             if len(new_messages) > slots:
                 logger.info(
@@ -337,23 +192,12 @@ class InstagramWatcher(BaseWatcher):
                 len(new_messages),
             )
 
-            if self._context:
-                save_session(self._context, SESSION_PATH)
-
-            self._consecutive_failures = 0
+            self._poll_succeeded()
             return new_messages
 
         except Exception:
             logger.exception("Error during Instagram poll cycle")
-            self._consecutive_failures += 1
-
-            if self._consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-                logger.error(
-                    "Browser failed %d times consecutively — restarting.",
-                    self._consecutive_failures,
-                )
-                self._restart_browser()
-
+            self._poll_failed()
             return []
 
     def create_action_file(self, message: dict) -> Path:
@@ -397,7 +241,7 @@ status: pending
 """
 
         filepath = self.needs_action / filename
-        filepath.write_text(content, encoding="utf-8")
+        tracing.write_task(filepath, content)
 
         # Mark as processed with current preview hash
         self.processed[thread_id] = {
@@ -409,13 +253,6 @@ status: pending
         logger.info("Created: %s", filename)
         return filepath
 
-    def run(self):
-        try:
-            super().run()
-        finally:
-            logger.info("Shutting down Instagram browser...")
-            self._stop_browser()
-
 
 # ---------------------------------------------------------------------------
 # Entry point
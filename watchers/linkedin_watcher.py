@@ -3,13 +3,15 @@ linkedin_watcher.py - LinkedIn Sense Component (Playwright Browser Automation)
 
 Responsibility:
 - Connects to LinkedIn via headless Chromium browser (Playwright)
-- Polls the main LinkedIn feed every CHECK_INTERVAL seconds
+- Polls the main LinkedIn feed every CHECK_INTERVAL seconds, scrolling only
+  until it reaches posts it has already processed (deeper after downtime)
 - Creates a structured Markdown file in AI_Employee_Vault/Needs_Action/ for
   each detected post containing metadata, content, and engagement context
 - Tracks already-processed post IDs to avoid duplicates (persisted to disk)
 - Only fetches new posts while pipeline capacity remains (executed_actions +
   in_flight < DAILY_ACTION_LIMIT), ensuring the 24h action cap is respected
-- Keeps browser open between poll cycles; saves session state after each poll
+- Keeps browser open between poll cycles via BrowserWatcher (page/context
+  recycling, memory-triggered restarts, session saved when its state changes)
 
 Boundary:
 - READ-ONLY scraping — does NOT like, comment, or post
@@ -32,13 +34,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from base_watcher import BaseWatcher
+from browser_watcher import BrowserWatcher
+import tracing
+from browser import linkedin_browser
 from browser.linkedin_browser import (
-    create_playwright_instance,
-    launch_browser,
-    save_session,
-    check_login_state,
-    parse_posts_from_page,
+    harvest_feed_posts,
     dismiss_cookie_consent,
     build_feed_url,
     human_delay,
@@ -61,6 +61,14 @@ QUOTA_WINDOW_HOURS = 24         # hours in a quota window
 
 CHECK_INTERVAL = 300            # seconds between polls (5 minutes)
 
+# Feed harvesting depth: scroll until this many already-processed posts are
+# seen in a row, or until the scroll limit is reached. After downtime longer
+# than CATCHUP_AFTER_MINUTES the deeper catch-up limit is used instead.
+HARVEST_STOP_AFTER_SEEN = 5
+HARVEST_MAX_SCROLLS = 6
+HARVEST_CATCHUP_MAX_SCROLLS = 40
+CATCHUP_AFTER_MINUTES = 60
+
 # Our own LinkedIn username slug — skip our own posts when scraping
 OWN_USERNAME = "arm-test"
 
@@ -101,84 +109,21 @@ def _sanitize_filename(text: str, max_len: int = 50) -> str:
 # LinkedInWatcher
 # ---------------------------------------------------------------------------
 
-class LinkedInWatcher(BaseWatcher):
+class LinkedInWatcher(BrowserWatcher):
+    platform = "LinkedIn"
+    browser_module = linkedin_browser
+    session_path = SESSION_PATH
+    setup_script = "browser/linkedin_setup.py"
+    max_consecutive_failures = MAX_CONSECUTIVE_FAILURES
+
     def __init__(self):
         super().__init__(vault_path=str(VAULT_PATH), check_interval=CHECK_INTERVAL)
         self.processed_ids: dict[str, str] = {}  # post_id -> source
-
-        # Browser state
-        self._pw = None
-        self._browser = None
-        self._context = None
-        self._page = None
-        self._browser_healthy = False
-        self._consecutive_failures = 0
+        self.last_harvest_at: datetime | None = None
 
         self._load_processed_ids()
         self._start_browser()
 
-    # -- Browser lifecycle ----------------------------------------------------
-
-    def _start_browser(self):
-        """Start the Playwright browser with session restore."""
-        if not SESSION_PATH.exists():
-            logger.error(
-                "Session file not found at %s. "
-                "Run 'python browser/linkedin_setup.py' to log in first.",
-                SESSION_PATH,
-            )
-            self._browser_healthy = False
-            return
-
-        try:
-            self._pw = create_playwright_instance()
-            self._browser, self._context = launch_browser(
-                self._pw, headless=True, session_path=SESSION_PATH,
-            )
-            self._page = self._context.new_page()
-
-            if check_login_state(self._page):
-                logger.info("Browser started and LinkedIn login verified.")
-                self._browser_healthy = True
-                self._consecutive_failures = 0
-            else:
-                logger.warning(
-                    "Browser started but login verification failed. "
-                    "Session may be expired — run browser/linkedin_setup.py again."
-                )
-                self._browser_healthy = False
-
-        except Exception:
-            logger.exception("Failed to start browser")
-            self._browser_healthy = False
-
-    def _stop_browser(self):
-        """Close the browser and Playwright."""
-        for resource, name in [
-            (self._browser, "browser"),
-            (self._pw, "playwright"),
-        ]:
-            if resource:
-                try:
-                    if name == "browser":
-                        resource.close()
-                    else:
-                        resource.stop()
-                except Exception:
-                    logger.debug("Error closing %s", name)
-        self._browser = None
-        self._context = None
-        self._page = None
-        self._pw = None
-        self._browser_healthy = False
-
-    def _restart_browser(self):
-        """Stop and restart the browser (crash recovery)."""
-        logger.info("Restarting browser...")
-        self._stop_browser()
-        human_delay(2.0, 5.0)
-        self._start_browser()
-
     # -- Pipeline capacity check ----------------------------------------------
 
     def _pipeline_slots_remaining(self) -> int:
@@ -235,6 +180,8 @@ class LinkedInWatcher(BaseWatcher):
                 data = json.loads(PROCESSED_IDS_PATH.read_text(encoding="utf-8"))
                 if isinstance(data, dict):
                     self.processed_ids = data.get("processed", {})
+                    if data.get("last_harvest_at"):
+                        self.last_harvest_at = datetime.fromisoformat(data["last_harvest_at"])
                 else:
                     self.processed_ids = {str(pid): "legacy" for pid in data}
                 logger.info("Loaded %d processed LinkedIn post IDs.", len(self.processed_ids))
@@ -245,12 +192,27 @@ class LinkedInWatcher(BaseWatcher):
     def _save_processed_ids(self):
         PROCESSED_IDS_PATH.parent.mkdir(parents=True, exist_ok=True)
         data = {"processed": self.processed_ids}
+        if self.last_harvest_at:
+            data["last_harvest_at"] = self.last_harvest_at.isoformat()
         PROCESSED_IDS_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
 
     # -- Feed fetching via browser --------------------------------------------
 
-    def _fetch_feed_posts(self) -> list[dict]:
-        """Navigate to the LinkedIn feed and scrape new posts."""
+    def _harvest_depth(self) -> int:
+        """Return the max scroll depth for this poll (deeper after downtime)."""
+        if self.last_harvest_at is None:
+            return HARVEST_CATCHUP_MAX_SCROLLS
+        idle = datetime.now() - self.last_harvest_at
+        if idle >= timedelta(minutes=CATCHUP_AFTER_MINUTES):
+            logger.info(
+                "Last feed harvest was %.0f min ago — catching up (max %d scrolls).",
+                idle.total_seconds() / 60, HARVEST_CATCHUP_MAX_SCROLLS,
+            )
+            return HARVEST_CATCHUP_MAX_SCROLLS
+        return HARVEST_MAX_SCROLLS
+
+    def _fetch_feed_posts(self, max_new: int) -> list[dict]:
+        """Navigate to the LinkedIn feed and harvest posts not yet processed."""
         posts = []
         try:
             url = build_feed_url()
@@ -260,14 +222,26 @@ class LinkedInWatcher(BaseWatcher):
 
             dismiss_cookie_consent(self._page)
 
-            raw = parse_posts_from_page(self._page, max_posts=20)
+            raw, stop_reason = harvest_feed_posts(
+                self._page,
+                is_processed=lambda pid: pid in self.processed_ids,
+                max_scrolls=self._harvest_depth(),
+                stop_after_seen=HARVEST_STOP_AFTER_SEEN,
+                max_new=max_new,
+                # Our own posts are never answered, so they must not use up
+                # max_new or break the run of already-seen posts
+                skip=lambda p: p.get("author_username", "").lower() == OWN_USERNAME.lower(),
+            )
+            # Only a harvest that reached already-seen posts (or the end of
+            # the feed) has covered the gap; otherwise keep catching up
+            if stop_reason in ("caught_up", "end_of_feed"):
+                self.last_harvest_at = datetime.now()
+                self._save_processed_ids()
+
             for post in raw:
                 pid = post.get("id", "")
                 if not pid or pid in self.processed_ids:
                     continue
-                # Skip our own posts
-                if post.get("author_username", "").lower() == OWN_USERNAME.lower():
-                    continue
 
                 posts.append({
                     "id": pid,
@@ -299,17 +273,11 @@ class LinkedInWatcher(BaseWatcher):
             )
             return []
 
-        if not self._browser_healthy:
-            if SESSION_PATH.exists():
-                logger.warning("Browser unhealthy — attempting restart.")
-                self._restart_browser()
-            else:
-                logger.warning("Browser unhealthy and no session file. Skipping poll.")
-            if not self._browser_healthy:
-                return []
+        if not self._ensure_browser_ready():
+            return []
 
         try:
-            all_posts = self._fetch_feed_posts()
+            all_posts = self._fetch_feed_posts(max_new=slots)
 
             # Deduplicate by post ID
             seen: set[str] = set()
@@ -332,23 +300,12 @@ class LinkedInWatcher(BaseWatcher):
                 len(unique),
             )
 
-            if self._context:
-                save_session(self._context, SESSION_PATH)
-
-            self._consecutive_failures = 0
+            self._poll_succeeded()
             return unique
 
         except Exception:
             logger.exception("Error during LinkedIn browser polling cycle")
-            self._consecutive_failures += 1
-
-            if self._consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-                logger.error(
-                    "Browser failed %d times consecutively — restarting.",
-                    self._consecutive_failures,
-                )
-                self._restart_browser()
-
+            self._poll_failed()
             return []
 
     def create_action_file(self, post: dict) -> Path:
@@ -392,21 +349,13 @@ status: pending
 """
 
         filepath = self.needs_action / filename
-        filepath.write_text(content, encoding="utf-8")
+        tracing.write_task(filepath, content)
 
         self.processed_ids[pid] = post.get("source", "feed")
         self._save_processed_ids()
 
         return filepath
 
-    def run(self):
-        """Override run() to ensure browser cleanup on exit."""
-        try:
-            super().run()
-        finally:
-            logger.info("Shutting down LinkedIn browser...")
-            self._stop_browser()
-
 
 # ---------------------------------------------------------------------------
 # Entry point
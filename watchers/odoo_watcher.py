@@ -3,12 +3,25 @@ odoo_watcher.py - Odoo Sense Component (XML-RPC Polling)
 
 Responsibility:
 - Connects to Odoo via the built-in XML-RPC API
-- Polls Sales Orders and Invoices/Bills every CHECK_INTERVAL seconds
+- Polls Sales Orders and Invoices/Bills every CHECK_INTERVAL seconds in two
+  phases: a thin scan of the write_date delta (id, state, payment state,
+  write_date) to detect events, then one batched read of the full fields
+  for only the records that produced one
 - Detects new records and state changes (e.g. quotation confirmed, invoice paid)
 - Creates a structured Markdown file in AI_Employee_Vault/Needs_Action/ for
   each detected event, containing full context for Claude to reason on
 - Tracks last-known state of each record to avoid duplicate events
 - Persists processed state to disk so restarts don't re-fire old events
+- Coalesces events: changes to one record arriving within COALESCE_SECONDS
+  of each other become a single task carrying the full transition history
+  (e.g. draft → sent → sale is one task, not three), and several small
+  payment events from one partner become one digest task
+- Keeps a due-date index (min-heap) of open posted invoices that are not
+  yet due, so an invoice becomes invoice_overdue the day its due date
+  passes even if nobody touches it (the write_date delta alone would never
+  see it). Built with a thin search_read and maintained from the deltas;
+  the daily rebuild drains the old index first, so nothing that fell due
+  since the last poll is dropped. Paid / cancelled invoices are dropped lazily
 
 Boundary:
 - READ-ONLY access to Odoo — does NOT create, update, or delete records
@@ -22,8 +35,10 @@ Assumptions:
 - Python's built-in xmlrpc.client is used — no extra pip installs needed
 """
 
+import heapq
 import json
 import logging
+import os
 import re
 import sys
 import xmlrpc.client
@@ -34,6 +49,8 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from base_watcher import BaseWatcher
+import metrics
+import tracing
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -45,10 +62,67 @@ CREDENTIALS_DIR = BASE_DIR / "credentials"
 CONFIG_PATH = CREDENTIALS_DIR / "odoo_config.json"
 STATE_PATH = CREDENTIALS_DIR / ".odoo_state.json"      # last-known state per record
 LAST_POLL_PATH = CREDENTIALS_DIR / ".odoo_last_poll.json"
+PENDING_PATH = CREDENTIALS_DIR / ".odoo_pending_events.json"   # events waiting out the coalescing window
+DUE_INDEX_PATH = CREDENTIALS_DIR / ".odoo_due_index.json"       # open invoices by due date
 
 CHECK_INTERVAL = 600    # seconds between polls (10 minutes — lower priority)
 LOOKBACK_MINUTES = 30   # on startup, look back this many minutes to catch recent changes
 
+# A record's events are held until it has been quiet this long, then written
+# as one task (0 = one task per event, as soon as it is detected). The
+# default releases an event on the poll after the one that saw it.
+COALESCE_SECONDS = int(os.environ.get("ODOO_COALESCE_SECONDS", str(CHECK_INTERVAL)))
+COALESCE_MAX_SECONDS = int(os.environ.get("ODOO_COALESCE_MAX_SECONDS", "3600"))  # busy records still get out
+
+# Payment events on invoices below DIGEST_AMOUNT are released as one digest
+# per partner once at least DIGEST_MIN_EVENTS of them are ready together
+DIGEST_AMOUNT = float(os.environ.get("ODOO_DIGEST_AMOUNT", "500"))
+DIGEST_MIN_EVENTS = 3
+DIGEST_EVENT_TYPES = {"invoice_fully_paid", "invoice_payment_registered", "invoice_partially_paid"}
+
+# The due-date index is rebuilt from scratch this often, in case a delta was
+# missed (fetch limit, downtime longer than the lookback)
+DUE_INDEX_REBUILD_HOURS = 24
+
+# Page size of the thin write_date scan. The scan keeps paging until a short
+# page comes back, so a burst larger than this is still fully read; thin rows
+# are small, so pages can be much larger than a full-record fetch could be
+SCAN_LIMIT = 500
+
+INVOICE_MOVE_TYPES = ["out_invoice", "out_refund", "in_invoice", "in_refund"]
+OPEN_PAYMENT_STATES = ["not_paid", "partial"]
+
+# Phase 1: what event detection and the due-date index look at
+SALE_SCAN_FIELDS = ["id", "state", "write_date"]
+INVOICE_SCAN_FIELDS = ["id", "state", "payment_state", "write_date", "invoice_date_due"]
+# Phase 2: everything the task file shows (note / narration can be large HTML)
+SALE_FIELDS = [
+    "id", "name", "state", "partner_id", "amount_total",
+    "date_order", "write_date", "user_id", "origin", "note",
+    "invoice_status",
+]
+INVOICE_FIELDS = [
+    "id", "name", "move_type", "state", "payment_state",
+    "partner_id", "amount_total", "amount_residual",
+    "invoice_date", "invoice_date_due", "write_date",
+    "invoice_user_id", "invoice_origin", "narration",
+]
+
+ODOO_RPC_SECONDS = metrics.histogram(
+    "odoo_rpc_seconds", "Odoo XML-RPC execute_kw latency.", ("model", "method"),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+ODOO_RPC_ERRORS = metrics.counter(
+    "odoo_rpc_errors_total", "Odoo XML-RPC calls that raised.", ("model", "method"),
+)
+ODOO_EVENTS_COALESCED = metrics.counter(
+    "odoo_events_coalesced_total", "Odoo events folded into another task instead of getting their own.",
+    ("kind",),
+)
+ODOO_DUE_INDEX_ENTRIES = metrics.gauge(
+    "odoo_due_index_entries", "Open invoices in the due-date index (not yet overdue).",
+)
+
 # Sale order state human labels
 SALE_STATE_LABELS = {
     "draft": "Quotation",
@@ -118,6 +192,32 @@ def _get_name(field_value) -> str:
     return str(field_value)
 
 
+def _history_table(history: list[dict], with_payment: bool) -> str:
+    """Markdown section listing a coalesced task's events, oldest first ("" for a single event)."""
+    if len(history) < 2:
+        return ""
+    if with_payment:
+        lines = ["| # | Event | State | Payment | Write Date |", "|---|-------|-------|---------|------------|"]
+        lines += [
+            f"| {i} | `{h['event_type']}` | {INV_STATE_LABELS.get(h.get('state', ''), h.get('state', ''))} "
+            f"| {INV_PAYMENT_LABELS.get(h.get('payment_state', ''), h.get('payment_state', ''))} "
+            f"| {h.get('write_date', '')} |"
+            for i, h in enumerate(history, 1)
+        ]
+    else:
+        lines = ["| # | Event | State | Write Date |", "|---|-------|-------|------------|"]
+        lines += [
+            f"| {i} | `{h['event_type']}` | {SALE_STATE_LABELS.get(h.get('state', ''), h.get('state', ''))} "
+            f"| {h.get('write_date', '')} |"
+            for i, h in enumerate(history, 1)
+        ]
+    return (
+        f"\n## Transition History\n"
+        f"{len(history)} changes detected within the coalescing window, merged into this task:\n\n"
+        + "\n".join(lines) + "\n"
+    )
+
+
 # ---------------------------------------------------------------------------
 # OdooWatcher
 # ---------------------------------------------------------------------------
@@ -134,10 +234,17 @@ class OdooWatcher(BaseWatcher):
 
         self._state: dict = {}       # {"{model}:{id}": {state, payment_state, write_date}}
         self._last_poll: datetime | None = None
+        self._pending: dict = {}     # {"{model}:{id}": event + history, first_seen, last_seen}
+        self._due_heap: list | None = None  # [[invoice_date_due, id], ...]; None until built
+        self._due: dict = {}         # {"id": invoice_date_due} — heap entries not matching are stale
+        self._due_built: datetime | None = None
+        self._installed: dict = {}   # {model: bool} — answered once per process
 
         self._load_config_and_connect()
         self._load_state()
         self._load_last_poll()
+        self._load_pending()
+        self._load_due_index()
 
     # -- Connection ----------------------------------------------------------
 
@@ -190,10 +297,15 @@ class OdooWatcher(BaseWatcher):
 
     def _execute(self, model: str, method: str, domain: list, kwargs: dict) -> list:
         """Thin wrapper around models.execute_kw with error handling."""
-        return self._models.execute_kw(
-            self._db, self._uid, self._api_key,
-            model, method, [domain], kwargs,
-        )
+        try:
+            with ODOO_RPC_SECONDS.time(model=model, method=method):
+                return self._models.execute_kw(
+                    self._db, self._uid, self._api_key,
+                    model, method, [domain], kwargs,
+                )
+        except Exception:
+            ODOO_RPC_ERRORS.inc(model=model, method=method)
+            raise
 
     # -- State persistence ---------------------------------------------------
 
@@ -232,72 +344,306 @@ class OdooWatcher(BaseWatcher):
             encoding="utf-8",
         )
 
+    def _load_pending(self):
+        if PENDING_PATH.exists():
+            try:
+                self._pending = json.loads(PENDING_PATH.read_text(encoding="utf-8"))
+                if self._pending:
+                    logger.info("Loaded %d Odoo event(s) waiting in the coalescing window.", len(self._pending))
+            except Exception:
+                logger.exception("Failed to load pending Odoo events; starting empty.")
+                self._pending = {}
+
+    def _save_pending(self):
+        PENDING_PATH.parent.mkdir(parents=True, exist_ok=True)
+        PENDING_PATH.write_text(json.dumps(self._pending, indent=2), encoding="utf-8")
+
+    def _load_due_index(self):
+        if DUE_INDEX_PATH.exists():
+            try:
+                data = json.loads(DUE_INDEX_PATH.read_text(encoding="utf-8"))
+                self._due = data["due"]
+                self._due_heap = data["heap"]
+                self._due_built = datetime.fromisoformat(data["built_at"])
+                logger.info("Loaded due-date index: %d open invoice(s) not yet due.", len(self._due))
+            except Exception:
+                logger.exception("Failed to load due-date index; it will be rebuilt.")
+                self._due_heap, self._due, self._due_built = None, {}, None
+
+    def _save_due_index(self):
+        if self._due_heap is None:
+            return
+        # Lazy deletion leaves stale heap entries behind; compact once they dominate
+        if len(self._due_heap) > 2 * len(self._due) + 100:
+            self._due_heap = [[due, int(rid)] for rid, due in self._due.items()]
+            heapq.heapify(self._due_heap)
+        DUE_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+        DUE_INDEX_PATH.write_text(
+            json.dumps({"built_at": self._due_built.isoformat(), "due": self._due, "heap": self._due_heap}),
+            encoding="utf-8",
+        )
+
+    # -- Due-date index ------------------------------------------------------
+
+    def _build_due_index(self, from_date):
+        """(Re)build the index with one thin scan of open posted invoices due on or after from_date.
+
+        Callers pass the last poll's date, so invoices that fell due while
+        the index was being replaced (or the watcher was down) are still in
+        it for _detect_due_events to fire.
+        """
+        try:
+            rows = self._execute(
+                "account.move", "search_read",
+                [
+                    ["state", "=", "posted"],
+                    ["payment_state", "in", OPEN_PAYMENT_STATES],
+                    ["move_type", "in", INVOICE_MOVE_TYPES],
+                    ["invoice_date_due", ">=", str(from_date)],
+                ],
+                {"fields": ["id", "invoice_date_due"]},
+            )
+        except Exception:
+            logger.exception("Could not build the due-date index; retrying next poll.")
+            return
+        self._due = {str(r["id"]): r["invoice_date_due"] for r in rows if r.get("invoice_date_due")}
+        self._due_heap = [[due, int(rid)] for rid, due in self._due.items()]
+        heapq.heapify(self._due_heap)
+        self._due_built = datetime.now()
+        logger.info("Built due-date index: %d open invoice(s) due on or after %s.", len(self._due), from_date)
+
+    def _index_due(self, rec: dict, today):
+        """Keep the index in step with an invoice seen in the delta."""
+        if self._due_heap is None:
+            return
+        rid = str(rec["id"])
+        due = rec.get("invoice_date_due") or ""
+        still_open = rec.get("state") == "posted" and rec.get("payment_state") in OPEN_PAYMENT_STATES
+        if still_open and due >= str(today):
+            if self._due.get(rid) != due:
+                self._due[rid] = due
+                heapq.heappush(self._due_heap, [due, rec["id"]])
+        else:
+            # Paid, cancelled or already overdue (the delta check alerts on those)
+            self._due.pop(rid, None)
+
+    def _detect_due_events(self, today) -> list[dict]:
+        """invoice_overdue for indexed invoices whose due date has passed since the last poll."""
+        if not self._due_heap:
+            return []
+        today_str = str(today)
+        due_ids = {}
+        while self._due_heap and self._due_heap[0][0] < today_str:
+            due, rid = heapq.heappop(self._due_heap)
+            if self._due.get(str(rid)) == due:
+                del self._due[str(rid)]
+                due_ids[rid] = due
+        if not due_ids:
+            return []
+
+        # Re-read them: the index only knows they were open when last seen
+        try:
+            records = self._execute(
+                "account.move", "search_read",
+                [
+                    ["id", "in", list(due_ids)],
+                    ["state", "=", "posted"],
+                    ["payment_state", "in", OPEN_PAYMENT_STATES],
+                ],
+                {"fields": INVOICE_FIELDS},
+            )
+        except Exception:
+            logger.exception("Could not read %d invoice(s) past their due date; retrying next poll.", len(due_ids))
+            for rid, due in due_ids.items():
+                self._due[str(rid)] = due
+                heapq.heappush(self._due_heap, [due, rid])
+            return []
+
+        events = []
+        for rec in records:
+            key = f"account.move:{rec['id']}"
+            prev = self._state.get(key)
+            if prev is not None and prev.get("last_overdue_alert") == today_str:
+                continue    # the delta check already alerted today
+            events.append({"model": "account.move", "event_type": "invoice_overdue", "record": rec, "prev": prev})
+            if prev is None:
+                self._state[key] = {
+                    "state": rec.get("state", ""),
+                    "payment_state": rec.get("payment_state", ""),
+                    "write_date": rec.get("write_date", ""),
+                }
+            self._state[key]["last_overdue_alert"] = today_str
+        if events:
+            logger.info("%d invoice(s) passed their due date.", len(events))
+        return events
+
+    # -- Coalescing ----------------------------------------------------------
+
+    def _buffer_events(self, events: list[dict], now: datetime):
+        """Add detected events to the pending buffer, merging by record."""
+        for event in events:
+            rec = event["record"]
+            key = f"{event['model']}:{rec['id']}"
+            step = {
+                "event_type": event["event_type"],
+                "state": rec.get("state", ""),
+                "write_date": rec.get("write_date", ""),
+            }
+            if event["model"] == "account.move":
+                step["payment_state"] = rec.get("payment_state", "")
+
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = {
+                    **event,
+                    "history": [step],
+                    "first_seen": now.isoformat(),
+                    "last_seen": now.isoformat(),
+                }
+                continue
+            # Latest record and event type win; prev stays the state before the first change
+            entry["event_type"] = event["event_type"]
+            entry["record"] = rec
+            entry["history"].append(step)
+            entry["last_seen"] = now.isoformat()
+            ODOO_EVENTS_COALESCED.inc(kind="record")
+
+    def _release_pending(self, now: datetime) -> list[dict]:
+        """Pop buffered events whose record has been quiet for COALESCE_SECONDS
+        (or has been buffered for COALESCE_MAX_SECONDS), oldest first."""
+        released = []
+        for key, entry in list(self._pending.items()):
+            quiet = (now - datetime.fromisoformat(entry["last_seen"])).total_seconds()
+            age = (now - datetime.fromisoformat(entry["first_seen"])).total_seconds()
+            if quiet >= COALESCE_SECONDS or age >= COALESCE_MAX_SECONDS:
+                released.append(self._pending.pop(key))
+        released.sort(key=lambda e: e["first_seen"])
+        return released
+
+    def _build_digests(self, events: list[dict]) -> list[dict]:
+        """Replace groups of small payment events from one partner with a digest event."""
+        by_partner: dict = {}
+        for event in events:
+            rec = event["record"]
+            if (
+                event["model"] == "account.move"
+                and all(h["event_type"] in DIGEST_EVENT_TYPES for h in event["history"])
+                and abs(float(rec.get("amount_total") or 0)) < DIGEST_AMOUNT
+            ):
+                partner = rec.get("partner_id")
+                partner_key = partner[0] if isinstance(partner, list) and partner else _get_name(partner)
+                by_partner.setdefault(partner_key, []).append(event)
+
+        digested = set()
+        digests = []
+        for group in by_partner.values():
+            if len(group) < DIGEST_MIN_EVENTS:
+                continue
+            digested.update(id(event) for event in group)
+            digests.append({
+                "model": "account.move",
+                "event_type": "payment_digest",
+                "partner": _get_name(group[0]["record"].get("partner_id")),
+                "events": group,
+            })
+            ODOO_EVENTS_COALESCED.inc(len(group) - 1, kind="digest")
+        return [e for e in events if id(e) not in digested] + digests
+
     # -- Odoo polling --------------------------------------------------------
 
     def _model_exists(self, model: str) -> bool:
-        """Check if a model is installed in this Odoo instance."""
+        """Check if a model is installed in this Odoo instance (cached; a failed check is retried)."""
+        if model in self._installed:
+            return self._installed[model]
         try:
             result = self._execute(
                 "ir.model", "search_read",
                 [["model", "=", model]],
                 {"fields": ["model"], "limit": 1},
             )
-            return bool(result)
         except Exception:
             return False
+        self._installed[model] = bool(result)
+        return self._installed[model]
+
+    def _scan(self, model: str, domain: list, fields: list[str]) -> list[dict]:
+        """Every row matching domain, oldest write first, read SCAN_LIMIT rows per call.
+
+        Pages are keyed on (write_date, id) instead of an offset, so a record
+        rewritten mid-scan moves to the end rather than shifting an unseen
+        record out of the window.
+        """
+        records: list[dict] = []
+        after: list = []
+        while True:
+            page = self._execute(
+                model, "search_read",
+                after + domain,
+                {
+                    "fields": fields,
+                    "limit": SCAN_LIMIT,
+                    "order": "write_date asc, id asc",
+                },
+            )
+            records.extend(page)
+            if len(page) < SCAN_LIMIT:
+                return records
+            last = page[-1]
+            after = [
+                "|", ["write_date", ">", last["write_date"]],
+                "&", ["write_date", "=", last["write_date"]], ["id", ">", last["id"]],
+            ]
 
     def _fetch_sale_orders(self, since: str) -> list[dict]:
-        """Fetch sale orders modified since `since` (Odoo datetime string)."""
+        """Thin rows (SALE_SCAN_FIELDS) of sale orders modified since `since` (Odoo datetime string)."""
         if not self._model_exists("sale.order"):
             logger.debug("sale.order model not installed — skipping. Install the Sales app in Odoo.")
             return []
         try:
-            records = self._execute(
-                "sale.order", "search_read",
-                [["write_date", ">=", since]],
-                {
-                    "fields": [
-                        "id", "name", "state", "partner_id", "amount_total",
-                        "date_order", "write_date", "user_id", "origin", "note",
-                        "invoice_status",
-                    ],
-                    "limit": 50,
-                    "order": "write_date asc",
-                },
-            )
-            return records
+            return self._scan("sale.order", [["write_date", ">=", since]], SALE_SCAN_FIELDS)
         except Exception:
             logger.exception("Error fetching sale orders from Odoo")
             return []
 
     def _fetch_invoices(self, since: str) -> list[dict]:
-        """Fetch invoices/bills modified since `since`."""
+        """Thin rows (INVOICE_SCAN_FIELDS) of invoices/bills modified since `since`."""
         if not self._model_exists("account.move"):
             logger.debug("account.move model not installed — skipping. Install the Invoicing app in Odoo.")
             return []
         try:
-            records = self._execute(
-                "account.move", "search_read",
+            return self._scan(
+                "account.move",
                 [
                     ["write_date", ">=", since],
-                    ["move_type", "in", ["out_invoice", "out_refund", "in_invoice", "in_refund"]],
+                    ["move_type", "in", INVOICE_MOVE_TYPES],
                 ],
-                {
-                    "fields": [
-                        "id", "name", "move_type", "state", "payment_state",
-                        "partner_id", "amount_total", "amount_residual",
-                        "invoice_date", "invoice_date_due", "write_date",
-                        "invoice_user_id", "invoice_origin", "narration",
-                    ],
-                    "limit": 50,
-                    "order": "write_date asc",
-                },
+                INVOICE_SCAN_FIELDS,
             )
-            return records
         except Exception:
             logger.exception("Error fetching invoices from Odoo")
             return []
 
+    def _hydrate(self, events: list[dict]):
+        """Swap the thin scan rows in events for full records: one batched read per model.
+
+        Scanned fields keep their scanned values so the record matches the
+        event; if the read fails the event keeps its thin row.
+        """
+        for model, fields in (("sale.order", SALE_FIELDS), ("account.move", INVOICE_FIELDS)):
+            ids = sorted({e["record"]["id"] for e in events if e["model"] == model})
+            if not ids:
+                continue
+            try:
+                full = {r["id"]: r for r in self._execute(model, "read", ids, {"fields": fields})}
+            except Exception:
+                logger.exception("Could not read %d changed %s record(s); their tasks will lack detail.",
+                                 len(ids), model)
+                continue
+            for event in events:
+                rec = event["record"]
+                if event["model"] == model and rec["id"] in full:
+                    event["record"] = {**full[rec["id"]], **rec}
+
     def _detect_sale_order_events(self, records: list[dict]) -> list[dict]:
         """Compare sale orders against stored state, return list of event dicts."""
         events = []
@@ -417,6 +763,7 @@ class OdooWatcher(BaseWatcher):
                 "payment_state": curr_payment,
                 "write_date": rec.get("write_date", ""),
             }
+            self._index_due(rec, today)
 
         return events
 
@@ -434,6 +781,15 @@ class OdooWatcher(BaseWatcher):
 
         logger.info("Polling Odoo for changes since %s ...", since)
 
+        today = poll_start.date()
+        due_events = []
+        if (self._due_heap is None or poll_start - self._due_built >= timedelta(hours=DUE_INDEX_REBUILD_HOURS)) \
+                and self._model_exists("account.move"):
+            # Drain the old index first: the rebuild would otherwise drop
+            # invoices that fell due since the last poll without alerting
+            due_events = self._detect_due_events(today)
+            self._build_due_index(self._last_poll.date())
+
         sale_records = self._fetch_sale_orders(since)
         inv_records = self._fetch_invoices(since)
 
@@ -442,16 +798,29 @@ class OdooWatcher(BaseWatcher):
             len(sale_records), len(inv_records),
         )
 
-        events = []
-        events.extend(self._detect_sale_order_events(sale_records))
-        events.extend(self._detect_invoice_events(inv_records))
-
+        detected = []
+        detected.extend(self._detect_sale_order_events(sale_records))
+        detected.extend(self._detect_invoice_events(inv_records))
+        self._hydrate(detected)
+        detected.extend(due_events)                         # already read in full
+        detected.extend(self._detect_due_events(today))
+
+        # Pending events are saved before the state that produced them, so a
+        # crash in between re-detects (and re-merges) rather than loses them
+        self._buffer_events(detected, poll_start)
+        events = self._build_digests(self._release_pending(poll_start))
+        self._save_pending()
         self._save_state()
+        self._save_due_index()
+        ODOO_DUE_INDEX_ENTRIES.set(len(self._due))
         self._save_last_poll(poll_start)
         self._last_poll = poll_start
 
-        if events:
-            logger.info("Detected %d Odoo event(s) to action.", len(events))
+        if detected or events:
+            logger.info(
+                "Detected %d Odoo event(s); %d task(s) to action, %d record(s) still in the coalescing window.",
+                len(detected), len(events), len(self._pending),
+            )
         else:
             logger.debug("No new Odoo events this cycle.")
 
@@ -461,20 +830,25 @@ class OdooWatcher(BaseWatcher):
         """Write a Markdown file to Needs_Action/ describing the Odoo event."""
         model = event["model"]
         event_type = event["event_type"]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        if event_type == "payment_digest":
+            return self._write_digest_file(event["partner"], event["events"], timestamp)
+
         rec = event["record"]
         prev = event.get("prev")
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        history = event.get("history") or []
 
         if model == "sale.order":
-            return self._write_sale_order_file(rec, event_type, prev, timestamp)
+            return self._write_sale_order_file(rec, event_type, prev, timestamp, history)
         elif model == "account.move":
-            return self._write_invoice_file(rec, event_type, prev, timestamp)
+            return self._write_invoice_file(rec, event_type, prev, timestamp, history)
         else:
             logger.warning("Unknown model in event: %s", model)
             return None
 
-    def _write_sale_order_file(self, rec: dict, event_type: str, prev: dict | None, timestamp: str) -> Path:
+    def _write_sale_order_file(self, rec: dict, event_type: str, prev: dict | None, timestamp: str,
+                               history: list[dict] | None = None) -> Path:
         rec_name = _sanitize_filename(rec.get("name", str(rec["id"])))
         filename = f"ODOO_SALE_{timestamp}_{event_type}_{rec_name}.md"
 
@@ -502,6 +876,7 @@ event_type: "{event_type}"
 current_state: "{state}"
 partner: "{partner}"
 amount_total: {amount}
+event_count: {max(1, len(history or []))}
 received_at: "{datetime.now().isoformat()}"
 status: pending
 ---
@@ -511,7 +886,7 @@ status: pending
 ## Event
 **Type:** `{event_type}`
 {change_summary}
-
+{_history_table(history or [], with_payment=False)}
 ## Order Details
 | Field         | Value |
 |---------------|-------|
@@ -543,11 +918,12 @@ Consider what response (if any) is appropriate. Examples:
 - Write Date: `{rec.get('write_date', '')}`
 """
         filepath = self.needs_action / filename
-        filepath.write_text(content, encoding="utf-8")
+        tracing.write_task(filepath, content)
         logger.info("Created: %s", filename)
         return filepath
 
-    def _write_invoice_file(self, rec: dict, event_type: str, prev: dict | None, timestamp: str) -> Path:
+    def _write_invoice_file(self, rec: dict, event_type: str, prev: dict | None, timestamp: str,
+                            history: list[dict] | None = None) -> Path:
         rec_name = _sanitize_filename(rec.get("name", str(rec["id"])))
         filename = f"ODOO_INV_{timestamp}_{event_type}_{rec_name}.md"
 
@@ -574,7 +950,7 @@ Consider what response (if any) is appropriate. Examples:
             change_summary = f"New record detected — State: **{state_label}**, Payment: **{payment_label}**"
 
         overdue_note = ""
-        if event_type == "invoice_overdue":
+        if event_type == "invoice_overdue" or any(h["event_type"] == "invoice_overdue" for h in history or []):
             overdue_note = f"\n> ⚠️ **OVERDUE** — Due date was `{due_date}`. Amount outstanding: {amount_due:,.2f}\n"
 
         content = f"""---
@@ -591,6 +967,7 @@ partner: "{partner}"
 amount_total: {amount_total}
 amount_due: {amount_due}
 invoice_date_due: "{due_date}"
+event_count: {max(1, len(history or []))}
 received_at: "{datetime.now().isoformat()}"
 status: pending
 ---
@@ -600,7 +977,7 @@ status: pending
 ## Event
 **Type:** `{event_type}`
 {change_summary}
-{overdue_note}
+{overdue_note}{_history_table(history or [], with_payment=True)}
 ## Invoice Details
 | Field          | Value |
 |----------------|-------|
@@ -635,7 +1012,64 @@ Consider what response is appropriate. Examples:
 - Write Date: `{rec.get('write_date', '')}`
 """
         filepath = self.needs_action / filename
-        filepath.write_text(content, encoding="utf-8")
+        tracing.write_task(filepath, content)
+        logger.info("Created: %s", filename)
+        return filepath
+
+    def _write_digest_file(self, partner: str, events: list[dict], timestamp: str) -> Path:
+        filename = f"ODOO_DIGEST_{timestamp}_payments_{_sanitize_filename(partner)}.md"
+        records = [e["record"] for e in events]
+        amount_total = sum(float(r.get("amount_total") or 0) for r in records)
+        amount_due = sum(float(r.get("amount_residual") or 0) for r in records)
+
+        rows = "\n".join(
+            f"| {r.get('name', r['id'])} | {INV_TYPE_LABELS.get(r.get('move_type', ''), r.get('move_type', ''))} "
+            f"| `{e['event_type']}` | {INV_PAYMENT_LABELS.get(r.get('payment_state', ''), r.get('payment_state', ''))} "
+            f"| {float(r.get('amount_total') or 0):,.2f} | {float(r.get('amount_residual') or 0):,.2f} "
+            f"| {r.get('write_date', '')} |"
+            for e, r in zip(events, records)
+        )
+
+        content = f"""---
+type: odoo_event
+subtype: payment_digest
+odoo_model: account.move
+record_id: "{','.join(str(r['id']) for r in records)}"
+record_name: "{len(records)} payments from {partner}"
+event_type: "payment_digest"
+partner: "{partner}"
+amount_total: {amount_total}
+amount_due: {amount_due}
+event_count: {sum(len(e.get('history') or [1]) for e in events)}
+received_at: "{datetime.now().isoformat()}"
+status: pending
+---
+
+# Odoo: Payment Digest — {partner}
+
+## Event
+**Type:** `payment_digest`
+{len(records)} small payment events for **{partner}** (each invoice under {DIGEST_AMOUNT:,.2f}),
+batched into one task.
+
+## Invoices
+| Reference | Document Type | Event | Payment Status | Total | Amount Due | Write Date |
+|-----------|---------------|-------|----------------|-------|------------|------------|
+{rows}
+
+**Total:** {amount_total:,.2f}  |  **Still due:** {amount_due:,.2f}
+
+## Suggested Actions
+Usually no action is needed. Consider:
+- One thank-you / receipt email covering all of the payments
+- Checking that partial payments are followed up together
+
+## Raw Reference
+- Odoo Model: `account.move`
+- Record IDs: `{', '.join(str(r['id']) for r in records)}`
+"""
+        filepath = self.needs_action / filename
+        tracing.write_task(filepath, content)
         logger.info("Created: %s", filename)
         return filepath
 
@@ -651,6 +1085,10 @@ def main():
     logger.info("Config: %s", CONFIG_PATH)
     logger.info("Poll interval: %ds", CHECK_INTERVAL)
     logger.info("Watching: Sales Orders + Invoices/Bills")
+    logger.info(
+        "Coalescing window: %ds (max %ds); payment digests under %.2f",
+        COALESCE_SECONDS, COALESCE_MAX_SECONDS, DIGEST_AMOUNT,
+    )
     logger.info("=" * 60)
 
     watcher = OdooWatcher()
@@ -10,7 +10,8 @@ Responsibility:
 - Tracks already-processed tweet IDs to avoid duplicates (persisted to disk)
 - Only fetches new tweets while pipeline capacity remains (executed_actions +
   in_flight < DAILY_ACTION_LIMIT), ensuring the 24h action cap is respected
-- Keeps browser open between poll cycles; saves session state after each poll
+- Keeps browser open between poll cycles via BrowserWatcher (page/context
+  recycling, memory-triggered restarts, session saved when its state changes)
 
 Boundary:
 - READ-ONLY scraping — does NOT like, retweet, reply, or post
@@ -36,12 +37,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from base_watcher import BaseWatcher
+from browser_watcher import BrowserWatcher
+import tracing
+from browser import x_browser
 from browser.x_browser import (
-    create_playwright_instance,
-    launch_browser,
-    save_session,
-    check_login_state,
     parse_tweets_from_page,
     parse_following_from_page,
     build_following_url,
@@ -109,7 +108,13 @@ def _sanitize_filename(text: str, max_len: int = 50) -> str:
 # XWatcher
 # ---------------------------------------------------------------------------
 
-class XWatcher(BaseWatcher):
+class XWatcher(BrowserWatcher):
+    platform = "X"
+    browser_module = x_browser
+    session_path = SESSION_PATH
+    setup_script = "browser/x_setup.py"
+    max_consecutive_failures = MAX_CONSECUTIVE_FAILURES
+
     def __init__(self):
         super().__init__(vault_path=str(VAULT_PATH), check_interval=CHECK_INTERVAL)
         self.processed_ids: dict[str, str] = {}  # tweet_id -> source
@@ -118,14 +123,6 @@ class XWatcher(BaseWatcher):
         # Following sync tracking
         self.last_following_sync: datetime | None = None
 
-        # Browser state
-        self._pw = None
-        self._browser = None
-        self._context = None
-        self._page = None
-        self._browser_healthy = False
-        self._consecutive_failures = 0
-
         self._load_processed_ids()
         self._start_browser()
         # Sync watchlist from live following list (replaces x_watchlist.json)
@@ -134,68 +131,6 @@ class XWatcher(BaseWatcher):
         if not self.watchlist:
             self._load_watchlist()
 
-    # -- Browser lifecycle ----------------------------------------------------
-
-    def _start_browser(self):
-        """Start the Playwright browser with session restore."""
-        if not SESSION_PATH.exists():
-            logger.error(
-                "Session file not found at %s. "
-                "Run 'python browser/x_setup.py' to log in first.",
-                SESSION_PATH,
-            )
-            self._browser_healthy = False
-            return
-
-        try:
-            self._pw = create_playwright_instance()
-            self._browser, self._context = launch_browser(
-                self._pw, headless=True, session_path=SESSION_PATH,
-            )
-            self._page = self._context.new_page()
-
-            if check_login_state(self._page):
-                logger.info("Browser started and login verified.")
-                self._browser_healthy = True
-                self._consecutive_failures = 0
-            else:
-                logger.warning(
-                    "Browser started but login verification failed. "
-                    "Session may be expired — run browser/x_setup.py again."
-                )
-                self._browser_healthy = False
-
-        except Exception:
-            logger.exception("Failed to start browser")
-            self._browser_healthy = False
-
-    def _stop_browser(self):
-        """Close the browser and Playwright."""
-        for resource, name in [
-            (self._browser, "browser"),
-            (self._pw, "playwright"),
-        ]:
-            if resource:
-                try:
-                    if name == "browser":
-                        resource.close()
-                    else:
-                        resource.stop()
-                except Exception:
-                    logger.debug("Error closing %s", name)
-        self._browser = None
-        self._context = None
-        self._page = None
-        self._pw = None
-        self._browser_healthy = False
-
-    def _restart_browser(self):
-        """Stop and restart the browser (crash recovery)."""
-        logger.info("Restarting browser...")
-        self._stop_browser()
-        human_delay(2.0, 5.0)
-        self._start_browser()
-
     # -- Config loading -------------------------------------------------------
 
     def _load_watchlist(self):
@@ -483,14 +418,8 @@ class XWatcher(BaseWatcher):
             )
             return []
 
-        if not self._browser_healthy:
-            if SESSION_PATH.exists():
-                logger.warning("Browser unhealthy — attempting restart.")
-                self._restart_browser()
-            else:
-                logger.warning("Browser unhealthy and no session file. Skipping poll.")
-            if not self._browser_healthy:
-                return []
+        if not self._ensure_browser_ready():
+            return []
 
         # Re-sync following list every FOLLOWING_SYNC_INTERVAL_HOURS
         if self._should_sync_following():
@@ -528,23 +457,12 @@ class XWatcher(BaseWatcher):
                 len(unique),
             )
 
-            if self._context:
-                save_session(self._context, SESSION_PATH)
-
-            self._consecutive_failures = 0
+            self._poll_succeeded()
             return unique
 
         except Exception:
             logger.exception("Error during browser polling cycle")
-            self._consecutive_failures += 1
-
-            if self._consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-                logger.error(
-                    "Browser failed %d times consecutively — restarting.",
-                    self._consecutive_failures,
-                )
-                self._restart_browser()
-
+            self._poll_failed()
             return []
 
     def create_action_file(self, tweet: dict) -> Path:
@@ -606,21 +524,13 @@ status: pending
 """
 
         filepath = self.needs_action / filename
-        filepath.write_text(content, encoding="utf-8")
+        tracing.write_task(filepath, content)
 
         self.processed_ids[tid] = tweet.get("source", "unknown")
         self._save_processed_ids()
 
         return filepath
 
-    def run(self):
-        """Override run() to ensure browser cleanup on exit."""
-        try:
-            super().run()
-        finally:
-            logger.info("Shutting down browser...")
-            self._stop_browser()
-
 
 # ---------------------------------------------------------------------------
 # Entry point